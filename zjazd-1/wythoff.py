@@ -12,23 +12,39 @@ Instrukcja:
 3. Uruchom: python wythoff.py
 """
 
+import threading # anulowanie przeszukiwania AI
+import time # limit czasu przeszukiwania AI
+from collections import OrderedDict # kolejność użycia wpisów w tablicy LRU
+from concurrent.futures import ThreadPoolExecutor # ruch AI poza wątkiem interfejsu
+from math import isqrt # pierwiastek całkowitoliczbowy (dokładna arytmetyka)
+
 import pygame
-from easyAI import TwoPlayerGame, Human_Player, AI_Player, Negamax # algorytm minimax
+from easyAI import TwoPlayerGame, Human_Player, AI_Player, Negamax, TranspositionTable # algorytm minimax
+
+from wythoff_table import LosingTable # tablica pozycji przegranych (NumPy)
 
 class WythoffGame(TwoPlayerGame):
     """
     Klasa reprezentująca grę Wythoffa.
 
+    Ruch to krotka (a, b) - liczba zapałek zabranych z pierwszego i drugiego stosu.
+    Format tekstowy 'a,b' używany jest tylko w interfejsie (format_move/parse_move).
+
     Atrybuty:
         players (list): Lista graczy.
         heaps (list): Liczba obiektów w dwóch stosach.
         current_player (int): Indeks aktualnego gracza.
         selected (list): Lista zaznaczonych zapałek dla każdego stosu.
-        last_move (str): Ostatni wykonany ruch (dla wyświetlania).
+        last_move (tuple): Ostatni wykonany ruch (dla wyświetlania).
 
     Metody:
         possible_moves(): Zwraca listę możliwych ruchów.
+        iter_moves(): Generator możliwych ruchów (bez budowania listy).
+        is_legal_move(move): Sprawdza w O(1), czy ruch jest dozwolony.
         make_move(move): Wykonuje ruch.
+        unmake_move(move): Cofa ruch (przyspiesza Negamax - brak kopiowania gry).
+        ttentry(): Zwraca klucz pozycji dla tablicy transpozycji.
+        copy(): Zwraca kopię stanu gry (bez kopiowania graczy).
         win(): Sprawdza, czy gra została wygrana.
         is_over(): Sprawdza, czy gra się zakończyła.
         scoring(): Zwraca wartość pozycji dla AI.
@@ -42,37 +58,83 @@ class WythoffGame(TwoPlayerGame):
         self.selected = [set(), set()]  # zaznaczone indeksy zapałek dla stosu 1 i 2
         self.last_move = None  # ostatni ruch
 
+    @staticmethod
+    def format_move(move):
+        """Zamienia ruch (a, b) na tekst 'a,b' (tylko do wyświetlania)."""
+        return f"{move[0]},{move[1]}"
+
+    @staticmethod
+    def parse_move(text):
+        """Zamienia tekst 'a,b' na ruch (a, b)."""
+        a, b = text.split(",") # rozdziel tekst na a i b
+        return int(a), int(b)
+
+    def iter_moves(self):
+        """Generuje możliwe ruchy (a, b) bez budowania listy."""
+        a, b = self.heaps
+        for i in range(1, a + 1): # ruchy zabierające z pierwszego stosu
+            yield i, 0
+        for i in range(1, b + 1): # ruchy zabierające z drugiego stosu
+            yield 0, i
+        for i in range(1, min(a, b) + 1): # ruchy zabierające z obu stosów
+            yield i, i
+
     def possible_moves(self):
-        """Zwraca listę możliwych ruchów w formacie 'a,b'."""
-        moves = [] # lista możliwych ruchów
-        for i in range(1, self.heaps[0] + 1): # ruchy zabierające z pierwszego stosu
-            moves.append(f"{i},0") # dodaj ruch do listy możliwych ruchów
-        for i in range(1, self.heaps[1] + 1): # ruchy zabierające z drugiego stosu
-            moves.append(f"0,{i}") # dodaj ruch do listy możliwych ruchów
-        for i in range(1, min(self.heaps) + 1): # ruchy zabierające z obu stosów
-            moves.append(f"{i},{i}") # dodaj ruch do listy możliwych ruchów
-        return moves # zwróć listę możliwych ruchów
+        """Zwraca listę możliwych ruchów (a, b) - easyAI wymaga listy."""
+        return list(self.iter_moves())
+
+    def is_legal_move(self, move):
+        """Sprawdza w O(1), czy ruch (a, b) jest dozwolony w aktualnej pozycji."""
+        a, b = move
+        if a < 0 or b < 0 or a + b == 0: # trzeba zabrać co najmniej jedną zapałkę
+            return False
+        if a and b and a != b: # z obu stosów tylko tyle samo
+            return False
+        return a <= self.heaps[0] and b <= self.heaps[1] # nie więcej niż jest w stosie
 
     def make_move(self, move):
-        """Wykonuje ruch podany jako string 'a,b'."""
-        a, b = map(int, move.split(",")) # rozdziel ruch na a i b
+        """Wykonuje ruch podany jako krotka (a, b)."""
+        a, b = move # liczba zapałek zabieranych z każdego stosu
         self.heaps[0] -= a # zabierz a z pierwszego stosu
         self.heaps[1] -= b # zabierz b z drugiego stosu
         self.current_player = 3 - self.current_player  # przełączanie graczy (1 lub 2)
-        self.selected = [set(), set()]  # reset zaznaczeń po ruchu
+        if self.selected[0] or self.selected[1]: # reset zaznaczeń po ruchu (bez nowych obiektów)
+            self.selected[0].clear()
+            self.selected[1].clear()
         self.last_move = move  # zapisz ostatni ruch
 
+    def unmake_move(self, move):
+        """Cofa ruch (a, b) wykonany przez make_move."""
+        a, b = move
+        self.heaps[0] += a # oddaj zapałki do pierwszego stosu
+        self.heaps[1] += b # oddaj zapałki do drugiego stosu
+        self.current_player = 3 - self.current_player  # przywróć poprzedniego gracza
+
+    def ttentry(self):
+        """Zwraca klucz pozycji (stosy, aktualny gracz) dla tablicy transpozycji."""
+        return self.heaps[0], self.heaps[1], self.current_player
+
+    def copy(self):
+        """Zwraca kopię stanu gry; gracze (i ich algorytmy AI) są współdzieleni, nie kopiowani."""
+        game = WythoffGame(self.players, list(self.heaps))
+        game.current_player = self.current_player
+        game.last_move = self.last_move
+        return game
+
     def win(self):
-        """Sprawdza, czy gra została wygrana (aktualny gracz wygrał)."""
-        return self.heaps == [0, 0] # gra wygrana, jeśli oba stosy są puste
+        """Sprawdza, czy gra została wygrana (przez gracza, który zabrał ostatnią zapałkę)."""
+        return self.heaps[0] == 0 and self.heaps[1] == 0 # gra wygrana, jeśli oba stosy są puste
 
     def is_over(self):
         """Sprawdza, czy gra się zakończyła."""
         return self.win() # gra zakończona, jeśli ktoś wygrał
 
     def scoring(self):
-        """Zwraca wartość pozycji dla AI (100 jeśli wygrana, 0 w przeciwnym razie)."""
-        return 100 if self.win() else 0 # 100 punktów za wygraną, 0 w przeciwnym razie
+        """
+        Zwraca wartość pozycji dla AI z perspektywy gracza wykonującego ruch
+        (-100 gdy gra wygrana przez przeciwnika, 0 w przeciwnym razie).
+        """
+        return -100 if self.win() else 0 # oba stosy puste - gracz nie ma ruchu i przegrywa
 
     def show(self):
         """Wyświetla aktualny stan gry (w konsoli, dla debugowania)."""
@@ -80,68 +142,402 @@ class WythoffGame(TwoPlayerGame):
         print(f"Ruch gracza {self.current_player}") # wyświetl aktualnego gracza
 
     def draw(self, screen):
-        """Rysuje stan gry na ekranie Pygame."""
-        screen.fill((255, 255, 255))  # białe tło
-        font = pygame.font.Font(None, 36) # czcionka do tekstu
-        # Wyświetl stosy jako tekst (zachowane dla czytelności)
-        text1 = font.render(f"Stos 1: {self.heaps[0]}", True, (0, 0, 0))
-        text2 = font.render(f"Stos 2: {self.heaps[1]}", True, (0, 0, 0))
-        screen.blit(text1, (50, 50))
-        screen.blit(text2, (50, 100))
-        # Rysuj zapałki jako prostokąty
-        matchstick_width = 20 # szerokość zapałki
-        matchstick_height = 60 # wysokość zapałki
-        spacing = 5 # odstęp między zapałkami
-        x_start = 50 # początkowa pozycja x
-        # Stos 1 (czerwony, zielony jeśli zaznaczony)
-        y = 200 # pozycja y dla pierwszego stosu
-        for i in range(self.heaps[0]): # rysuj zapałki pierwszego stosu
-            color = (0, 255, 0) if i in self.selected[0] else (255, 0, 0) # zielony jeśli zaznaczony, czerwony w przeciwnym razie
-            pygame.draw.rect(screen, color, (x_start + i * (matchstick_width + spacing), y, matchstick_width, matchstick_height))
-        # Stos 2 (niebieski, zielony jeśli zaznaczony)
-        y = 280 # pozycja y dla drugiego stosu
-        for i in range(self.heaps[1]): # rysuj zapałki drugiego stosu
-            color = (0, 255, 0) if i in self.selected[1] else (0, 0, 255) # zielony jeśli zaznaczony, niebieski w przeciwnym razie
-            pygame.draw.rect(screen, color, (x_start + i * (matchstick_width + spacing), y, matchstick_width, matchstick_height)) # rysuj zapałkę
-        # Wyświetl aktualnego gracza
-        player_text = font.render("Twój ruch" if self.current_player == 1 else f"Ruch gracza {self.current_player}", True, (0, 0, 0))
-        screen.blit(player_text, (50, 350)) # pozycja tekstu
-        # Wyświetl ostatni ruch AI jeśli istnieje
-        if self.last_move and self.current_player == 1:  # po ruchu AI
-            ai_move_text = font.render(f"AI wykonał ruch: {self.last_move}", True, (0, 0, 0)) # tekst ostatniego ruchu AI
-            screen.blit(ai_move_text, (50, 380)) # pozycja tekstu
-        # Jeśli gra zakończona, wyświetl komunikat o zwycięzcy i przyciski
-        if self.is_over():
-            winner = 3 - self.current_player  # zwycięzca to poprzedni gracz
-            if winner == 1: # jeśli wygrał gracz 1 (człowiek)
-                end_text = font.render("Wygrałeś!", True, (255, 0, 0))
-            else:
-                end_text = font.render("Wygrał AI!", True, (255, 0, 0))
-            screen.blit(end_text, (50, 400))
-            # Przyciski
-            restart_text = font.render("Zagraj ponownie", True, (0, 0, 255))
-            screen.blit(restart_text, (50, 450))
-            quit_text = font.render("Wyjdź z gry", True, (255, 0, 0))
-            screen.blit(quit_text, (50, 490))
+        """Rysuje cały stan gry na ekranie Pygame."""
+        renderer = WythoffRenderer.shared() # wspólna czcionka i napisy dla wszystkich gier
+        renderer.invalidate() # pełne przerysowanie
+        renderer.draw(screen, self)
+
+
+# Wymiary i położenie zapałek (wspólne dla rysowania i obsługi kliknięć)
+MATCHSTICK_WIDTH = 20 # szerokość zapałki
+MATCHSTICK_HEIGHT = 60 # wysokość zapałki
+MATCHSTICK_SPACING = 5 # odstęp między zapałkami
+MATCHSTICK_X = 50 # początkowa pozycja x
+HEAP_Y = (200, 280) # pozycja y pierwszego i drugiego stosu
+HEAP_COLORS = ((255, 0, 0), (0, 0, 255)) # czerwony i niebieski
+SELECTED_COLOR = (0, 255, 0) # zielony dla zaznaczonych zapałek
+BACKGROUND = (255, 255, 255) # białe tło
+
+
+def matchstick_at(heaps, x, y):
+    """
+    Zwraca (stos, indeks zapałki) dla kliknięcia w punkcie (x, y) albo None.
+
+    Liczone arytmetycznie z położenia kliknięcia - bez tworzenia prostokątów dla zapałek.
+    """
+    for heap, top in enumerate(HEAP_Y):
+        if top <= y < top + MATCHSTICK_HEIGHT: # kliknięcie w wierszu stosu
+            offset = x - MATCHSTICK_X
+            if offset < 0:
+                return None
+            index, inside = divmod(offset, MATCHSTICK_WIDTH + MATCHSTICK_SPACING)
+            if inside < MATCHSTICK_WIDTH and index < heaps[heap]: # w zapałce, nie w odstępie
+                return heap, index
+            return None
+    return None
+
+
+class WythoffRenderer:
+    """
+    Rysowanie gry z pamięcią podręczną i odświeżaniem tylko zmienionych obszarów.
+
+    Czcionka tworzona jest raz, wyrenderowane napisy są zapamiętywane, a ekran
+    podzielony jest na obszary (napisy stosów, każdy stos, status gry), które
+    przerysowywane są tylko wtedy, gdy zmienił się ich stan.
+    """
+    HEADER_RECT = pygame.Rect(0, 40, 800, 100) # napisy "Stos 1/2"
+    HEAP_RECTS = (pygame.Rect(0, HEAP_Y[0], 800, MATCHSTICK_HEIGHT),
+                  pygame.Rect(0, HEAP_Y[1], 800, MATCHSTICK_HEIGHT))
+    STATUS_RECT = pygame.Rect(0, 345, 800, 200) # gracz, ostatni ruch, przyciski
+    _shared = None
+
+    def __init__(self):
+        self.font = None # tworzona przy pierwszym rysowaniu (po pygame.init())
+        self.texts = {} # (tekst, kolor) -> wyrenderowana powierzchnia
+        self.state = {} # obszar -> stan narysowany ostatnio
+
+    @classmethod
+    def shared(cls):
+        """Zwraca wspólny renderer (używany przez WythoffGame.draw)."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def invalidate(self):
+        """Wymusza przerysowanie wszystkich obszarów (np. po odsłonięciu okna)."""
+        self.state.clear()
+
+    def text(self, text, color):
+        """Zwraca napis z pamięci podręcznej (renderowany tylko raz)."""
+        key = (text, color)
+        surface = self.texts.get(key)
+        if surface is None:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 36) # czcionka do tekstu
+            surface = self.texts[key] = self.font.render(text, True, color)
+        return surface
+
+    def draw(self, screen, game, thinking=False):
+        """
+        Przerysowuje zmienione obszary i zwraca ich listę (dla pygame.display.update).
+
+        thinking=True wyświetla informację, że AI liczy ruch.
+        """
+        dirty = []
+        header = (game.heaps[0], game.heaps[1])
+        if self.state.get("header") != header:
+            self.state["header"] = header
+            screen.fill(BACKGROUND, self.HEADER_RECT)
+            screen.blit(self.text(f"Stos 1: {game.heaps[0]}", (0, 0, 0)), (50, 50))
+            screen.blit(self.text(f"Stos 2: {game.heaps[1]}", (0, 0, 0)), (50, 100))
+            dirty.append(self.HEADER_RECT)
+        for heap, rect in enumerate(self.HEAP_RECTS):
+            heap_state = (game.heaps[heap], frozenset(game.selected[heap]))
+            if self.state.get(heap) != heap_state:
+                self.state[heap] = heap_state
+                self.draw_heap(screen, heap, game.heaps[heap], game.selected[heap])
+                dirty.append(rect)
+        over = game.is_over()
+        status = (game.current_player, game.last_move, over, thinking)
+        if self.state.get("status") != status:
+            self.state["status"] = status
+            self.draw_status(screen, game, over, thinking)
+            dirty.append(self.STATUS_RECT)
+        return dirty
+
+    def draw_heap(self, screen, heap, count, selected):
+        """Rysuje jeden stos zapałek (zielone - zaznaczone)."""
+        rect = self.HEAP_RECTS[heap]
+        screen.fill(BACKGROUND, rect)
+        for i in range(count):
+            color = SELECTED_COLOR if i in selected else HEAP_COLORS[heap]
+            x = MATCHSTICK_X + i * (MATCHSTICK_WIDTH + MATCHSTICK_SPACING)
+            screen.fill(color, (x, rect.y, MATCHSTICK_WIDTH, MATCHSTICK_HEIGHT))
+
+    def draw_status(self, screen, game, over, thinking=False):
+        """Rysuje aktualnego gracza, ostatni ruch AI, wynik i przyciski."""
+        screen.fill(BACKGROUND, self.STATUS_RECT)
+        player_text = "Twój ruch" if game.current_player == 1 else f"Ruch gracza {game.current_player}"
+        if thinking:
+            player_text += " - AI myśli..."
+        screen.blit(self.text(player_text, (0, 0, 0)), (50, 350))
+        if game.last_move and game.current_player == 1:  # po ruchu AI
+            screen.blit(self.text(f"AI wykonał ruch: {game.format_move(game.last_move)}", (0, 0, 0)), (50, 380))
+        if over: # komunikat o zwycięzcy i przyciski
+            winner = 3 - game.current_player  # zwycięzca to poprzedni gracz
+            screen.blit(self.text("Wygrałeś!" if winner == 1 else "Wygrał AI!", (255, 0, 0)), (50, 400))
+            screen.blit(self.text("Zagraj ponownie", (0, 0, 255)), (50, 450))
+            screen.blit(self.text("Wyjdź z gry", (255, 0, 0)), (50, 490))
         else:
-            # Przycisk "Zabierz"
-            zabierz_text = font.render("Zabierz", True, (0, 0, 255))
-            screen.blit(zabierz_text, (50, 450))
+            screen.blit(self.text("Zabierz", (0, 0, 255)), (50, 450)) # przycisk "Zabierz"
+
+
+def wythoff_pair(k):
+    """
+    Zwraca k-tą pozycję przegrywającą (P-pozycję) jako parę (floor(k*φ), floor(k*φ²)).
+
+    Liczone dokładnie na liczbach całkowitych: floor(k*φ) = (k + isqrt(5k²)) // 2,
+    bo sqrt(5k²) jest niewymierny dla k > 0, więc floor nie zmienia wyniku.
+    """
+    a = (k + isqrt(5 * k * k)) // 2 # floor(k * φ)
+    return a, a + k # floor(k * φ²) = floor(k * φ) + k
+
+
+def wythoff_index(n):
+    """
+    Zwraca (k, dolna) dla n > 0: indeks k pary Wythoffa, w której występuje n,
+    oraz informację, czy n jest mniejszym (dolnym) elementem tej pary.
+
+    Każda dodatnia liczba występuje dokładnie raz w jednym z ciągów Beatty'ego.
+    """
+    s = isqrt(5 * n * n) # floor(n * sqrt(5))
+    k = (s - n) // 2 + 1 # floor(n / φ) + 1
+    if wythoff_pair(k)[0] == n: # n = floor(k * φ)
+        return k, True
+    return (3 * n - s - 1) // 2 + 1, False # floor(n / φ²) + 1, n = floor(k * φ²)
+
+
+def is_losing_position(a, b):
+    """Sprawdza, czy pozycja (a, b) jest przegrana dla gracza wykonującego ruch."""
+    a, b = min(a, b), max(a, b) # para uporządkowana
+    return wythoff_pair(b - a)[0] == a # P-pozycja: a = floor((b - a) * φ)
+
+
+class WythoffSolver:
+    """
+    Algorytm AI grający optymalnie na podstawie wzoru zamkniętego na P-pozycje.
+
+    Zamiast przeszukiwać drzewo gry (Negamax) wyznacza bezpośrednio ruch do
+    najbliższej pozycji (floor(k*φ), floor(k*φ²)). Koszt ruchu nie zależy od
+    wielkości stosów (poza arytmetyką na dużych liczbach - O(log n)).
+    Interfejs jak w Negamax: obiekt wywoływalny, używany przez AI_Player(ai).
+    Gracz, który zabiera ostatnią zapałkę, wygrywa (tak jak w draw()).
+    """
+    def __call__(self, game):
+        """Zwraca ruch (a, b) dla aktualnego stanu gry."""
+        swapped = game.heaps[0] > game.heaps[1] # czy mniejszy stos jest drugi
+        a, b = (game.heaps[1], game.heaps[0]) if swapped else (game.heaps[0], game.heaps[1])
+        take_a, take_b = self.best_move(a, b) # ruch dla pary uporządkowanej a <= b
+        if swapped: # przywróć kolejność stosów z gry
+            take_a, take_b = take_b, take_a
+        return take_a, take_b
+
+    @staticmethod
+    def best_move(a, b):
+        """
+        Zwraca ruch (zabrane z a, zabrane z b) dla pary a <= b.
+
+        Z pozycji wygranej prowadzi do P-pozycji; z przegranej zabiera jedną
+        zapałkę z większego stosu, żeby przedłużyć grę.
+        """
+        if a == 0: # zabierz cały drugi stos
+            return 0, b
+        k, lower = wythoff_index(a)
+        if not lower: # a = floor(k*φ²): zmniejsz b do floor(k*φ)
+            return 0, b - wythoff_pair(k)[0]
+        partner = a + k # a = floor(k*φ), partner = floor(k*φ²)
+        if b > partner: # zmniejsz b do partnera
+            return 0, b - partner
+        if b < partner: # różnica d = b - a < k: zabierz z obu stosów do pary d
+            taken = a - wythoff_pair(b - a)[0]
+            return taken, taken
+        return 0, 1 # pozycja przegrana - najmniejszy możliwy ruch
+
+class LRUTranspositionTable(TranspositionTable):
+    """
+    Tablica transpozycji easyAI o ograniczonym rozmiarze.
+
+    Po przekroczeniu max_size usuwany jest najdawniej używany wpis (LRU).
+    """
+    def __init__(self, max_size=100000):
+        super().__init__(OrderedDict())
+        self.max_size = max_size # maksymalna liczba zapamiętanych pozycji
+
+    def lookup(self, game):
+        """Zwraca wpis dla pozycji (lub None) i oznacza go jako ostatnio użyty."""
+        entry = game.ttentry()
+        if entry not in self.d:
+            return None
+        self.d.move_to_end(entry) # ostatnio użyty na koniec kolejki
+        return self.d[entry]
+
+    def store(self, **data):
+        """Zapisuje wpis, usuwając najdawniej używany po przekroczeniu rozmiaru."""
+        entry = data.pop("game").ttentry()
+        self.d[entry] = data
+        self.d.move_to_end(entry)
+        if len(self.d) > self.max_size:
+            self.d.popitem(last=False) # usuń najdawniej używany wpis
+
+
+class TableNegamax:
+    """
+    Algorytm AI: tablica pozycji przegranych + Negamax z tablicą transpozycji LRU.
+
+    Dla pozycji mieszczących się w tablicy (a, b < table.size) ruch odczytywany jest
+    od razu z tablicy. Powyżej tego zakresu uruchamiany jest Negamax, który ocenia
+    pozycje z tablicy jako wygrane/przegrane, a pozostałe powtarzające się pozycje
+    zapamiętuje w tablicy transpozycji. Gracz, który nie może wykonać ruchu, przegrywa.
+    """
+    def __init__(self, depth=6, table=None, tt_size=100000):
+        self.table = table # LosingTable lub None (tylko przeszukiwanie)
+        self.tt = LRUTranspositionTable(tt_size) # tablica transpozycji dla Negamax
+        self.negamax = Negamax(depth, scoring=self.scoring, tt=self.tt)
+
+    @classmethod
+    def from_file(cls, path="wythoff_table.npy", size=10000, depth=6, tt_size=100000):
+        """Tworzy AI z tablicą wczytaną z pliku (lub zbudowaną i zapisaną przy pierwszym uruchomieniu)."""
+        return cls(depth, LosingTable.open(path, size), tt_size)
+
+    def scoring(self, game):
+        """Ocena pozycji z perspektywy gracza wykonującego ruch."""
+        a, b = game.heaps
+        if self.table is not None and self.table.contains(a, b):
+            return -100 if self.table.is_losing(a, b) else 100
+        return game.scoring()
+
+    def __call__(self, game):
+        """Zwraca ruch (a, b) dla aktualnego stanu gry."""
+        a, b = game.heaps
+        if self.table is not None and self.table.contains(a, b):
+            move = self.table.winning_move(a, b)
+            if move is not None:
+                return move
+            return (1, 0) if a > 0 else (0, 1) # pozycja przegrana - najmniejszy możliwy ruch
+        return self.negamax(game)
+
+class SearchTimeout(Exception):
+    """Przeszukiwanie przerwane - skończył się czas albo ruch został anulowany."""
+
+
+class IterativeDeepeningNegamax:
+    """
+    Negamax z iteracyjnym pogłębianiem w limicie czasu.
+
+    Przeszukuje kolejno na głębokość 1, 2, 3, ... i zwraca najlepszy ruch z ostatniej
+    ukończonej głębokości, gdy skończy się budżet budget_ms (w milisekundach)
+    albo gdy wywołano cancel(). Czas odpowiedzi jest więc ograniczony niezależnie
+    od wielkości stosów. Interfejs jak w Negamax: AI_Player(IterativeDeepeningNegamax(500)).
+    """
+    def __init__(self, budget_ms=500, max_depth=50, scoring=None):
+        self.budget_ms = budget_ms # limit czasu na ruch
+        self.max_depth = max_depth # maksymalna głębokość przeszukiwania
+        self.scoring = scoring # funkcja oceny (domyślnie game.scoring() - z perspektywy gracza wykonującego ruch)
+        self.depth = 0 # ostatnia ukończona głębokość
+        self.cancelled = threading.Event() # ustawiane przez cancel()
+
+    def reset(self):
+        """
+        Przygotowuje kolejny ruch: nowe zdarzenie anulowania, wywoływane przy zlecaniu ruchu
+        (AIWorker.start). cancel() wywołane przed rozpoczęciem przeszukiwania nie ginie,
+        a przerwane wcześniej przeszukiwanie zachowuje swoje (ustawione) zdarzenie.
+        """
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Przerywa trwające przeszukiwanie (zwrócony zostanie dotychczas najlepszy ruch)."""
+        self.cancelled.set()
+
+    def __call__(self, game):
+        """Zwraca najlepszy ruch znaleziony w limicie czasu."""
+        cancelled = self.cancelled # zdarzenie tego ruchu (reset() podmienia je dla kolejnego)
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        scoring = self.scoring if self.scoring else WythoffGame.scoring
+
+        def timed_scoring(g): # sprawdzanie czasu w liściach drzewa przeszukiwania
+            if cancelled.is_set() or time.perf_counter() > deadline:
+                raise SearchTimeout()
+            return scoring(g)
+
+        best_move = next(game.iter_moves()) # gdyby nie udało się ukończyć głębokości 1
+        self.depth = 0
+        # Gra nie może trwać dłużej niż liczba zapałek - głębsze przeszukiwanie nic nie zmieni
+        max_depth = min(self.max_depth, game.heaps[0] + game.heaps[1])
+        for depth in range(1, max_depth + 1):
+            negamax = Negamax(depth, scoring=timed_scoring)
+            try:
+                move = negamax(game.copy()) # kopia - przerwane przeszukiwanie zostawia zmieniony stan
+            except SearchTimeout:
+                break
+            best_move, self.depth = move, depth
+            if abs(negamax.alpha) >= 100: # wynik rozstrzygnięty - głębiej nie trzeba szukać
+                break
+        return best_move
+
+
+class AIWorker:
+    """
+    Liczy ruch AI w osobnym wątku, żeby okno Pygame obsługiwało zdarzenia.
+
+    start(game) uruchamia obliczenia na kopii gry, poll() zwraca ruch, gdy jest gotowy
+    (inaczej None), a cancel() przerywa obliczenia (jeśli AI ma metodę cancel()).
+    """
+    def __init__(self, ai):
+        self.ai = ai
+        self.executor = ThreadPoolExecutor(max_workers=1) # jeden wątek dla AI
+        self.future = None # trwające obliczenia
+
+    @property
+    def thinking(self):
+        """Czy AI właśnie liczy ruch."""
+        return self.future is not None
+
+    def start(self, game):
+        """Uruchamia obliczanie ruchu dla kopii aktualnego stanu gry."""
+        if hasattr(self.ai, "reset"):
+            self.ai.reset() # anulowanie przed startem wątku dotyczy już tego ruchu
+        self.future = self.executor.submit(self.ai, game.copy())
+
+    def poll(self):
+        """Zwraca obliczony ruch albo None, jeśli AI jeszcze liczy."""
+        if self.future is None or not self.future.done():
+            return None
+        future, self.future = self.future, None
+        return future.result()
+
+    def cancel(self):
+        """Anuluje trwające obliczenia."""
+        if self.future is not None:
+            if hasattr(self.ai, "cancel"):
+                self.ai.cancel()
+            self.future.cancel()
+            self.future = None
+
+    def shutdown(self):
+        """Anuluje obliczenia i zamyka wątek AI."""
+        self.cancel()
+        self.executor.shutdown(wait=False)
 
 if __name__ == "__main__":
     pygame.init()
     screen = pygame.display.set_mode((800, 600))  # większy ekran dla wizualizacji
     pygame.display.set_caption("Wythoff's Game") # tytuł okna
-    clock = pygame.time.Clock() # zegar do kontroli klatek na sekundę
+    screen.fill(BACKGROUND) # białe tło
+    pygame.display.flip()
+    renderer = WythoffRenderer() # rysuje tylko zmienione obszary
 
-    ai = Negamax(6) # głębokość 6 dla AI
+    ai = WythoffSolver() # AI optymalne w O(1); zamiennie IterativeDeepeningNegamax(500) - przeszukiwanie w limicie 500 ms
+    worker = AIWorker(ai) # ruch AI liczony w osobnym wątku
     game = WythoffGame([Human_Player(), AI_Player(ai)]) # człowiek vs AI
     running = True # zmienna kontrolująca pętlę gry
 
     while running:
-        for event in pygame.event.get(): # obsługa zdarzeń
+        dirty = renderer.draw(screen, game, worker.thinking) # przerysuj tylko zmienione obszary
+        if dirty:
+            pygame.display.update(dirty) # aktualizacja zmienionych obszarów ekranu
+
+        events = pygame.event.get() # obsługa zdarzeń
+        if not events:
+            if worker.thinking:
+                events = [pygame.event.wait(20)] # AI liczy - sprawdzaj co 20 ms, czy ruch jest gotowy
+            elif game.current_player == 1 or game.is_over():
+                events = [pygame.event.wait()] # brak zmian - czekaj na zdarzenie zamiast odświeżać ekran
+        for event in events:
             if event.type == pygame.QUIT: # zamknięcie okna
                 running = False
+            elif event.type == pygame.WINDOWEXPOSED: # okno odsłonięte - narysuj wszystko ponownie
+                screen.fill(BACKGROUND)
+                renderer.invalidate()
             elif event.type == pygame.MOUSEBUTTONDOWN: # obsługa kliknięć myszą
                 mouse_x, mouse_y = event.pos # pozycja kliknięcia
                 if game.is_over():
@@ -153,56 +549,39 @@ if __name__ == "__main__":
                     elif quit_rect.collidepoint(mouse_x, mouse_y): # kliknięcie w "Wyjdź z gry"
                         running = False
                 elif game.current_player == 1:  # ruch człowieka (gracz 1)
-                    # Sprawdź kliknięcie na zapałkach
-                    matchstick_width = 20
-                    matchstick_height = 60
-                    spacing = 5 # odstęp między zapałkami
-                    x_start = 50 # początkowa pozycja x
-                    # Stos 1
-                    y = 200 # pozycja y dla pierwszego stosu
-                    for i in range(game.heaps[0]): # sprawdź każdą zapałkę w pierwszym stosie
-                        rect = pygame.Rect(x_start + i * (matchstick_width + spacing), y, matchstick_width, matchstick_height)
-                        if rect.collidepoint(mouse_x, mouse_y): # jeśli kliknięto na zapałkę
-                            if i in game.selected[0]: # jeśli zapałka już zaznaczona
-                                game.selected[0].remove(i)
-                            else:
-                                game.selected[0].add(i)
-                            break
-                    # Stos 2
-                    y = 280
-                    for i in range(game.heaps[1]): # sprawdź każdą zapałkę w drugim stosie
-                        rect = pygame.Rect(x_start + i * (matchstick_width + spacing), y, matchstick_width, matchstick_height)
-                        if rect.collidepoint(mouse_x, mouse_y):
-                            if i in game.selected[1]: # jeśli zapałka już zaznaczona
-                                game.selected[1].remove(i)
-                            else:
-                                game.selected[1].add(i)
-                            break
+                    # Sprawdź kliknięcie na zapałkach (arytmetycznie z pozycji kliknięcia)
+                    hit = matchstick_at(game.heaps, mouse_x, mouse_y)
+                    if hit is not None:
+                        heap, i = hit # stos i indeks klikniętej zapałki
+                        if i in game.selected[heap]: # jeśli zapałka już zaznaczona
+                            game.selected[heap].remove(i)
+                        else:
+                            game.selected[heap].add(i)
                     # Sprawdź kliknięcie na przycisku "Zabierz"
                     zabierz_rect = pygame.Rect(50, 450, 100, 30) # prostokąt przycisku "Zabierz"
                     if zabierz_rect.collidepoint(mouse_x, mouse_y): # jeśli kliknięto "Zabierz"
                         sel1 = len(game.selected[0]) # liczba zaznaczonych zapałek w pierwszym stosie
                         sel2 = len(game.selected[1]) # liczba zaznaczonych zapałek w drugim stosie
                         if sel1 > 0 and sel2 == 0 and sel1 <= game.heaps[0]: # valid move
-                            move = f"{sel1},0" # ruch zabierający z pierwszego stosu
+                            move = (sel1, 0) # ruch zabierający z pierwszego stosu
                         elif sel2 > 0 and sel1 == 0 and sel2 <= game.heaps[1]: # valid move
-                            move = f"0,{sel2}" # ruch zabierający z drugiego stosu
+                            move = (0, sel2) # ruch zabierający z drugiego stosu
                         elif sel1 == sel2 > 0 and sel1 <= min(game.heaps): # valid move
-                            move = f"{sel1},{sel1}" # ruch zabierający z obu stosów
+                            move = (sel1, sel1) # ruch zabierający z obu stosów
                         else:
                             move = None # nieprawidłowy ruch
-                        if move and move in game.possible_moves(): # jeśli ruch jest prawidłowy
+                        if move and game.is_legal_move(move): # jeśli ruch jest prawidłowy
                             game.make_move(move) # wykonaj ruch
                             game.show()  # debug w konsoli
 
-        if game.current_player == 2 and not game.is_over():  # ruch AI (gracz 2)
-            move = ai(game)  # AI wybiera ruch
-            game.make_move(move) # wykonaj ruch AI
-            if not game.is_over():  # dodaj sprawdzenie
-                game.show()  # debug w konsoli
-
-        game.draw(screen) # rysuj stan gry
-        pygame.display.flip() # aktualizacja ekranu
-        clock.tick(60) # 60 FPS
+        if running and game.current_player == 2 and not game.is_over():  # ruch AI (gracz 2)
+            if not worker.thinking:
+                worker.start(game)  # AI wybiera ruch w osobnym wątku
+            move = worker.poll()
+            if move is not None:
+                game.make_move(move) # wykonaj ruch AI
+                if not game.is_over():  # dodaj sprawdzenie
+                    game.show()  # debug w konsoli
 
+    worker.shutdown() # przerwij obliczenia AI przy zamykaniu okna
     pygame.quit()
\ No newline at end of file
@@ -0,0 +1,151 @@
+# python
+"""
+Benchmark AI dla gry Wythoffa - porównanie WythoffSolver z Negamax.
+
+Tryb "ai": dla każdego rozmiaru stosów mierzony jest czas wyboru jednego ruchu
+oraz to, czy ruch prowadzi do pozycji przegranej dla przeciwnika (ruch optymalny).
+
+Tryb "nodes": liczba węzłów na sekundę przeszukiwanych przez Negamax dla
+ruchów w formacie tekstowym 'a,b' (wersja pierwotna) oraz ruchów-krotek (a, b).
+
+Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+Uruchomienie:
+    python wythoff_benchmark.py
+    python wythoff_benchmark.py --sizes 5 10 20 1000000 --depth 4 --negamax-limit 30
+    python wythoff_benchmark.py nodes --depth 4
+"""
+
+import argparse
+import time
+
+from easyAI import AI_Player, Negamax, TwoPlayerGame
+
+from wythoff import WythoffGame, WythoffSolver, is_losing_position
+
+
+class StringMoveWythoffGame(TwoPlayerGame):
+    """Pierwotna wersja gry: ruchy jako tekst 'a,b', bez unmake_move (Negamax kopiuje grę)."""
+    def __init__(self, players, heaps):
+        self.players = players
+        self.heaps = heaps
+        self.current_player = 1
+        self.selected = [set(), set()]
+        self.last_move = None
+
+    def possible_moves(self):
+        moves = []
+        for i in range(1, self.heaps[0] + 1):
+            moves.append(f"{i},0")
+        for i in range(1, self.heaps[1] + 1):
+            moves.append(f"0,{i}")
+        for i in range(1, min(self.heaps) + 1):
+            moves.append(f"{i},{i}")
+        return moves
+
+    def make_move(self, move):
+        a, b = map(int, move.split(","))
+        self.heaps[0] -= a
+        self.heaps[1] -= b
+        self.current_player = 3 - self.current_player
+        self.selected = [set(), set()]
+        self.last_move = move
+
+    def win(self):
+        return self.heaps == [0, 0]
+
+    def is_over(self):
+        return self.win()
+
+    def scoring(self):
+        return -100 if self.win() else 0
+
+
+def count_nodes(game_class, heaps, depth):
+    """Zwraca (liczba węzłów, czas w sekundach) przeszukiwania Negamax dla danej klasy gry."""
+    nodes = 0
+    make_move = game_class.make_move
+
+    def counting_make_move(self, move): # każdy wykonany ruch to jeden odwiedzony węzeł
+        nonlocal nodes
+        nodes += 1
+        make_move(self, move)
+
+    counting_class = type(game_class.__name__, (game_class,), {"make_move": counting_make_move})
+    game = counting_class([AI_Player(None), AI_Player(None)], list(heaps))
+    start = time.perf_counter()
+    Negamax(depth)(game)
+    return nodes, time.perf_counter() - start
+
+
+def benchmark_nodes(args):
+    """Porównuje liczbę węzłów na sekundę dla ruchów tekstowych i ruchów-krotek."""
+    print(f"{'stosy':>12} | {'węzły':>9} | {'tekst [węzły/s]':>16} | {'krotki [węzły/s]':>17} | {'przyspieszenie':>14}")
+    print("-" * 80)
+    for size in args.sizes:
+        heaps = (size, size + size // 2 + 1)
+        nodes, string_time = count_nodes(StringMoveWythoffGame, heaps, args.depth)
+        tuple_nodes, tuple_time = count_nodes(WythoffGame, heaps, args.depth)
+        string_rate = nodes / string_time
+        tuple_rate = tuple_nodes / tuple_time
+        print(f"{str(list(heaps)):>12} | {nodes:>9} | {string_rate:16.0f} | {tuple_rate:17.0f} | {tuple_rate / string_rate:13.1f}x")
+
+
+def time_move(ai, heaps, repeats):
+    """Zwraca (średni czas ruchu w sekundach, ruch) dla podanych stosów."""
+    game = WythoffGame([AI_Player(ai), AI_Player(ai)], list(heaps))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        move = ai(game)
+    elapsed = (time.perf_counter() - start) / repeats
+    return elapsed, move
+
+
+def is_optimal(heaps, move):
+    """Sprawdza, czy ruch prowadzi do P-pozycji (o ile pozycja nie jest przegrana)."""
+    if is_losing_position(*heaps): # z pozycji przegranej każdy ruch jest równie dobry
+        return True
+    a, b = move
+    return is_losing_position(heaps[0] - a, heaps[1] - b)
+
+
+def benchmark_ai(args):
+    """Porównuje czas ruchu i optymalność WythoffSolver oraz Negamax."""
+    solver = WythoffSolver()
+    negamax = Negamax(args.depth)
+
+    print(f"{'stosy':>24} | {'solver [us]':>12} | {'opt':>3} | {f'negamax({args.depth}) [ms]':>16} | {'opt':>3}")
+    print("-" * 72)
+    for size in args.sizes:
+        heaps = (size, size + size // 2 + 1) # pozycja zwykle wygrana dla zaczynającego
+        solver_time, solver_move = time_move(solver, heaps, args.repeats)
+        row = f"{str(list(heaps)):>24} | {solver_time * 1e6:12.2f} | {'tak' if is_optimal(heaps, solver_move) else 'nie':>3}"
+        if size <= args.negamax_limit:
+            negamax_time, negamax_move = time_move(negamax, heaps, 1)
+            row += f" | {negamax_time * 1e3:16.1f} | {'tak' if is_optimal(heaps, negamax_move) else 'nie':>3}"
+        else:
+            row += f" | {'pominięto':>16} | {'-':>3}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarki AI dla gry Wythoffa.")
+    parser.add_argument("mode", nargs="?", choices=["ai", "nodes"], default="ai",
+                        help="ai - czas ruchu solvera i Negamax, nodes - węzły/s Negamax")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20, 30, 1000, 1000000],
+                        help="Rozmiar mniejszego stosu (większy = 1.5 * rozmiar + 1)")
+    parser.add_argument("--depth", type=int, default=6, help="Głębokość przeszukiwania Negamax")
+    parser.add_argument("--negamax-limit", type=int, default=20,
+                        help="Maksymalny rozmiar stosu, dla którego uruchamiany jest Negamax")
+    parser.add_argument("--repeats", type=int, default=1000, help="Liczba powtórzeń pomiaru dla solvera")
+    args = parser.parse_args()
+
+    if args.mode == "nodes":
+        args.sizes = [size for size in args.sizes if size <= args.negamax_limit]
+        benchmark_nodes(args)
+    else:
+        benchmark_ai(args)
+
+
+if __name__ == "__main__":
+    main()
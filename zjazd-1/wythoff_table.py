@@ -0,0 +1,216 @@
+# python
+"""
+Tablica pozycji wygranych/przegranych gry Wythoffa liczona wektorowo (NumPy).
+
+Pozycja (a, b) jest przegrana (P-pozycja), jeśli z żadnego pola w tym samym
+wierszu, kolumnie ani przekątnej nie da się dojść do innej P-pozycji.
+Tablica budowana jest wiersz po wierszu: w każdym wierszu P-pozycją jest pierwsza
+kolumna, której nie blokuje wcześniejsza P-pozycja w kolumnie ani na przekątnej.
+Wynik przechowywany jest jako tablica bitów (1 bit na pozycję), którą można
+zapisać do pliku .npy i wczytać jako plik mapowany w pamięci.
+
+Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+Instrukcja:
+1. Zainstaluj NumPy: pip install numpy
+2. Użycie w kodzie: table = LosingTable.open("wythoff_table.npy", 10000)
+3. Uruchomienie z konsoli (czas budowy, zużycie pamięci, sprawdzenie AI):
+   python wythoff_table.py --size 10000 --output wythoff_table.npy
+   python wythoff_table.py --size 2000 --validate solver table --limit 300
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def build_losing_bits(size):
+    """
+    Zwraca spakowaną tablicę bitów (size, ceil(size / 8)) pozycji przegranych dla a, b < size.
+
+    Bity w bajcie ułożone są jak w np.packbits (najstarszy bit = najmniejsza kolumna).
+    """
+    bits = np.zeros((size, (size + 7) // 8), dtype=np.uint8) # 1 bit na pozycję
+    column_blocked = np.zeros(size, dtype=bool) # kolumny z P-pozycją w niższym wierszu
+    diagonal_blocked = np.zeros(2 * size, dtype=bool) # przekątne b - a (przesunięte o size)
+    free = np.empty(size, dtype=bool) # bufor na wolne kolumny w wierszu
+    for a in range(size):
+        # Kolumna b jest wolna, jeśli nie blokuje jej ani kolumna, ani przekątna b - a
+        np.logical_or(column_blocked, diagonal_blocked[size - a:2 * size - a], out=free)
+        np.logical_not(free, out=free)
+        b = int(free.argmax()) # pierwsza wolna kolumna - w wierszu jest co najwyżej jedna P-pozycja
+        if not free[b]: # brak P-pozycji w tym wierszu (poza zakresem tablicy)
+            continue
+        bits[a, b >> 3] |= 0x80 >> (b & 7) # ustaw bit (a, b)
+        column_blocked[b] = True
+        diagonal_blocked[b - a + size] = True
+    return bits
+
+
+class LosingTable:
+    """
+    Tablica pozycji przegranych dla gracza wykonującego ruch (a, b < size).
+
+    Atrybuty:
+        bits (np.ndarray): Spakowane bity (size, ceil(size / 8)), może być np.memmap.
+        size (int): Zakres tablicy - obsługiwane są pozycje a, b < size.
+
+    Metody:
+        build(size): Buduje tablicę wektorowo.
+        load(path): Wczytuje tablicę z pliku .npy jako plik mapowany w pamięci.
+        open(path, size): Wczytuje tablicę z pliku lub buduje i zapisuje nową.
+        save(path): Zapisuje tablicę do pliku .npy.
+        contains(a, b): Sprawdza, czy pozycja mieści się w tablicy.
+        is_losing(a, b): Sprawdza, czy pozycja jest przegrana.
+        winning_move(a, b): Zwraca ruch do pozycji przegranej (lub None).
+    """
+    def __init__(self, bits):
+        self.bits = bits
+        self.size = bits.shape[0]
+
+    @classmethod
+    def build(cls, size):
+        """Buduje tablicę dla pozycji a, b < size."""
+        return cls(build_losing_bits(size))
+
+    @classmethod
+    def load(cls, path):
+        """Wczytuje tablicę z pliku .npy bez kopiowania (mmap)."""
+        return cls(np.load(path, mmap_mode="r"))
+
+    @classmethod
+    def open(cls, path, size):
+        """Wczytuje tablicę z pliku, a jeśli go nie ma lub jest za mała - buduje i zapisuje."""
+        if os.path.exists(path):
+            table = cls.load(path)
+            if table.size >= size:
+                return table
+        table = cls.build(size)
+        table.save(path)
+        return table
+
+    def save(self, path):
+        """Zapisuje tablicę do pliku .npy."""
+        np.save(path, self.bits)
+
+    def contains(self, a, b):
+        """Sprawdza, czy pozycja (a, b) mieści się w tablicy."""
+        return a < self.size and b < self.size
+
+    def is_losing(self, a, b):
+        """Sprawdza, czy pozycja (a, b) jest przegrana dla gracza wykonującego ruch."""
+        return bool(self.bits[a, b >> 3] & (0x80 >> (b & 7)))
+
+    def _losing_in_row(self, a, limit):
+        """Zwraca kolumnę P-pozycji w wierszu a mniejszą od limit (lub None)."""
+        row = np.unpackbits(self.bits[a, :(limit + 7) >> 3])[:limit]
+        columns = np.flatnonzero(row)
+        return int(columns[0]) if len(columns) else None
+
+    def winning_move(self, a, b):
+        """
+        Zwraca ruch (zabrane z a, zabrane z b) prowadzący do P-pozycji
+        albo None, jeśli pozycja (a, b) jest przegrana.
+        """
+        column = self._losing_in_row(a, b) # P-pozycja w tym samym wierszu
+        if column is not None:
+            return 0, b - column
+        row = self._losing_in_row(b, a) # P-pozycja w tej samej kolumnie (symetria tablicy)
+        if row is not None:
+            return a - row, 0
+        steps = np.arange(1, min(a, b) + 1) # P-pozycja na przekątnej
+        rows, columns = a - steps, b - steps
+        on_diagonal = self.bits[rows, columns >> 3] & (0x80 >> (columns & 7))
+        hits = np.flatnonzero(on_diagonal)
+        if len(hits):
+            taken = int(steps[hits[0]])
+            return taken, taken
+        return None
+
+
+def validate_ai(ai, table, limit):
+    """
+    Sprawdza algorytm AI na wszystkich pozycjach wygranych (a, b < limit).
+
+    Ruch jest poprawny, jeśli jest dozwolony i prowadzi do pozycji przegranej
+    według tablicy. Zwraca (liczba sprawdzonych pozycji, lista błędnych pozycji).
+    """
+    from wythoff import WythoffGame # import lokalny - wythoff importuje ten moduł
+
+    limit = min(limit, table.size)
+    terminal = WythoffGame([None, None], [0, 0])
+    # (0, 0): win() oznacza wygraną gracza, który zabrał ostatnią zapałkę,
+    # więc gracz wykonujący ruch w tej pozycji przegrał
+    if not (terminal.win() and table.is_losing(0, 0)):
+        raise ValueError("Tablica niezgodna z WythoffGame.win() dla pozycji (0, 0)")
+    checked, errors = 0, []
+    for a in range(limit):
+        for b in range(limit):
+            if table.is_losing(a, b): # z pozycji przegranej każdy ruch jest równie dobry
+                continue
+            game = WythoffGame([None, None], [a, b])
+            move = ai(game)
+            checked += 1
+            if not game.is_legal_move(move):
+                errors.append((a, b, move))
+                continue
+            game.make_move(move)
+            if not table.is_losing(*game.heaps):
+                errors.append((a, b, move))
+    return checked, errors
+
+
+def make_ai(name, table, depth):
+    """Tworzy algorytm AI o podanej nazwie (solver, table, negamax)."""
+    from easyAI import Negamax
+    from wythoff import TableNegamax, WythoffSolver
+
+    if name == "solver":
+        return WythoffSolver()
+    if name == "table":
+        return TableNegamax(depth, table)
+    return Negamax(depth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tablica pozycji przegranych gry Wythoffa (NumPy).")
+    parser.add_argument("--size", type=int, default=10000, help="Zakres tablicy: pozycje a, b < size")
+    parser.add_argument("--output", help="Plik .npy do zapisania tablicy")
+    parser.add_argument("--validate", nargs="+", choices=["solver", "table", "negamax"], default=[],
+                        help="Algorytmy AI do sprawdzenia względem tablicy")
+    parser.add_argument("--limit", type=int, default=200, help="Zakres pozycji sprawdzanych przy walidacji")
+    parser.add_argument("--depth", type=int, default=4, help="Głębokość Negamax przy walidacji")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    table = LosingTable.build(args.size)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    positions = args.size * args.size
+    print(f"Rozmiar tablicy: {args.size} x {args.size} ({positions} pozycji)")
+    print(f"Czas budowy: {elapsed:.3f} s ({positions / elapsed / 1e6:.1f} mln pozycji/s)")
+    print(f"Tablica bitów: {table.bits.nbytes / 2 ** 20:.2f} MiB "
+          f"(bool: {positions / 2 ** 20:.2f} MiB), szczyt alokacji: {peak / 2 ** 20:.2f} MiB")
+    print(f"Liczba pozycji przegranych: {int(np.unpackbits(table.bits).sum())}")
+
+    if args.output:
+        table.save(args.output)
+        print(f"Zapisano: {args.output} ({os.path.getsize(args.output) / 2 ** 20:.2f} MiB)")
+
+    for name in args.validate:
+        start = time.perf_counter()
+        checked, errors = validate_ai(make_ai(name, table, args.depth), table, args.limit)
+        elapsed = time.perf_counter() - start
+        print(f"AI {name}: {checked} pozycji, błędne ruchy: {len(errors)}, czas: {elapsed:.2f} s")
+        for a, b, move in errors[:5]:
+            print(f"  ({a}, {b}) -> {move}")
+
+
+if __name__ == "__main__":
+    main()
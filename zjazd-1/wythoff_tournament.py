@@ -0,0 +1,113 @@
+# python
+"""
+Turniej AI-vs-AI dla gry Wythoffa bez okna Pygame (tryb wsadowy).
+
+Rozgrywa wiele partii pomiędzy algorytmami Negamax o różnych głębokościach
+(ocena WythoffGame.scoring() z perspektywy gracza wykonującego ruch),
+z losowych pozycji startowych, na puli procesów (multiprocessing).
+Raportuje liczbę partii na sekundę, średni czas decyzji dla każdej głębokości
+oraz procent wygranych - pozwala porównać siłę AI z czasem odpowiedzi
+i wychwycić spadki wydajności.
+
+Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+Uruchomienie:
+    python wythoff_tournament.py
+    python wythoff_tournament.py --games 5000 --depths 1 2 3 4 --max-heap 12 --workers 8
+"""
+
+import argparse
+import itertools
+import os
+import random
+import time
+from multiprocessing import Pool
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # bez komunikatu pygame w każdym procesie
+
+from easyAI import AI_Player, Negamax
+
+from wythoff import WythoffGame
+
+
+def play_game(task):
+    """
+    Rozgrywa jedną partię i zwraca (głębokość zwycięzcy, czasy decyzji).
+
+    task: (stosy startowe, głębokość gracza 1, głębokość gracza 2).
+    Czasy decyzji zwracane są jako lista (głębokość, suma czasów, liczba ruchów)
+    dla obu graczy.
+    """
+    heaps, depth1, depth2 = task
+    depths = (depth1, depth2)
+    ais = (Negamax(depth1), Negamax(depth2))
+    game = WythoffGame([AI_Player(ais[0]), AI_Player(ais[1])], list(heaps))
+    elapsed = [0.0, 0.0] # suma czasów decyzji każdego gracza
+    moves = [0, 0] # liczba ruchów każdego gracza
+    while not game.is_over():
+        index = game.current_player - 1
+        start = time.perf_counter()
+        move = ais[index](game)
+        elapsed[index] += time.perf_counter() - start
+        moves[index] += 1
+        game.make_move(move)
+    winner = 3 - game.current_player # wygrywa gracz, który zabrał ostatnią zapałkę
+    return depths[winner - 1], [(depths[i], elapsed[i], moves[i]) for i in range(2)]
+
+
+def make_tasks(games, depths, max_heap, seed):
+    """
+    Tworzy listę partii: losowe stosy i pary różnych głębokości (każdy z każdym, na zmianę
+    kto zaczyna). Partie lustrzane (ta sama głębokość) dają zawsze 50% wygranych, więc są
+    rozgrywane tylko wtedy, gdy podano jedną głębokość.
+    """
+    rng = random.Random(seed)
+    pairs = list(itertools.permutations(depths, 2)) or [(depths[0], depths[0])]
+    pairs = itertools.cycle(pairs)
+    tasks = []
+    for _ in range(games):
+        heaps = (rng.randint(1, max_heap), rng.randint(1, max_heap))
+        depth1, depth2 = next(pairs)
+        tasks.append((heaps, depth1, depth2))
+    return tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turniej AI-vs-AI dla gry Wythoffa (bez okna).")
+    parser.add_argument("--games", type=int, default=1000, help="Liczba partii")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3], help="Głębokości Negamax (różne)")
+    parser.add_argument("--max-heap", type=int, default=10, help="Maksymalny rozmiar stosu na starcie")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Liczba procesów")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno losowania pozycji startowych")
+    args = parser.parse_args()
+    args.depths = list(dict.fromkeys(args.depths)) # bez powtórzeń - inaczej powstałyby partie lustrzane
+
+    tasks = make_tasks(args.games, args.depths, args.max_heap, args.seed)
+    played = dict.fromkeys(args.depths, 0) # partie rozegrane przez daną głębokość
+    wins = dict.fromkeys(args.depths, 0)
+    decision_time = dict.fromkeys(args.depths, 0.0)
+    decisions = dict.fromkeys(args.depths, 0)
+
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        chunksize = max(1, len(tasks) // (args.workers * 8))
+        for winner_depth, stats in pool.imap_unordered(play_game, tasks, chunksize):
+            wins[winner_depth] += 1
+            for depth, elapsed, moves in stats:
+                played[depth] += 1
+                decision_time[depth] += elapsed
+                decisions[depth] += moves
+    elapsed = time.perf_counter() - start
+
+    print(f"Partie: {args.games}, procesy: {args.workers}, czas: {elapsed:.2f} s, "
+          f"{args.games / elapsed:.1f} partii/s")
+    print(f"{'głębokość':>9} | {'partie':>7} | {'wygrane':>8} | {'% wygranych':>11} | {'śr. decyzja [ms]':>16}")
+    print("-" * 64)
+    for depth in args.depths:
+        win_rate = 100 * wins[depth] / played[depth] if played[depth] else 0.0
+        latency = 1e3 * decision_time[depth] / decisions[depth] if decisions[depth] else 0.0
+        print(f"{depth:>9} | {played[depth]:>7} | {wins[depth]:>8} | {win_rate:10.1f}% | {latency:16.3f}")
+
+
+if __name__ == "__main__":
+    main()
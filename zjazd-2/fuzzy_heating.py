@@ -30,9 +30,14 @@ INSTRUKCJA PRZYGOTOWANIA ŚRODOWISKA:
 ================================================================================
 """
 
+import copy
+import hashlib
+import threading
+
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
+from skfuzzy.control.term import TermAggregate
 import matplotlib.pyplot as plt
 
 # ============================================================================
@@ -129,14 +134,153 @@ rule9 = ctrl.Rule(humidity['wysoko'] & temp_room['komfort'], heating_power['nisk
 # ============================================================================
 # Łączymy wszystkie reguły w jeden system fuzzy
 
-# Tworzymy system ze wszystkimi 9 regułami
-heating_ctrl = ctrl.ControlSystem([
-    rule1, rule2, rule3, rule4, rule5, 
+# Wszystkie 9 reguł sterownika
+heating_rules = [
+    rule1, rule2, rule3, rule4, rule5,
     rule6, rule7, rule8, rule9
-])
+]
+
+
+class HeatingEvaluator:
+    """
+    Jednowątkowy ewaluator sterownika - własna symulacja skfuzzy na prywatnej kopii systemu.
+
+    Symulacje skfuzzy przechowują stan obliczeń (wejścia, przynależności, wyniki)
+    w obiektach zmiennych systemu, więc dwie symulacje na tym samym systemie
+    wpływają na siebie nawzajem. Każdy ewaluator ma własną kopię zmiennych,
+    dzięki czemu różne wątki mogą liczyć równolegle bez blokad.
+    Jednego ewaluatora nie należy używać z kilku wątków naraz.
+    """
+
+    def __init__(self, system):
+        self.sim = ctrl.ControlSystemSimulation(copy.deepcopy(system))
+
+    def __call__(self, temp_r, temp_o, humid):
+        """Zwraca moc grzania (%), 0.0 gdy żadna reguła nie jest aktywna."""
+        self.sim.input['temp_room'] = temp_r
+        self.sim.input['temp_outside'] = temp_o
+        self.sim.input['humidity'] = humid
+        # Przy powtórzonych wejściach skfuzzy uzupełnia wyniki z pamięci podręcznej tylko wtedy,
+        # gdy były niepuste - bez czyszczenia zostałby wynik poprzedniego wywołania
+        self.sim.output.clear()
+        self.sim.compute()
+        return self.sim.output.get('heating_power', 0.0)
+
 
-# Tworzymy symulację (instancję) systemu sterującego
-heating_sim = ctrl.ControlSystemSimulation(heating_ctrl)
+def rule_base_fingerprint(system):
+    """
+    Zwraca skrót (SHA-256) reguł i definicji zmiennych systemu: dziedzin, funkcji
+    przynależności, metod akumulacji i defuzyfikacji. Ten sam skrót oznacza te same wyniki -
+    używany jako klucz wyników zapisanych na dysku.
+    """
+    digest = hashlib.sha256()
+    for variable in sorted(system.fuzzy_variables, key=lambda variable: variable.label):
+        digest.update(f"{type(variable).__name__}:{variable.label}".encode())
+        digest.update(np.ascontiguousarray(variable.universe, dtype=np.float64).tobytes())
+        for label, term in variable.terms.items():
+            digest.update(label.encode())
+            digest.update(np.ascontiguousarray(term.mf, dtype=np.float64).tobytes())
+        for method in ('defuzzify_method', 'accumulation_method'):
+            value = getattr(variable, method, None)
+            digest.update(str(getattr(value, '__name__', value)).encode())
+    for rule in system.rules:
+        digest.update(str(rule).encode())
+        digest.update(str([weighted.weight for weighted in rule.consequent]).encode())
+    return digest.hexdigest()
+
+
+class HeatingController:
+    """
+    Sterownik ogrzewania bezpieczny dla wielu wątków.
+
+    System reguł budowany jest raz, a każdy wątek dostaje własny ewaluator
+    (tworzony przy pierwszym wywołaniu w danym wątku i po zmianie reguł, ok. 1-2 ms). Dzięki temu
+    pula wątków może obsługiwać wiele pomieszczeń równolegle.
+
+    Atrybuty:
+        system: system sterujący skfuzzy (tylko do odczytu po utworzeniu)
+
+    Metody:
+        evaluator(): nowy ewaluator, np. dla osobnego zadania
+        changed(): wymusza ponowne policzenie skrótu (zmiany są też wykrywane automatycznie)
+        revision(): skrót bieżących reguł (liczony od nowa, gdy zmieni się ich obraz)
+        fingerprint(): skrót reguł i funkcji przynależności liczony od nowa (klucz plików z wynikami)
+        compute(temp_r, temp_o, humid): moc grzania z ewaluatorem bieżącego wątku
+        compute_batch(temp_r, temp_o, humid): wersja wsadowa dla tablic NumPy
+    """
+
+    def __init__(self, rules=None):
+        self.system = ctrl.ControlSystem(heating_rules if rules is None else rules)
+        self._local = threading.local() # ewaluator przypisany do wątku
+        self._parts = None # (graf systemu, zmienne, reguły) - odczytywane ponownie po addrule
+        self._state = None # (obraz reguł, skrót) ostatniego revision()
+
+    def evaluator(self):
+        """Zwraca nowy, niezależny ewaluator sterownika."""
+        return HeatingEvaluator(self.system)
+
+    def changed(self):
+        """
+        Wymusza ponowne policzenie skrótu przy następnym revision() - dla zmian, których obraz
+        reguł (_snapshot) nie obejmuje, np. podmiany poprzednika w istniejącej regule.
+        """
+        self._state = None
+
+    def _snapshot(self):
+        """
+        Tani obraz reguł (ok. 10 us): tożsamość grafu systemu (zmienia ją addrule), dziedziny,
+        metody i zawartość funkcji przynależności (także zmiany w miejscu, term.mf[:] = ...)
+        oraz poprzedniki, następniki i wagi reguł.
+        """
+        graph = self.system.graph
+        if self._parts is None or self._parts[0] is not graph:
+            self._parts = (graph, list(self.system.fuzzy_variables), list(self.system.rules))
+        _, variables, rules = self._parts
+        return (id(graph),
+                tuple((variable.universe.tobytes(), getattr(variable, 'defuzzify_method', None),
+                       getattr(variable, 'accumulation_method', None),
+                       tuple((label, id(term.mf), term.mf.tobytes()) for label, term in variable.terms.items()))
+                      for variable in variables),
+                tuple((id(rule.antecedent), tuple((id(weighted.term), weighted.weight) for weighted in rule.consequent),
+                       rule.and_func, rule.or_func)
+                      for rule in rules))
+
+    def revision(self):
+        """
+        Zwraca skrót treści reguł i funkcji przynależności (rule_base_fingerprint).
+
+        Przy każdym wywołaniu porównywany jest tani obraz reguł (_snapshot); skrót SHA-256
+        liczony jest od nowa tylko wtedy, gdy obraz się zmienił (albo po changed()).
+        Dwie rewizje są równe wtedy i tylko wtedy, gdy reguły dają te same wyniki.
+        """
+        snapshot = self._snapshot()
+        state = self._state
+        if state is None or state[0] != snapshot:
+            state = self._state = (snapshot, self.fingerprint())
+        return state[1]
+
+    def fingerprint(self):
+        """Zwraca skrót reguł i funkcji przynależności (rule_base_fingerprint)."""
+        return rule_base_fingerprint(self.system)
+
+    def compute(self, temp_r, temp_o, humid):
+        """Oblicza moc grzania (%) ewaluatorem bieżącego wątku."""
+        revision = self.revision()
+        evaluator = getattr(self._local, 'evaluator', None)
+        if evaluator is None or self._local.revision != revision:
+            # Pierwsze wywołanie w wątku albo zmienione reguły - nowa kopia systemu
+            evaluator = self._local.evaluator = self.evaluator()
+            self._local.revision = revision
+        return evaluator(temp_r, temp_o, humid)
+
+    def compute_batch(self, temp_r, temp_o, humid, chunk=2048):
+        """Oblicza moc grzania dla tablic odczytów (tylko odczyt systemu - bez stanu)."""
+        return calculate_heating_batch(temp_r, temp_o, humid, chunk, system=self.system)
+
+
+# Wspólny sterownik modułu i jego system reguł
+heating_controller = HeatingController()
+heating_ctrl = heating_controller.system
 
 # ============================================================================
 # KROK 6: FUNKCJA OBLICZAJĄCĄ MOC GRZANIA
@@ -155,24 +299,117 @@ def calculate_heating(temp_r, temp_o, humid):
         moc grzania (%)
     """
     try:
-        # Podajemy wartości wejściowe do systemu fuzzy
-        heating_sim.input['temp_room'] = temp_r
-        heating_sim.input['temp_outside'] = temp_o
-        heating_sim.input['humidity'] = humid
-        
-        # Obliczamy wyjście
-        heating_sim.compute()
-        
-        # Zwracamy obliczoną moc grzania
-        # Ochrona przed błędem: jeśli output nie istnieje, zwróć 0
-        if 'heating_power' in heating_sim.output:
-            return heating_sim.output['heating_power']
-        else:
-            return 0.0
+        # Obliczamy wyjście ewaluatorem bieżącego wątku (bezpieczne dla wielu wątków)
+        # Jeśli żadna reguła nie jest aktywna, ewaluator zwraca 0
+        return heating_controller.compute(temp_r, temp_o, humid)
     except Exception as e:
         print(f"Błąd w calculate_heating: {e}")
         return 0.0
 
+# ============================================================================
+# KROK 6A: WERSJA WSADOWA - WIELE ODCZYTÓW NARAZ (NUMPY)
+# ============================================================================
+# Te same kroki co w skfuzzy, ale dla całych tablic odczytów jednocześnie:
+# rozmywanie (interpolacja funkcji przynależności), aktywacja reguł (AND = min,
+# OR = max), akumulacja (max) i defuzyfikacja metodą środka ciężkości.
+# Reguły odczytywane są z systemu (domyślnie heating_ctrl), więc zmiana reguł nie wymaga
+# zmian tutaj. Funkcja tylko czyta system, więc można ją wywoływać z wielu wątków.
+
+def _rule_strength(antecedent, memberships, rule):
+    """Zwraca siłę aktywacji poprzednika reguły dla wszystkich odczytów."""
+    if isinstance(antecedent, TermAggregate):
+        if antecedent.kind == 'not':
+            return 1. - _rule_strength(antecedent.term1, memberships, rule)
+        term1 = _rule_strength(antecedent.term1, memberships, rule)
+        term2 = _rule_strength(antecedent.term2, memberships, rule)
+        if antecedent.kind == 'and':
+            return rule.and_func(term1, term2)
+        return rule.or_func(term1, term2)
+    return memberships[antecedent.parent.label][antecedent.label]
+
+
+def _centroid_batch(variable, cuts):
+    """
+    Defuzyfikacja środkiem ciężkości dla wielu odczytów naraz.
+
+    Jak w skfuzzy: do dziedziny wyjścia dodawane są punkty, w których funkcje
+    przynależności przecinają poziom odcięcia, a środek ciężkości liczony jest
+    dokładnie dla funkcji kawałkami liniowej. Zwraca 0.0, gdy żadna reguła nie jest aktywna.
+    """
+    x = variable.universe.astype(np.float64)
+    x0, x1 = x[:-1], x[1:]
+    terms = list(variable.terms.values())
+    count = len(next(iter(cuts.values())))
+
+    # Punkty w każdym odcinku dziedziny: jego początek + przecięcia z poziomami odcięcia
+    points = [np.broadcast_to(x0, (count, len(x0)))]
+    for term in terms:
+        mf0, mf1 = term.mf[:-1], term.mf[1:]
+        level = cuts[term.label][:, None]
+        crossing = (mf0 >= level) != (mf1 >= level)
+        slope = np.where(mf1 != mf0, mf1 - mf0, 1.0)
+        points.append(np.where(crossing, x0 + (level - mf0) * (x1 - x0) / slope, x0))
+    points = np.sort(np.stack(points, axis=-1), axis=-1).reshape(count, -1)
+    points = np.concatenate([points, np.full((count, 1), x[-1])], axis=1)
+
+    # Funkcja wyjściowa: maksimum z obciętych funkcji przynależności
+    output_mf = np.zeros_like(points)
+    for term in terms:
+        clipped = np.minimum(cuts[term.label][:, None], np.interp(points, x, term.mf))
+        np.fmax(output_mf, clipped, out=output_mf)
+
+    # Środek ciężkości funkcji kawałkami liniowej: suma momentów / suma pól
+    xa, xb = points[:, :-1], points[:, 1:]
+    ya, yb = output_mf[:, :-1], output_mf[:, 1:]
+    width = xb - xa
+    area = (width * (ya + yb) / 2).sum(axis=1)
+    moment = (width * (xa * (2 * ya + yb) + xb * (ya + 2 * yb)) / 6).sum(axis=1)
+    return np.divide(moment, area, out=np.zeros(count), where=area > 0)
+
+
+def calculate_heating_batch(temp_r, temp_o, humid, chunk=2048, system=None):
+    """
+    Oblicza moc grzania dla tablic odczytów (wersja wsadowa calculate_heating).
+
+    Args:
+        temp_r: temperatury pomieszczenia (°C) - liczba lub tablica
+        temp_o: temperatury zewnętrzne (°C) - liczba lub tablica
+        humid: wilgotności (%) - liczba lub tablica
+        chunk: liczba odczytów liczonych naraz (ogranicza zużycie pamięci)
+        system: system sterujący (domyślnie heating_ctrl)
+
+    Returns:
+        tablica mocy grzania (%) o kształcie wejść po rozgłoszeniu (broadcasting)
+    """
+    system = heating_ctrl if system is None else system
+    output = next(iter(system.consequents))
+    temp_r, temp_o, humid = np.broadcast_arrays(
+        np.asarray(temp_r, dtype=np.float64),
+        np.asarray(temp_o, dtype=np.float64),
+        np.asarray(humid, dtype=np.float64))
+    shape = temp_r.shape
+    inputs = {'temp_room': temp_r.ravel(), 'temp_outside': temp_o.ravel(), 'humidity': humid.ravel()}
+    result = np.empty(temp_r.size)
+
+    for start in range(0, temp_r.size, chunk):
+        part = slice(start, start + chunk)
+        # Rozmywanie: stopień przynależności do każdego zbioru (wejścia przycięte do zakresu)
+        memberships = {}
+        for antecedent in system.antecedents:
+            universe = antecedent.universe
+            values = np.clip(inputs[antecedent.label][part], universe.min(), universe.max())
+            memberships[antecedent.label] = {label: np.interp(values, universe, term.mf)
+                                             for label, term in antecedent.terms.items()}
+        # Aktywacja reguł i akumulacja poziomów odcięcia dla zbiorów wyjściowych
+        cuts = {label: np.zeros(len(values)) for label in output.terms}
+        for rule in system.rules:
+            strength = _rule_strength(rule.antecedent, memberships, rule)
+            for weighted in rule.consequent:
+                label = weighted.term.label
+                cuts[label] = output.accumulation_method(cuts[label], strength * weighted.weight)
+        result[part] = _centroid_batch(output, cuts)
+    return result.reshape(shape)
+
 # ============================================================================
 # KROK 7: FUNKCJA DEMONSTRACYJNA - TESTOWANIE SYSTEMU
 # ============================================================================
@@ -281,8 +518,19 @@ def visualize_results(wyniki):
     2. Wpływ temperatury wewnątrz na moc grzania (z parametrami stałymi)
     3. Wpływ temperatury zewnątrz na moc grzania (z parametrami stałymi)
     4. Wpływ wilgotności na moc grzania (z parametrami stałymi)
+
+    Wykresy 2-4 to przekroje powierzchni odpowiedzi (fuzzy_heating_surface), zapisanych
+    dodatkowo jako mapy konturowe w fuzzy_heating_surfaces.png.
     """
     
+    # Import lokalny - fuzzy_heating_surface importuje ten moduł
+    from fuzzy_heating_surface import plot_surfaces, response_surface
+
+    # Powierzchnie odpowiedzi (siatka 0.25°C / 0.5%) liczone równolegle albo wczytane z pliku .npz,
+    # jeśli reguły i funkcje przynależności się nie zmieniły; wykresy 2-4 to ich przekroje
+    powierzchnia_temp = response_surface('temp_room', 'temp_outside', 0.25, 0.25, humidity=50)
+    powierzchnia_wilg = response_surface('temp_room', 'humidity', 0.25, 0.5, temp_outside=0)
+
     # Przygotowanie danych do pierwszego wykresu
     przypadki = [w['przypadek'] for w in wyniki]
     moce_grzania = [w['heating_power'] for w in wyniki]
@@ -317,17 +565,12 @@ def visualize_results(wyniki):
     
     # Symulujemy jak zmienia się moc przy zmieniającej się temp wewnątrz
     # Pozostałe parametry: temp_zewn=0°C, wilgotność=50%
-    temperatury_wew = np.arange(10, 31, 1)
-    moce_temp_wew = []
-    
+    # Przekrój powierzchni temp_room x temp_outside (wilgotność 50%)
     print("Generowanie wykresu 2/4: Wpływ temperatury wewnątrz...", end='', flush=True)
-    for t_wew in temperatury_wew:
-        # Używamy dedykowanej funkcji do obliczenia mocy
-        moc = calculate_heating(t_wew, 0, 50)
-        moce_temp_wew.append(moc)
+    temperatury_wew, moce_temp_wew = powierzchnia_temp.along('temp_outside', 0)
     print(" OK")
     
-    ax2.plot(temperatury_wew, moce_temp_wew, 'b-', linewidth=2.5, marker='o')
+    ax2.plot(temperatury_wew, moce_temp_wew, 'b-', linewidth=2.5, marker='o', markevery=4)
     ax2.fill_between(temperatury_wew, moce_temp_wew, alpha=0.3, color='blue')
     ax2.set_xlabel('Temperatura Pomieszczenia (°C)', fontweight='bold')
     ax2.set_ylabel('Moc Grzania (%)', fontweight='bold')
@@ -339,17 +582,12 @@ def visualize_results(wyniki):
     
     # Symulujemy jak zmienia się moc przy zmieniającej się temp zewnątrz
     # Pozostałe parametry: temp_wew=20°C, wilgotność=50%
-    temperatury_zew = np.arange(-15, 21, 1)
-    moce_temp_zew = []
-    
+    # Przekrój tej samej powierzchni przy temp_room = 20°C
     print("Generowanie wykresu 3/4: Wpływ temperatury zewnętrznej...", end='', flush=True)
-    for t_zew in temperatury_zew:
-        # Używamy dedykowanej funkcji do obliczenia mocy
-        moc = calculate_heating(20, t_zew, 50)
-        moce_temp_zew.append(moc)
+    temperatury_zew, moce_temp_zew = powierzchnia_temp.along('temp_room', 20)
     print(" OK")
     
-    ax3.plot(temperatury_zew, moce_temp_zew, 'r-', linewidth=2.5, marker='s')
+    ax3.plot(temperatury_zew, moce_temp_zew, 'r-', linewidth=2.5, marker='s', markevery=4)
     ax3.fill_between(temperatury_zew, moce_temp_zew, alpha=0.3, color='red')
     ax3.set_xlabel('Temperatura Zewnętrzna (°C)', fontweight='bold')
     ax3.set_ylabel('Moc Grzania (%)', fontweight='bold')
@@ -361,17 +599,12 @@ def visualize_results(wyniki):
     
     # Symulujemy jak zmienia się moc przy zmieniającej się wilgotności
     # Pozostałe parametry: temp_wew=20°C, temp_zewn=0°C
-    wilgotnosci = np.arange(20, 101, 2)
-    moce_wilg = []
-    
+    # Przekrój powierzchni temp_room x humidity (temp_zewn 0°C) przy temp_room = 20°C
     print("Generowanie wykresu 4/4: Wpływ wilgotności...", end='', flush=True)
-    for wilg in wilgotnosci:
-        # Używamy dedykowanej funkcji do obliczenia mocy
-        moc = calculate_heating(20, 0, wilg)
-        moce_wilg.append(moc)
+    wilgotnosci, moce_wilg = powierzchnia_wilg.along('temp_room', 20)
     print(" OK")
     
-    ax4.plot(wilgotnosci, moce_wilg, 'g-', linewidth=2.5, marker='^')
+    ax4.plot(wilgotnosci, moce_wilg, 'g-', linewidth=2.5, marker='^', markevery=4)
     ax4.fill_between(wilgotnosci, moce_wilg, alpha=0.3, color='green')
     ax4.set_xlabel('Wilgotność Pomieszczenia (%)', fontweight='bold')
     ax4.set_ylabel('Moc Grzania (%)', fontweight='bold')
@@ -389,6 +622,10 @@ def visualize_results(wyniki):
     
     # Zamknij figurę aby zwolnić pamięć
     plt.close(fig)
+
+    # Pełne powierzchnie odpowiedzi jako mapy konturowe
+    filename = plot_surfaces([powierzchnia_temp, powierzchnia_wilg])
+    print(f"✓ Powierzchnie odpowiedzi zapisane do pliku: {filename}")
     
     print("\n" + "="*80)
     print("WYKRESY ZOSTAŁY WYGENEROWANE")
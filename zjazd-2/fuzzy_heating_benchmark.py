@@ -0,0 +1,112 @@
+"""
+================================================================================
+BENCHMARK STEROWNIKA OGRZEWANIA - SILNIK DOKŁADNY (SKFUZZY) VS TABLICA WARTOŚCI
+================================================================================
+
+OPIS:
+    Mierzy liczbę wywołań na sekundę dla:
+    - calculate_heating() - pełny silnik skfuzzy,
+    - calculate_heating_batch() - wersja wsadowa (NumPy) dokładnego silnika,
+    - HeatingLUT(...) - pojedyncze zapytanie do skompilowanej tablicy,
+    - HeatingLUT.evaluate(...) - zapytania wsadowe (tablice NumPy).
+    Wejścia są losowe (różne w każdym wywołaniu), więc pamięć podręczna skfuzzy
+    nie zawyża wyniku silnika dokładnego.
+
+    Przed pomiarem sprawdzana jest zgodność calculate_heating() i calculate_heating_batch(),
+    także na granicy zakresu (temp_room >= 30°C), gdzie żadna reguła nie jest aktywna
+    i obie wersje muszą zwracać 0.0 - niezależnie od poprzednich wywołań.
+
+AUTORZY ROZWIĄZANIA:
+    Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+UŻYCIE:
+    python fuzzy_heating_benchmark.py
+    python fuzzy_heating_benchmark.py --step 1.0 --max-error 20 --calls 2000
+
+================================================================================
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from fuzzy_heating import calculate_heating, calculate_heating_batch
+from fuzzy_heating_lut import compile_heating_lut
+
+
+def random_inputs(count, seed=0):
+    """Losowe wejścia z zakresów zmiennych: (temp_room, temp_outside, humidity)."""
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(10, 30, count), rng.uniform(-15, 20, count), rng.uniform(20, 100, count))
+
+
+def check_agreement(count=200, tolerance=1e-9, seed=5):
+    """
+    Porównuje calculate_heating() z calculate_heating_batch() na losowych odczytach
+    przeplatanych odczytami bez aktywnych reguł (każdy powtórzony, żeby sprawdzić też
+    wyniki z pamięci podręcznej skfuzzy). Zwraca listę niezgodnych odczytów.
+    """
+    rng = np.random.default_rng(seed + 1)
+    inside = zip(*(x.tolist() for x in random_inputs(count, seed)))
+    boundary = zip(rng.uniform(30, 35, count).tolist(), rng.uniform(-15, 20, count).tolist(),
+                   rng.uniform(40, 100, count).tolist())
+    points = [point for pair in zip(inside, boundary) for point in pair]
+    points += points # drugi przebieg - te same wejścia, wyniki z pamięci podręcznej
+    expected = calculate_heating_batch(*np.array(points).T)
+    return [(point, value, float(reference)) for point, reference in zip(points, expected)
+            if abs((value := calculate_heating(*point)) - reference) > tolerance]
+
+
+def calls_per_second(function, inputs):
+    """Zwraca liczbę wywołań na sekundę funkcji dla kolejnych punktów."""
+    points = list(zip(*(x.tolist() for x in inputs)))
+    start = time.perf_counter()
+    for point in points:
+        function(*point)
+    return len(points) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark silników sterownika ogrzewania.")
+    parser.add_argument("--step", type=float, default=0.5, help="Krok siatki tablicy wartości")
+    parser.add_argument("--max-error", type=float, default=5.0, help="Dopuszczalny błąd tablicy (%%)")
+    parser.add_argument("--calls", type=int, default=500, help="Liczba wywołań silnika dokładnego")
+    args = parser.parse_args()
+
+    mismatches = check_agreement()
+    print(f"Zgodność calculate_heating / calculate_heating_batch (w tym brak aktywnych reguł): "
+          f"{len(mismatches)} niezgodnych odczytów")
+    for point, value, expected in mismatches[:5]:
+        print(f"  {point}: {value} != {expected}")
+    if mismatches:
+        sys.exit(1)
+
+    start = time.perf_counter()
+    lut = compile_heating_lut(step=args.step, max_error=args.max_error)
+    print(f"Kompilacja tablicy {lut.values.shape}: {time.perf_counter() - start:.1f} s, "
+          f"zmierzony błąd maks.: {lut.max_error:.3f}%")
+
+    exact_rate = calls_per_second(calculate_heating, random_inputs(args.calls, seed=1))
+    lut_rate = calls_per_second(lut, random_inputs(100 * args.calls, seed=2))
+    exact_batch = random_inputs(100 * args.calls, seed=4)
+    start = time.perf_counter()
+    calculate_heating_batch(*exact_batch)
+    exact_batch_rate = len(exact_batch[0]) / (time.perf_counter() - start)
+    batch = random_inputs(1000 * args.calls, seed=3)
+    start = time.perf_counter()
+    lut.evaluate(*batch)
+    batch_rate = len(batch[0]) / (time.perf_counter() - start)
+
+    print(f"{'silnik':>28} | {'wywołania/s':>14} | {'przyspieszenie':>14}")
+    print("-" * 64)
+    for name, rate in (("skfuzzy (calculate_heating)", exact_rate),
+                       ("calculate_heating_batch", exact_batch_rate),
+                       ("tablica - pojedynczo", lut_rate),
+                       ("tablica - wsadowo", batch_rate)):
+        print(f"{name:>28} | {rate:14.0f} | {rate / exact_rate:13.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+================================================================================
+PAMIĘĆ PODRĘCZNA STEROWNIKA OGRZEWANIA - KWANTYZOWANE KLUCZE + LRU
+================================================================================
+
+OPIS:
+    Odczyty termostatu powtarzają się z dokładnością czujnika, a każde wywołanie
+    silnika skfuzzy liczy wszystko od nowa (ok. 5 ms). HeatingCache zaokrągla wejścia
+    do zadanej rozdzielczości (np. 0.1°C i 1% wilgotności), liczy moc grzania
+    dla zaokrąglonego punktu i pamięta wynik. Rozmiar pamięci jest ograniczony -
+    najdawniej używane wpisy są usuwane (LRU).
+
+    Liczniki trafień, chybień i usunięć pozwalają dobrać rozdzielczość do
+    wymaganej dokładności. Pamięć jest czyszczona, gdy zmieni się skrót reguł i funkcji
+    przynależności sterownika (HeatingController.revision()) - zmiana jest wykrywana
+    automatycznie, także przy edycji funkcji przynależności w miejscu.
+
+AUTORZY ROZWIĄZANIA:
+    Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+UŻYCIE:
+    from fuzzy_heating_cache import HeatingCache
+    cache = HeatingCache(resolution=(0.1, 0.1, 1.0), max_size=100000)
+    moc = cache(20.04, 5.0, 60.3)          # liczone dla (20.0, 5.0, 60.0)
+    print(cache.stats())
+
+    python fuzzy_heating_cache.py          # trafienia, błąd i przyspieszenie dla kilku rozdzielczości
+
+================================================================================
+"""
+
+import argparse
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from fuzzy_heating import HeatingController, heating_controller, heating_rules
+
+
+class HeatingCache:
+    """
+    Pamięć podręczna LRU przed sterownikiem z kwantyzowanymi kluczami (bezpieczna dla wątków).
+
+    Atrybuty:
+        controller: sterownik liczący chybione wartości (HeatingController)
+        resolution: rozdzielczość (temp_room, temp_outside, humidity)
+        max_size: maksymalna liczba zapamiętanych wyników
+        hits, misses, evictions: liczniki trafień, chybień i usunięć LRU
+        invalidations: ile razy pamięć wyczyszczono po zmianie reguł
+
+    Metody:
+        quantize(temp_r, temp_o, humid): klucz - wejścia w jednostkach rozdzielczości
+        clear(): czyści pamięć i liczniki
+        stats(): liczniki jako słownik
+    """
+
+    def __init__(self, controller=None, resolution=(0.1, 0.1, 1.0), max_size=100000):
+        self.controller = heating_controller if controller is None else controller
+        self.resolution = tuple(float(step) for step in resolution)
+        self.max_size = max_size
+        self._entries = OrderedDict() # klucz -> moc grzania, od najdawniej używanego
+        self._lock = threading.Lock()
+        self._revision = self.controller.revision()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def quantize(self, temp_r, temp_o, humid):
+        """Zwraca klucz: wejścia zaokrąglone do rozdzielczości (liczby całkowite)."""
+        step_r, step_o, step_h = self.resolution
+        return round(temp_r / step_r), round(temp_o / step_o), round(humid / step_h)
+
+    def __call__(self, temp_r, temp_o, humid):
+        """Zwraca moc grzania (%) dla wejść zaokrąglonych do rozdzielczości."""
+        key = self.quantize(temp_r, temp_o, humid)
+        revision = self.controller.revision()
+        with self._lock:
+            if self._revision != revision:
+                # Zmienione reguły lub funkcje przynależności - stare wyniki są nieaktualne
+                self._entries.clear()
+                self._revision = revision
+                self.invalidations += 1
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Liczymy poza blokadą - inne wątki mogą w tym czasie korzystać z pamięci
+        value = self.controller.compute(*(index * step for index, step in zip(key, self.resolution)))
+
+        with self._lock:
+            if self._revision == revision:
+                self._entries[key] = value
+                if len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False) # usuń najdawniej używany
+                    self.evictions += 1
+        return value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Czyści zapamiętane wyniki i liczniki."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        """Zwraca liczniki: trafienia, chybienia, usunięcia, unieważnienia, rozmiar i skuteczność."""
+        calls = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'invalidations': self.invalidations, 'size': len(self._entries),
+                'hit_rate': self.hits / calls if calls else 0.0}
+
+
+# ============================================================================
+# DOBÓR ROZDZIELCZOŚCI - SYMULOWANE ODCZYTY CZUJNIKÓW
+# ============================================================================
+
+def sensor_readings(count, seed=0):
+    """
+    Odczyty termostatu: powolne zmiany (błądzenie losowe) zaokrąglone do dokładności
+    czujnika - 0.01°C dla temperatur i 0.1% dla wilgotności.
+    """
+    rng = np.random.default_rng(seed)
+    temp_r = np.clip(20 + np.cumsum(rng.normal(0, 0.05, count)), 10, 30).round(2)
+    temp_o = np.clip(0 + np.cumsum(rng.normal(0, 0.05, count)), -15, 20).round(2)
+    humid = np.clip(50 + np.cumsum(rng.normal(0, 0.2, count)), 20, 100).round(1)
+    return list(zip(temp_r.tolist(), temp_o.tolist(), humid.tolist()))
+
+
+def check_invalidation(point=(18.0, 5.0, 50.0)):
+    """
+    Edycja funkcji przynależności bez changed() - w miejscu i przez podmianę tablicy - musi
+    wyczyścić pamięć. Zwraca listę (opis, wynik z pamięci, wynik wsadowy, unieważnienia) niezgodności.
+    Zmieniana jest kopia reguł, więc wspólny sterownik modułu pozostaje bez zmian.
+    """
+    controller = HeatingController(copy.deepcopy(heating_rules))
+    cache = HeatingCache(controller)
+    cache(*point)
+    terms = next(variable for variable in controller.system.fuzzy_variables
+                 if variable.label == 'temp_room').terms.values()
+    originals = [term.mf.copy() for term in terms]
+    failures = []
+    for expected_invalidations, label in enumerate(("mf[:] = 0 w miejscu", "podmiana mf"), start=1):
+        for term, original in zip(terms, originals):
+            if expected_invalidations == 1:
+                term.mf[:] = 0 # żadna reguła nie jest aktywna
+            else:
+                term.mf = original.copy()
+        value = cache(*point)
+        expected = float(controller.compute_batch(*([coordinate] for coordinate in point))[0])
+        if abs(value - expected) > 1e-9 or cache.invalidations != expected_invalidations:
+            failures.append((label, value, expected, cache.invalidations))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skuteczność i dokładność pamięci podręcznej sterownika.")
+    parser.add_argument("--readings", type=int, default=3000, help="Liczba symulowanych odczytów")
+    parser.add_argument("--max-size", type=int, default=100000, help="Rozmiar pamięci LRU")
+    args = parser.parse_args()
+
+    failures = check_invalidation()
+    print(f"Unieważnienie po edycji funkcji przynależności bez changed(): {'OK' if not failures else 'BŁĄD'}")
+    for label, value, expected, invalidations in failures:
+        print(f"  {label}: {value} != {expected} (unieważnienia: {invalidations})")
+    if failures:
+        sys.exit(1)
+
+    readings = sensor_readings(args.readings)
+    evaluator = heating_controller.evaluator()
+    start = time.perf_counter()
+    exact = [evaluator(*reading) for reading in readings]
+    exact_time = time.perf_counter() - start
+
+    print(f"Odczyty: {len(readings)}, bez pamięci podręcznej: {exact_time:.2f} s")
+    print(f"{'rozdzielczość':>18} | {'trafienia':>9} | {'usunięte':>8} | {'błąd maks. [%]':>14} | {'czas [s]':>8} | {'przyspieszenie':>14}")
+    print("-" * 88)
+    for resolution in ((0.01, 0.01, 0.1), (0.1, 0.1, 1.0), (0.25, 0.25, 2.0), (0.5, 0.5, 5.0)):
+        cache = HeatingCache(resolution=resolution, max_size=args.max_size)
+        start = time.perf_counter()
+        cached = [cache(*reading) for reading in readings]
+        elapsed = time.perf_counter() - start
+        stats = cache.stats()
+        error = max(abs(a - b) for a, b in zip(cached, exact))
+        label = "/".join(f"{step:g}" for step in resolution)
+        print(f"{label:>18} | {100 * stats['hit_rate']:8.1f}% | {stats['evictions']:>8} | {error:14.3f} | "
+              f"{elapsed:8.2f} | {exact_time / elapsed:13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+================================================================================
+SKOMPILOWANY STEROWNIK OGRZEWANIA - TABLICA WARTOŚCI (LOOKUP TABLE)
+================================================================================
+
+OPIS:
+    Każde wywołanie calculate_heating() przechodzi przez pełny silnik skfuzzy
+    (graf reguł, rozmywanie wejść, defuzyfikacja środkiem ciężkości) i trwa
+    ułamki milisekund. Krok "kompilacji" próbkuje sterownik na siatce 3-D
+    (temp_room x temp_outside x humidity) wersją wsadową calculate_heating_batch(),
+    a zapytania obsługiwane są przez interpolację trójliniową w tablicy NumPy - w mikrosekundach.
+
+    Po kompilacji tablica sprawdzana jest na losowych punktach względem
+    dokładnego silnika; jeśli błąd przekracza max_error, zgłaszany jest ValueError.
+
+AUTORZY ROZWIĄZANIA:
+    Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+UŻYCIE:
+    from fuzzy_heating_lut import compile_heating_lut
+    lut = compile_heating_lut(step=0.5, max_error=5.0)
+    moc = lut(20, 5, 60)                   # pojedyncze zapytanie
+    moce = lut.evaluate(t_r, t_o, humid)   # tablice NumPy
+    lut.save('heating_lut.npz')            # kolejne uruchomienia: HeatingLUT.load('heating_lut.npz')
+                                           # (lut.matches(step) - czy reguły i krok są te same)
+
+================================================================================
+"""
+
+import numpy as np
+from skfuzzy import control as ctrl
+
+from fuzzy_heating import (calculate_heating, calculate_heating_batch, heating_ctrl,
+                           humidity, rule_base_fingerprint, temp_outside, temp_room)
+
+
+# ============================================================================
+# KROK 1: TABLICA WARTOŚCI Z INTERPOLACJĄ TRÓJLINIOWĄ
+# ============================================================================
+
+class HeatingLUT:
+    """
+    Tablica mocy grzania na regularnej siatce 3-D z interpolacją trójliniową.
+
+    Atrybuty:
+        axes: trzy osie siatki (temp_room, temp_outside, humidity)
+        values: tablica mocy grzania o kształcie (len(axes[0]), len(axes[1]), len(axes[2]))
+        max_error: maksymalny błąd zmierzony względem dokładnego silnika (%)
+        fingerprint: skrót reguł, z których skompilowano tablicę (rule_base_fingerprint)
+    """
+
+    def __init__(self, axes, values, max_error=None, fingerprint=None):
+        self.axes = tuple(np.asarray(axis, dtype=np.float64) for axis in axes)
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.max_error = max_error
+        self.fingerprint = fingerprint
+
+        # Parametry siatki jako liczby Pythona - szybka ścieżka dla pojedynczych zapytań
+        self._origin = [float(axis[0]) for axis in self.axes]
+        self._step = [float(axis[1] - axis[0]) for axis in self.axes]
+        self._last = [len(axis) - 1 for axis in self.axes]
+        self._flat = self.values.ravel().tolist()
+        self._strides = [len(self.axes[1]) * len(self.axes[2]), len(self.axes[2]), 1]
+
+    def save(self, path):
+        """Zapisuje tablicę do pliku .npz."""
+        np.savez(path, temp_room=self.axes[0], temp_outside=self.axes[1], humidity=self.axes[2],
+                 values=self.values, max_error=np.nan if self.max_error is None else self.max_error,
+                 fingerprint=self.fingerprint or '')
+
+    @classmethod
+    def load(cls, path):
+        """Wczytuje tablicę zapisaną przez save()."""
+        with np.load(path) as data:
+            max_error = float(data['max_error'])
+            fingerprint = str(data['fingerprint']) if 'fingerprint' in data else ''
+            return cls((data['temp_room'], data['temp_outside'], data['humidity']), data['values'],
+                       None if np.isnan(max_error) else max_error, fingerprint or None)
+
+    def matches(self, step=0.5, humidity_step=None, system=None):
+        """
+        Sprawdza, czy tablica odpowiada bieżącym regułom (skrót) i siatce o podanym kroku -
+        inaczej trzeba ją skompilować od nowa.
+        """
+        system = heating_ctrl if system is None else system
+        axes = (grid_axis(temp_room, step), grid_axis(temp_outside, step),
+                grid_axis(humidity, humidity_step or step))
+        return (self.fingerprint == rule_base_fingerprint(system)
+                and all(np.array_equal(a, b) for a, b in zip(self.axes, axes)))
+
+    def _locate(self, value, dim):
+        """Zwraca (indeks komórki, położenie w komórce 0..1) dla jednej osi."""
+        position = (value - self._origin[dim]) / self._step[dim]
+        # Wartości spoza zakresu przycinamy do granic (jak clip_to_bounds w skfuzzy)
+        if position <= 0.0:
+            return 0, 0.0
+        if position >= self._last[dim]:
+            return self._last[dim] - 1, 1.0
+        index = int(position)
+        return index, position - index
+
+    def __call__(self, temp_r, temp_o, humid):
+        """Zwraca moc grzania (%) dla pojedynczych wartości wejściowych."""
+        i, fi = self._locate(temp_r, 0)
+        j, fj = self._locate(temp_o, 1)
+        k, fk = self._locate(humid, 2)
+        si, sj = self._strides[0], self._strides[1]
+        v = self._flat
+        base = i * si + j * sj + k
+        # Interpolacja wzdłuż wilgotności, potem temperatury zewnętrznej, potem wewnętrznej
+        c00 = v[base] + (v[base + 1] - v[base]) * fk
+        c01 = v[base + sj] + (v[base + sj + 1] - v[base + sj]) * fk
+        c10 = v[base + si] + (v[base + si + 1] - v[base + si]) * fk
+        c11 = v[base + si + sj] + (v[base + si + sj + 1] - v[base + si + sj]) * fk
+        c0 = c00 + (c01 - c00) * fj
+        c1 = c10 + (c11 - c10) * fj
+        return c0 + (c1 - c0) * fi
+
+    def evaluate(self, temp_r, temp_o, humid):
+        """Zwraca moce grzania (%) dla tablic wejść (z rozgłaszaniem NumPy)."""
+        temp_r, temp_o, humid = np.broadcast_arrays(
+            np.asarray(temp_r, dtype=np.float64),
+            np.asarray(temp_o, dtype=np.float64),
+            np.asarray(humid, dtype=np.float64))
+        indices, fractions = [], []
+        for dim, value in enumerate((temp_r, temp_o, humid)):
+            position = np.clip((value - self._origin[dim]) / self._step[dim], 0.0, self._last[dim])
+            index = np.minimum(position.astype(np.intp), self._last[dim] - 1)
+            indices.append(index)
+            fractions.append(position - index)
+        (i, j, k), (fi, fj, fk) = indices, fractions
+        v = self.values
+        c00 = v[i, j, k] + (v[i, j, k + 1] - v[i, j, k]) * fk
+        c01 = v[i, j + 1, k] + (v[i, j + 1, k + 1] - v[i, j + 1, k]) * fk
+        c10 = v[i + 1, j, k] + (v[i + 1, j, k + 1] - v[i + 1, j, k]) * fk
+        c11 = v[i + 1, j + 1, k] + (v[i + 1, j + 1, k + 1] - v[i + 1, j + 1, k]) * fk
+        c0 = c00 + (c01 - c00) * fj
+        c1 = c10 + (c11 - c10) * fj
+        return c0 + (c1 - c0) * fi
+
+
+# ============================================================================
+# KROK 2: KOMPILACJA - PRÓBKOWANIE DOKŁADNEGO SILNIKA NA SIATCE
+# ============================================================================
+
+def grid_axis(variable, step):
+    """Zwraca oś siatki obejmującą cały zakres (universe) zmiennej z krokiem step."""
+    low, high = float(variable.universe.min()), float(variable.universe.max())
+    count = int(round((high - low) / step)) + 1
+    return np.linspace(low, high, count)
+
+
+def exact_heating(temp_r, temp_o, humid, chunk=4096):
+    """
+    Oblicza dokładną moc grzania silnikiem skfuzzy dla tablic wejść.
+
+    Korzysta z trybu tablicowego ControlSystemSimulation (osobna symulacja - ewaluatory
+    HeatingController pracują na własnych kopiach systemu i nie są zmieniane). Fragment, dla którego skfuzzy zgłosi błąd
+    (np. żadna reguła nie jest aktywna), liczony jest punkt po punkcie przez calculate_heating().
+    """
+    temp_r, temp_o, humid = (np.ravel(np.asarray(x, dtype=np.float64)) for x in (temp_r, temp_o, humid))
+    result = np.empty(len(temp_r))
+    for start in range(0, len(temp_r), chunk):
+        part = slice(start, start + chunk)
+        sim = ctrl.ControlSystemSimulation(heating_ctrl, cache=False) # nowa symulacja - inny kształt wejść
+        try:
+            sim.input['temp_room'] = temp_r[part]
+            sim.input['temp_outside'] = temp_o[part]
+            sim.input['humidity'] = humid[part]
+            sim.compute()
+            result[part] = sim.output['heating_power']
+        except Exception:
+            result[part] = [calculate_heating(*point) for point in zip(temp_r[part], temp_o[part], humid[part])]
+    return result
+
+
+def measure_error(lut, samples=200, seed=0):
+    """Zwraca maksymalny błąd bezwzględny tablicy względem dokładnego silnika na losowych punktach."""
+    rng = np.random.default_rng(seed)
+    points = [rng.uniform(axis[0], axis[-1], samples) for axis in lut.axes]
+    return float(np.max(np.abs(lut.evaluate(*points) - exact_heating(*points))))
+
+
+def compile_heating_lut(step=0.5, humidity_step=None, max_error=5.0, check_samples=200, seed=0):
+    """
+    Kompiluje sterownik do tablicy wartości.
+
+    Górna krawędź każdej osi próbkowana jest minimalnie wewnątrz zakresu: dokładnie
+    dla temp_room = 30°C żaden zbiór temperatury nie jest aktywny i wynik skacze,
+    a tablica ma odwzorowywać granicę od strony wnętrza zakresu.
+    Największe błędy interpolacji występują przy temp_room blisko 30°C i niskiej
+    wilgotności (wynik szybko się zmienia) - tam decyduje krok siatki.
+
+    Args:
+        step: krok siatki dla temperatur (°C)
+        humidity_step: krok siatki dla wilgotności (%), domyślnie równy step
+        max_error: dopuszczalny błąd interpolacji względem dokładnego silnika (%)
+        check_samples: liczba losowych punktów do sprawdzenia błędu (0 - bez sprawdzania)
+        seed: ziarno losowania punktów kontrolnych
+
+    Returns:
+        HeatingLUT
+
+    Raises:
+        ValueError: gdy zmierzony błąd przekracza max_error (należy zmniejszyć krok)
+    """
+    axes = (grid_axis(temp_room, step),
+            grid_axis(temp_outside, step),
+            grid_axis(humidity, humidity_step or step))
+    sample_axes = []
+    for axis in axes:
+        sample_axis = axis.copy()
+        sample_axis[-1] -= 1e-6 * (axis[-1] - axis[0]) # granica od strony wnętrza zakresu
+        sample_axes.append(sample_axis)
+    grid = np.meshgrid(*sample_axes, indexing='ij')
+    values = calculate_heating_batch(*grid) # wersja wsadowa - te same wyniki co skfuzzy, znacznie szybciej
+
+    lut = HeatingLUT(axes, values, fingerprint=rule_base_fingerprint(heating_ctrl))
+    if check_samples:
+        lut.max_error = measure_error(lut, check_samples, seed)
+        if lut.max_error > max_error:
+            raise ValueError(f"Błąd tablicy {lut.max_error:.3f}% przekracza max_error={max_error}% "
+                             f"- zmniejsz krok siatki (step={step})")
+    return lut
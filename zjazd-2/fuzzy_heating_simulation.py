@@ -0,0 +1,266 @@
+"""
+================================================================================
+SYMULACJA W PĘTLI ZAMKNIĘTEJ - STEROWNIK OGRZEWANIA + MODEL CIEPLNY POMIESZCZEŃ
+================================================================================
+
+OPIS:
+    Sterownik działa w pętli zamkniętej z prostym modelem cieplnym pomieszczenia
+    (jeden węzeł cieplny - model RC):
+
+        C * dT/dt = UA * (T_zewn - T) + moc_grzania/100 * P_max
+
+    gdzie C - pojemność cieplna [J/K], UA - współczynnik strat ciepła [W/K],
+    P_max - moc grzejnika [W]. Pogoda (temperatura zewnętrzna i wilgotność)
+    dostarczana jest strumieniowo, fragmentami - z generatora syntetycznego albo
+    z pliku CSV - więc rok danych minutowych nie musi mieścić się w pamięci.
+
+    W każdym kroku sterownik liczony jest wsadowo dla wszystkich pomieszczeń
+    naraz: tablicą wartości (LUTController) albo dokładnie
+    (ExactController - calculate_heating_batch). Raport: zużyta energia, czas poza strefą
+    komfortu oraz przepustowość (kroki/s).
+
+AUTORZY ROZWIĄZANIA:
+    Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+UŻYCIE:
+    python fuzzy_heating_simulation.py                          # rok, krok 1 min, 200 pomieszczeń
+    python fuzzy_heating_simulation.py --rooms 500 --days 30
+    python fuzzy_heating_simulation.py --weather pogoda.csv     # kolumny: temp_outside,humidity
+    python fuzzy_heating_simulation.py --controller exact --days 2 --rooms 50
+
+================================================================================
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import time
+
+import numpy as np
+
+from fuzzy_heating import calculate_heating_batch
+from fuzzy_heating_lut import HeatingLUT, compile_heating_lut
+
+MINUTES_PER_DAY = 24 * 60
+
+# Skompilowana tablica wartości - w katalogu modułu, niezależnie od katalogu roboczego
+LUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "heating_lut.npz")
+
+
+# ============================================================================
+# KROK 1: ŹRÓDŁA POGODY - STRUMIENIE FRAGMENTÓW (temp_outside, humidity)
+# ============================================================================
+
+def synthetic_weather(steps, chunk=MINUTES_PER_DAY, dt=60.0, seed=0):
+    """
+    Generator pogody syntetycznej: cykl roczny i dobowy + szum (błądzenie losowe).
+
+    Zwraca kolejne fragmenty (temp_outside, humidity) jako tablice NumPy,
+    łącznie steps kroków po dt sekund, zaczynając od 1 stycznia.
+    """
+    rng = np.random.default_rng(seed)
+    drift_t, drift_h = 0.0, 0.0 # powolne odchylenia pogody od średniej
+    for start in range(0, steps, chunk):
+        days = (start + np.arange(min(chunk, steps - start))) * dt / 86400.0
+        season = -np.cos(2 * np.pi * days / 365.0) # -1 w styczniu, +1 w lipcu
+        daily = -np.cos(2 * np.pi * days) # minimum nad ranem
+        noise_t = drift_t + np.cumsum(rng.normal(0, 0.02, len(days)))
+        noise_h = drift_h + np.cumsum(rng.normal(0, 0.05, len(days)))
+        drift_t, drift_h = 0.999 * noise_t[-1], 0.999 * noise_h[-1]
+        temp_outside = 5 + 12 * season + 4 * daily + noise_t
+        humidity = 60 - 10 * season - 8 * daily + noise_h
+        yield np.clip(temp_outside, -15, 20), np.clip(humidity, 20, 100)
+
+
+def csv_weather(path, chunk=MINUTES_PER_DAY):
+    """
+    Czyta pogodę z pliku CSV (kolumny temp_outside, humidity; jeden wiersz = jeden krok)
+    fragmentami po chunk wierszy.
+    """
+    with open(path, newline='') as file:
+        reader = csv.DictReader(file)
+        while True:
+            rows = list(itertools.islice(reader, chunk))
+            if not rows:
+                return
+            yield (np.array([float(row['temp_outside']) for row in rows]),
+                   np.array([float(row['humidity']) for row in rows]))
+
+
+# ============================================================================
+# KROK 2: MODEL CIEPLNY POMIESZCZEŃ
+# ============================================================================
+
+class Rooms:
+    """
+    Parametry i stan wielu pomieszczeń (tablice NumPy, jeden element = jedno pomieszczenie).
+
+    Atrybuty:
+        ua: współczynnik strat ciepła [W/K]
+        capacity: pojemność cieplna [J/K]
+        heater_power: moc grzejnika przy 100% [W]
+        temperature: bieżąca temperatura wewnątrz [°C]
+    """
+
+    def __init__(self, ua, capacity, heater_power, temperature):
+        self.ua = np.asarray(ua, dtype=np.float64)
+        self.capacity = np.asarray(capacity, dtype=np.float64)
+        self.heater_power = np.asarray(heater_power, dtype=np.float64)
+        self.temperature = np.array(temperature, dtype=np.float64)
+
+    @classmethod
+    def random(cls, count, seed=0):
+        """Losowe pomieszczenia: różna izolacja i wielkość, grzejnik dobrany do strat ciepła."""
+        rng = np.random.default_rng(seed)
+        ua = rng.uniform(30, 80, count)
+        return cls(ua=ua,
+                   capacity=rng.uniform(2e6, 6e6, count),
+                   heater_power=ua * rng.uniform(40, 60, count), # utrzyma ok. 20°C przy -20°C na zewnątrz
+                   temperature=rng.uniform(18, 22, count))
+
+    def __len__(self):
+        return len(self.temperature)
+
+
+# ============================================================================
+# KROK 3: PĘTLA ZAMKNIĘTA
+# ============================================================================
+
+class LUTController:
+    """
+    Sterownik z tablicy wartości dla symulacji.
+
+    W jednym kroku pogoda jest wspólna dla wszystkich pomieszczeń, więc dla całego
+    fragmentu pogody liczone są naraz krzywe mocy względem temp_room (interpolacja po
+    temp_outside i humidity w węzłach osi temp_room). W kroku zostaje tylko np.interp
+    po temperaturze - wynik identyczny z interpolacją trójliniową HeatingLUT.evaluate.
+    """
+
+    def __init__(self, lut):
+        self.lut = lut
+        self.axis = lut.axes[0]
+        self._curves = None
+
+    def prepare(self, temp_outside, humidity):
+        """Liczy krzywe mocy (kroki x węzły temp_room) dla fragmentu pogody."""
+        self._curves = self.lut.evaluate(self.axis[None, :], temp_outside[:, None], humidity[:, None])
+
+    def __call__(self, step, temp_room):
+        """Zwraca moc grzania (%) pomieszczeń w kroku step bieżącego fragmentu."""
+        return np.interp(temp_room, self.axis, self._curves[step])
+
+
+class ExactController:
+    """Dokładny sterownik dla symulacji - calculate_heating_batch w każdym kroku."""
+
+    def prepare(self, temp_outside, humidity):
+        """Zapamiętuje fragment pogody."""
+        self._weather = temp_outside, humidity
+
+    def __call__(self, step, temp_room):
+        """Zwraca moc grzania (%) pomieszczeń w kroku step bieżącego fragmentu."""
+        temp_outside, humidity = self._weather
+        return calculate_heating_batch(temp_room, temp_outside[step], humidity[step])
+
+
+def simulate(rooms, weather, controller, dt=60.0, comfort=(19.0, 24.0)):
+    """
+    Symuluje pomieszczenia w pętli zamkniętej ze sterownikiem.
+
+    Args:
+        rooms: Rooms - stan jest aktualizowany w miejscu
+        weather: iterator fragmentów (temp_outside, humidity)
+        controller: LUTController lub ExactController - prepare(temp_outside, humidity)
+            dla każdego fragmentu pogody, potem controller(krok, temperatury pomieszczeń)
+        dt: krok czasu [s]
+        comfort: strefa komfortu (min, max) [°C]
+
+    Returns:
+        słownik: steps, energy_kwh (na pomieszczenie), violation_steps (na pomieszczenie),
+        elapsed (s), steps_per_second, room_steps_per_second
+    """
+    energy = np.zeros(len(rooms)) # [J]
+    violations = np.zeros(len(rooms), dtype=np.int64)
+    low, high = comfort
+    gain = dt / rooms.capacity # [K/J] - przeliczone raz
+    heater = rooms.heater_power / 100.0 # moc [W] na 1% sterowania
+    temperature = rooms.temperature
+    steps = 0
+
+    start = time.perf_counter()
+    for temp_outside, humidity in weather:
+        controller.prepare(temp_outside, humidity)
+        for step, t_out in enumerate(temp_outside.tolist()):
+            power = controller(step, temperature) * heater # [W]
+            temperature += gain * (rooms.ua * (t_out - temperature) + power)
+            energy += power
+            violations += (temperature < low) | (temperature > high)
+        steps += len(temp_outside)
+    elapsed = time.perf_counter() - start
+
+    return {'steps': steps,
+            'energy_kwh': energy * dt / 3.6e6,
+            'violation_steps': violations,
+            'elapsed': elapsed,
+            'steps_per_second': steps / elapsed,
+            'room_steps_per_second': steps * len(rooms) / elapsed}
+
+
+def make_controller(name, lut_file=None, step=0.5):
+    """
+    Tworzy sterownik symulacji: 'lut' - tablica wartości (wczytana z lut_file albo
+    skompilowana i zapisana), 'exact' - calculate_heating_batch.
+    Plik używany jest tylko wtedy, gdy zapisano go dla bieżących reguł i kroku step
+    (HeatingLUT.matches) - po zmianie reguł lub kroku tablica kompilowana jest od nowa.
+    """
+    if name == 'exact':
+        return ExactController()
+    lut = HeatingLUT.load(lut_file) if lut_file and os.path.exists(lut_file) else None
+    if lut is None or not lut.matches(step):
+        lut = compile_heating_lut(step=step)
+        if lut_file:
+            lut.save(lut_file)
+    return LUTController(lut)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja pomieszczeń w pętli zamkniętej ze sterownikiem.")
+    parser.add_argument("--rooms", type=int, default=200, help="Liczba pomieszczeń")
+    parser.add_argument("--days", type=float, default=365, help="Długość symulacji (dni) dla pogody syntetycznej")
+    parser.add_argument("--dt", type=float, default=60.0, help="Krok symulacji [s]")
+    parser.add_argument("--weather", help="Plik CSV z pogodą (kolumny temp_outside, humidity)")
+    parser.add_argument("--controller", choices=["lut", "exact"], default="lut",
+                        help="lut - tablica wartości, exact - calculate_heating_batch")
+    parser.add_argument("--lut-file", default=LUT_PATH, help="Plik tablicy wartości (tworzony, jeśli nie istnieje)")
+    parser.add_argument("--step", type=float, default=0.5, help="Krok siatki tablicy wartości")
+    parser.add_argument("--comfort", type=float, nargs=2, default=[19.0, 24.0], help="Strefa komfortu [°C]")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno pomieszczeń i pogody")
+    args = parser.parse_args()
+
+    controller = make_controller(args.controller, args.lut_file, args.step)
+    rooms = Rooms.random(args.rooms, args.seed)
+    chunk = max(1, int(86400 / args.dt)) # jedna doba na fragment
+    if args.weather:
+        weather = csv_weather(args.weather, chunk)
+    else:
+        weather = synthetic_weather(int(args.days * 86400 / args.dt), chunk, args.dt, args.seed)
+
+    result = simulate(rooms, weather, controller, args.dt, tuple(args.comfort))
+
+    hours = result['steps'] * args.dt / 3600
+    violation_hours = result['violation_steps'] * args.dt / 3600
+    print(f"Pomieszczenia: {len(rooms)}, kroki: {result['steps']} po {args.dt:g} s ({hours / 24:.1f} dni), "
+          f"sterownik: {args.controller}")
+    print(f"Czas symulacji: {result['elapsed']:.2f} s, {result['steps_per_second']:.0f} kroków/s, "
+          f"{result['room_steps_per_second']:.0f} kroków pomieszczeń/s")
+    print(f"Energia: łącznie {result['energy_kwh'].sum():.0f} kWh, "
+          f"średnio {result['energy_kwh'].mean():.0f} kWh na pomieszczenie")
+    print(f"Poza strefą komfortu {args.comfort[0]:g}-{args.comfort[1]:g}°C: "
+          f"średnio {violation_hours.mean():.1f} h na pomieszczenie "
+          f"({100 * violation_hours.mean() / hours:.1f}% czasu), najgorsze pomieszczenie {violation_hours.max():.1f} h")
+    print(f"Temperatura na koniec: {rooms.temperature.min():.1f}-{rooms.temperature.max():.1f}°C")
+
+
+if __name__ == "__main__":
+    main()
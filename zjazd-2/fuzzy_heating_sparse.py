@@ -0,0 +1,343 @@
+"""
+================================================================================
+RZADKI SILNIK REGUŁ - TYLKO AKTYWNE REGUŁY I AKTYWNY FRAGMENT WYJŚCIA
+================================================================================
+
+OPIS:
+    Funkcje trójkątne (trimf) mają ograniczony nośnik, więc dla danego odczytu
+    aktywnych jest tylko kilka zbiorów rozmytych i kilka reguł. Silnik skfuzzy
+    mimo to liczy wszystkie reguły i agreguje wyjście na całej dziedzinie.
+
+    SparseRuleEngine przy tworzeniu:
+    - dzieli dziedzinę każdego wejścia na przedziały, w których zbiór aktywnych
+      termów (przynależność > 0) się nie zmienia,
+    - indeksuje reguły koniunkcyjne (A & B & ...) po termach, od których zależą.
+    Przy obliczeniu wyszukuje (bisekcją) aktywne termy, wybiera reguły, których
+    wszystkie termy są aktywne, liczy tylko je i defuzyfikuje środkiem ciężkości
+    tylko w zakresie nośników aktywnych zbiorów wyjściowych.
+    Koszt zależy od liczby aktywnych reguł, a nie od liczby wszystkich reguł.
+    Reguły z OR/NOT (które mogą być aktywne bez aktywnych termów) liczone są zawsze.
+
+    Wynik jest taki sam jak w skfuzzy (ta sama defuzyfikacja dokładna dla funkcji
+    kawałkami liniowej co w calculate_heating_batch).
+
+AUTORZY ROZWIĄZANIA:
+    Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+UŻYCIE:
+    from fuzzy_heating_sparse import SparseRuleEngine
+    engine = SparseRuleEngine()            # domyślnie heating_ctrl
+    moc = engine(20, 5, 60)
+    print(engine.last_active_rules)
+
+    python fuzzy_heating_sparse.py         # zgodność, czas i skalowanie z liczbą reguł
+
+================================================================================
+"""
+
+import argparse
+import bisect
+import time
+
+import numpy as np
+import skfuzzy as fuzz
+from skfuzzy import control as ctrl
+from skfuzzy.control.term import TermAggregate
+
+from fuzzy_heating import calculate_heating, calculate_heating_batch, heating_ctrl
+
+
+# ============================================================================
+# KROK 1: INDEKS AKTYWNYCH TERMÓW - PRZEDZIAŁY NOŚNIKÓW
+# ============================================================================
+
+def _support(universe, mf):
+    """
+    Zwraca (dolny, górny) kraniec nośnika funkcji przynależności (przynależność > 0).
+
+    Przynależność jest interpolowana liniowo, więc nośnik sięga do sąsiednich
+    punktów dziedziny. Krańce dziedziny należą do nośnika (wejścia są do nich przycinane).
+    """
+    nonzero = np.flatnonzero(mf > 0)
+    if not len(nonzero):
+        return None
+    first, last = nonzero[0], nonzero[-1]
+    low = universe[first - 1] if first > 0 else universe[0] - 1.0
+    high = universe[last + 1] if last < len(universe) - 1 else universe[-1] + 1.0
+    return float(low), float(high)
+
+
+class _TermIndex:
+    """Aktywne termy jednej zmiennej wejściowej dla przedziałów między krańcami nośników."""
+
+    def __init__(self, variable):
+        self.label = variable.label
+        self.low, self.high = float(variable.universe.min()), float(variable.universe.max())
+        self.universe = variable.universe.astype(np.float64).tolist()
+        self.mfs = {label: term.mf.astype(np.float64).tolist() for label, term in variable.terms.items()}
+        supports = {label: _support(variable.universe, term.mf) for label, term in variable.terms.items()}
+        supports = {label: support for label, support in supports.items() if support is not None}
+        self.breakpoints = sorted({end for support in supports.values() for end in support})
+        # Termy aktywne dokładnie w krańcu przedziału oraz wewnątrz przedziału (nośniki są otwarte)
+        self.at_point = [tuple(label for label, (low, high) in supports.items() if low < point < high)
+                         for point in self.breakpoints]
+        edges = [-np.inf] + self.breakpoints + [np.inf]
+        self.between = [tuple(label for label, (low, high) in supports.items()
+                              if low <= edges[i] and edges[i + 1] <= high)
+                        for i in range(len(edges) - 1)]
+
+    def memberships(self, value):
+        """Zwraca {term: przynależność} tylko dla aktywnych termów (wejście przycięte do dziedziny)."""
+        value = min(max(value, self.low), self.high)
+        position = bisect.bisect_left(self.breakpoints, value)
+        if position < len(self.breakpoints) and self.breakpoints[position] == value:
+            labels = self.at_point[position]
+        else:
+            labels = self.between[position]
+        if not labels:
+            return {}
+        # Interpolacja liniowa jak np.interp - jeden odcinek dziedziny
+        x = self.universe
+        right = min(max(bisect.bisect_right(x, value), 1), len(x) - 1)
+        fraction = (value - x[right - 1]) / (x[right] - x[right - 1])
+        result = {}
+        for label in labels:
+            mf = self.mfs[label]
+            degree = mf[right - 1] + (mf[right] - mf[right - 1]) * fraction
+            if degree > 0:
+                result[label] = degree
+        return result
+
+
+# ============================================================================
+# KROK 2: SILNIK - INDEKS REGUŁ I AGREGACJA NA AKTYWNYM NOŚNIKU
+# ============================================================================
+
+def _conjunction_terms(antecedent):
+    """Zwraca listę termów reguły czysto koniunkcyjnej (A & B & ...) albo None dla OR/NOT."""
+    if isinstance(antecedent, TermAggregate):
+        if antecedent.kind != 'and':
+            return None
+        first = _conjunction_terms(antecedent.term1)
+        second = _conjunction_terms(antecedent.term2)
+        return None if first is None or second is None else first + second
+    return [(antecedent.parent.label, antecedent.label)]
+
+
+def _strength(antecedent, memberships, rule):
+    """Siła aktywacji poprzednika reguły; nieaktywne termy mają przynależność 0."""
+    if isinstance(antecedent, TermAggregate):
+        if antecedent.kind == 'not':
+            return 1. - _strength(antecedent.term1, memberships, rule)
+        first = _strength(antecedent.term1, memberships, rule)
+        second = _strength(antecedent.term2, memberships, rule)
+        if antecedent.kind == 'and':
+            return float(rule.and_func(first, second))
+        return float(rule.or_func(first, second))
+    return memberships[antecedent.parent.label].get(antecedent.label, 0.0)
+
+
+class SparseRuleEngine:
+    """
+    Silnik wnioskowania liczący tylko aktywne reguły.
+
+    Atrybuty:
+        system: system sterujący skfuzzy (reguły i zmienne)
+        sparse: False - liczy wszystkie reguły na całej dziedzinie (do porównań)
+        last_active_rules: liczba reguł o niezerowej sile w ostatnim wywołaniu
+
+    Metody:
+        __call__(temp_r, temp_o, humid): moc grzania (%), 0.0 gdy żadna reguła nie jest aktywna
+        evaluate(inputs): to samo dla słownika {etykieta wejścia: wartość}
+    """
+
+    def __init__(self, system=None, sparse=True):
+        self.system = heating_ctrl if system is None else system
+        self.sparse = sparse
+        self.inputs = {variable.label: _TermIndex(variable) for variable in self.system.antecedents}
+        self.output = next(iter(self.system.consequents))
+        self.rules = list(self.system.rules)
+
+        # Indeks: term -> reguły koniunkcyjne, które od niego zależą
+        self._rules_by_term = {}
+        self._required = [] # liczba różnych termów potrzebnych do aktywacji reguły
+        self._always = [] # reguły z OR/NOT - liczone zawsze
+        for index, rule in enumerate(self.rules):
+            terms = _conjunction_terms(rule.antecedent)
+            if terms is None:
+                self._always.append(index)
+                self._required.append(0)
+                continue
+            terms = set(terms)
+            self._required.append(len(terms))
+            for term in terms:
+                self._rules_by_term.setdefault(term, []).append(index)
+
+        # Wyjście: dziedzina, funkcje przynależności i zakresy indeksów nośników
+        self._x = self.output.universe.astype(np.float64)
+        self._mfs = {label: term.mf.astype(np.float64) for label, term in self.output.terms.items()}
+        self._ranges = {}
+        for label, mf in self._mfs.items():
+            nonzero = np.flatnonzero(mf > 0)
+            if len(nonzero):
+                self._ranges[label] = (max(nonzero[0] - 1, 0), min(nonzero[-1] + 1, len(mf) - 1))
+        self.last_active_rules = 0
+
+    def _candidates(self, memberships):
+        """Zwraca indeksy reguł, których wszystkie termy są aktywne (plus reguły z OR/NOT)."""
+        if not self.sparse:
+            return range(len(self.rules))
+        counts = {}
+        for variable, degrees in memberships.items():
+            for label in degrees:
+                for index in self._rules_by_term.get((variable, label), ()):
+                    counts[index] = counts.get(index, 0) + 1
+        candidates = [index for index, count in counts.items() if count == self._required[index]]
+        return sorted(candidates + self._always)
+
+    def evaluate(self, inputs):
+        """Zwraca moc grzania (%) dla słownika {etykieta wejścia: wartość}."""
+        memberships = {label: index.memberships(inputs[label]) for label, index in self.inputs.items()}
+        cuts = {}
+        active = 0
+        for index in self._candidates(memberships):
+            rule = self.rules[index]
+            strength = _strength(rule.antecedent, memberships, rule)
+            if strength <= 0:
+                continue
+            active += 1
+            for weighted in rule.consequent:
+                label = weighted.term.label
+                level = strength * weighted.weight
+                cuts[label] = float(self.output.accumulation_method(cuts.get(label, 0.0), level))
+        self.last_active_rules = active
+        cuts = {label: level for label, level in cuts.items() if level > 0 and label in self._ranges}
+        if not cuts:
+            return 0.0
+        return self._centroid(cuts)
+
+    def __call__(self, temp_r, temp_o, humid):
+        """Zwraca moc grzania (%) dla pojedynczego odczytu."""
+        return self.evaluate({'temp_room': temp_r, 'temp_outside': temp_o, 'humidity': humid})
+
+    def _centroid(self, cuts):
+        """Środek ciężkości obciętych zbiorów wyjściowych - tylko na zakresie ich nośników."""
+        if self.sparse:
+            start = min(self._ranges[label][0] for label in cuts)
+            stop = max(self._ranges[label][1] for label in cuts) + 1
+        else:
+            start, stop = 0, len(self._x)
+        x = self._x[start:stop]
+        x0, x1 = x[:-1], x[1:]
+
+        # Punkty dziedziny + przecięcia funkcji przynależności z poziomami odcięcia
+        points = [x]
+        for label, level in cuts.items():
+            mf = self._mfs[label][start:stop]
+            mf0, mf1 = mf[:-1], mf[1:]
+            crossing = (mf0 >= level) != (mf1 >= level)
+            if crossing.any():
+                points.append(x0[crossing] + (level - mf0[crossing]) * (x1 - x0)[crossing]
+                              / (mf1 - mf0)[crossing])
+        points = np.unique(np.concatenate(points))
+
+        output_mf = np.zeros_like(points)
+        for label, level in cuts.items():
+            np.fmax(output_mf, np.minimum(level, np.interp(points, x, self._mfs[label][start:stop])), out=output_mf)
+
+        xa, xb = points[:-1], points[1:]
+        ya, yb = output_mf[:-1], output_mf[1:]
+        width = xb - xa
+        area = float((width * (ya + yb)).sum() / 2)
+        if area <= 0:
+            return 0.0
+        moment = float((width * (xa * (2 * ya + yb) + xb * (ya + 2 * yb))).sum() / 6)
+        return moment / area
+
+
+# ============================================================================
+# KROK 3: BENCHMARK - ZGODNOŚĆ I SKALOWANIE Z LICZBĄ REGUŁ
+# ============================================================================
+
+def partitioned_system(terms_per_input):
+    """
+    Buduje syntetyczny system (np. dla budynku wielostrefowego) z gęstszym podziałem
+    temperatur: terms_per_input trójkątów na temp_room i temp_outside, reguła dla
+    każdej pary termów oraz reguły wilgotności - razem terms_per_input² + 3 reguły.
+    """
+    temp_r = ctrl.Antecedent(np.arange(10, 31, 1), 'temp_room')
+    temp_o = ctrl.Antecedent(np.arange(-15, 21, 1), 'temp_outside')
+    humid = ctrl.Antecedent(np.arange(20, 101, 1), 'humidity')
+    power = ctrl.Consequent(np.arange(0, 101, 1), 'heating_power')
+    for variable in (temp_r, temp_o):
+        peaks = np.linspace(variable.universe[0], variable.universe[-1], terms_per_input)
+        width = peaks[1] - peaks[0]
+        for i, peak in enumerate(peaks):
+            variable[f't{i}'] = fuzz.trimf(variable.universe, [peak - width, peak, peak + width])
+    humid.automf(3, names=['nisko', 'umiarkowana', 'wysoko'])
+    power.automf(5, names=['brak', 'niska', 'średnia', 'wysoka', 'max'])
+
+    labels = list(power.terms)
+    rules = []
+    for i in range(terms_per_input):
+        for j in range(terms_per_input):
+            # zimniej w środku i na zewnątrz -> większa moc
+            demand = 1 - (i + 0.5 * j) / (1.5 * (terms_per_input - 1))
+            rules.append(ctrl.Rule(temp_r[f't{i}'] & temp_o[f't{j}'],
+                                   power[labels[int(round(demand * (len(labels) - 1)))]]))
+    rules.append(ctrl.Rule(humid['nisko'], power['wysoka']))
+    rules.append(ctrl.Rule(humid['umiarkowana'], power['średnia']))
+    rules.append(ctrl.Rule(humid['wysoko'], power['niska']))
+    return ctrl.ControlSystem(rules)
+
+
+def _time_per_call(function, points):
+    start = time.perf_counter()
+    for point in points:
+        function(*point)
+    return (time.perf_counter() - start) / len(points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rzadki silnik reguł - zgodność i skalowanie.")
+    parser.add_argument("--samples", type=int, default=2000, help="Liczba losowych odczytów")
+    parser.add_argument("--terms", type=int, nargs="+", default=[3, 6, 10, 20],
+                        help="Liczba termów na temperaturę w systemach syntetycznych")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    points = np.column_stack([rng.uniform(10, 30, args.samples), rng.uniform(-15, 20, args.samples),
+                              rng.uniform(20, 100, args.samples)])
+    points[:args.samples // 4] = np.round(points[:args.samples // 4]) # także punkty siatki i krańce nośników
+    points = points.tolist()
+
+    engine = SparseRuleEngine()
+    exact_time = _time_per_call(calculate_heating, points[:200]) # przed porównaniem - bez trafień w pamięć skfuzzy
+    # skfuzzy (calculate_heating) na próbce co n-tego odczytu - obejmuje też punkty siatki z początku listy
+    sampled = points[::max(1, len(points) // 400)]
+    skfuzzy_error = max(abs(engine(*point) - calculate_heating(*point)) for point in sampled)
+    expected = calculate_heating_batch(*np.array(points).T)
+    batch_error = max(abs(engine(*point) - value) for point, value in zip(points, expected))
+    sparse_time = _time_per_call(engine, points)
+    print(f"Reguły sterownika: {len(engine.rules)}, maks. różnica względem skfuzzy ({len(sampled)} odczytów): "
+          f"{skfuzzy_error:.2e}, względem calculate_heating_batch ({len(points)} odczytów): {batch_error:.2e}")
+    print(f"skfuzzy: {exact_time * 1e6:.0f} us/wywołanie, silnik rzadki: {sparse_time * 1e6:.0f} us/wywołanie "
+          f"({exact_time / sparse_time:.0f}x)")
+
+    print(f"\n{'reguły':>7} | {'aktywne (śr.)':>13} | {'wszystkie [us]':>14} | {'rzadko [us]':>11} | {'przyspieszenie':>14}")
+    print("-" * 72)
+    for terms in args.terms:
+        system = partitioned_system(terms)
+        sparse, dense = SparseRuleEngine(system), SparseRuleEngine(system, sparse=False)
+        active = 0
+        for point in points[:200]:
+            sparse(*point)
+            active += sparse.last_active_rules
+        dense_time = _time_per_call(dense, points[:200])
+        sparse_time = _time_per_call(sparse, points[:200])
+        print(f"{len(sparse.rules):>7} | {active / 200:13.1f} | {dense_time * 1e6:14.0f} | {sparse_time * 1e6:11.0f} | "
+              f"{dense_time / sparse_time:13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
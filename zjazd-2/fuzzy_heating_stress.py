@@ -0,0 +1,127 @@
+"""
+================================================================================
+TEST OBCIĄŻENIOWY STEROWNIKA OGRZEWANIA - WIELE WĄTKÓW NARAZ
+================================================================================
+
+OPIS:
+    Sprawdza, czy HeatingController daje deterministyczne wyniki przy
+    równoległych wywołaniach z wielu wątków. Najpierw wyniki dla wszystkich
+    pomieszczeń liczone są jednym ewaluatorem (wynik wzorcowy), potem pula
+    wątków liczy je wielokrotnie w losowej kolejności i każdy wynik musi być
+    identyczny z wzorcowym.
+
+    Odczyty obejmują też granicę zakresu (temp_room >= 30°C), gdzie żadna reguła
+    nie jest aktywna i wynik musi wynosić 0.0.
+
+    Opcja --shared uruchamia ten sam test na jednej wspólnej symulacji skfuzzy
+    (dawny globalny heating_sim) - pokazuje, że wątki nadpisują sobie wejścia.
+
+AUTORZY ROZWIĄZANIA:
+    Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+UŻYCIE:
+    python fuzzy_heating_stress.py
+    python fuzzy_heating_stress.py --threads 16 --rooms 200 --rounds 5
+    python fuzzy_heating_stress.py --shared
+
+================================================================================
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from skfuzzy import control as ctrl
+
+from fuzzy_heating import HeatingController
+
+
+def random_rooms(count, readings, seed=0, boundary=0.2):
+    """
+    Losowe odczyty (temp_room, temp_outside, humidity) dla każdego pomieszczenia.
+
+    Część odczytów (boundary) leży na granicy zakresu: temp_room >= 30°C przy wilgotności
+    >= 40% - żadna reguła nie jest aktywna i wynik musi wynosić 0.0 niezależnie od
+    wcześniejszych obliczeń ewaluatora.
+    """
+    rng = random.Random(seed)
+
+    def reading():
+        if rng.random() < boundary:
+            return rng.uniform(30, 35), rng.uniform(-15, 20), rng.uniform(40, 100)
+        return rng.uniform(10, 30), rng.uniform(-15, 20), rng.uniform(20, 100)
+    return [[reading() for _ in range(readings)] for _ in range(count)]
+
+
+def shared_compute(controller):
+    """Zwraca funkcję liczącą na jednej wspólnej symulacji (bez ochrony - jak dawny heating_sim)."""
+    sim = ctrl.ControlSystemSimulation(controller.system)
+
+    def compute(temp_r, temp_o, humid):
+        try:
+            sim.input['temp_room'] = temp_r
+            sim.input['temp_outside'] = temp_o
+            sim.input['humidity'] = humid
+            sim.compute()
+            return sim.output.get('heating_power', 0.0)
+        except Exception: # uszkodzony stan symulacji też jest błędem wyniku
+            return None
+    return compute
+
+
+def stress_test(controller, rooms, threads, rounds, compute=None):
+    """
+    Liczy moc grzania dla wszystkich pomieszczeń równolegle i porównuje z wynikiem wzorcowym.
+
+    Returns:
+        (liczba wywołań, liczba niezgodnych wyników, czas w sekundach, liczba użytych wątków)
+    """
+    reference_evaluator = controller.evaluator()
+    reference = [[reference_evaluator(*reading) for reading in room] for room in rooms]
+    compute = compute or controller.compute
+    used_threads = set()
+
+    def serve_room(index):
+        used_threads.add(threading.get_ident())
+        return index, [compute(*reading) for reading in rooms[index]]
+
+    tasks = [index for _ in range(rounds) for index in range(len(rooms))]
+    random.Random(1).shuffle(tasks) # te same pomieszczenia w różnych wątkach i kolejności
+    mismatches = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for index, results in pool.map(serve_room, tasks):
+            mismatches += sum(result != expected for result, expected in zip(results, reference[index]))
+    elapsed = time.perf_counter() - start
+    calls = sum(len(rooms[index]) for index in tasks)
+    return calls, mismatches, elapsed, len(used_threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test wielowątkowy sterownika ogrzewania.")
+    parser.add_argument("--threads", type=int, default=8, help="Liczba wątków")
+    parser.add_argument("--rooms", type=int, default=100, help="Liczba pomieszczeń")
+    parser.add_argument("--readings", type=int, default=10, help="Liczba odczytów na pomieszczenie")
+    parser.add_argument("--rounds", type=int, default=3, help="Ile razy każde pomieszczenie jest liczone")
+    parser.add_argument("--shared", action="store_true",
+                        help="Jedna wspólna symulacja skfuzzy zamiast ewaluatorów wątków")
+    args = parser.parse_args()
+
+    controller = HeatingController()
+    rooms = random_rooms(args.rooms, args.readings)
+    compute = shared_compute(controller) if args.shared else None
+    calls, mismatches, elapsed, used_threads = stress_test(controller, rooms, args.threads, args.rounds, compute)
+
+    mode = "wspólna symulacja" if args.shared else "HeatingController"
+    print(f"{mode}: {calls} wywołań, {used_threads} wątków, {elapsed:.2f} s ({calls / elapsed:.0f} wywołań/s)")
+    print(f"Niezgodne wyniki: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+    print("✓ Wyniki deterministyczne")
+
+
+if __name__ == "__main__":
+    main()
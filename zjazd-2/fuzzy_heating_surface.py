@@ -0,0 +1,196 @@
+"""
+================================================================================
+POWIERZCHNIE ODPOWIEDZI STEROWNIKA - OBLICZENIA RÓWNOLEGŁE Z PAMIĘCIĄ NA DYSKU
+================================================================================
+
+OPIS:
+    Powierzchnia odpowiedzi to moc grzania na pełnej siatce 2-D dwóch wejść przy
+    stałej wartości trzeciego (np. temp_room x temp_outside przy wilgotności 50%).
+    Wiersze siatki liczone są na puli procesów (calculate_heating_batch), a wynik
+    zapisywany jest do pliku .npz, którego nazwa zawiera skrót reguł i funkcji
+    przynależności (rule_base_fingerprint). Kolejne wykresy przy niezmienionych
+    regułach tylko wczytują plik; po zmianie reguł skrót się zmienia i powierzchnia
+    jest liczona od nowa.
+
+AUTORZY ROZWIĄZANIA:
+    Autorzy: Michał Małolepszy (s29097), Aleksander Bastek (s27454)
+
+UŻYCIE:
+    from fuzzy_heating_surface import response_surface
+    surface = response_surface('temp_room', 'temp_outside', humidity=50)
+    surface.values[i, j]                   # moc dla surface.x[i], surface.y[j]
+
+    python fuzzy_heating_surface.py                        # liczy (lub wczytuje) i rysuje powierzchnie
+    python fuzzy_heating_surface.py --step 0.1 --workers 8
+
+================================================================================
+"""
+
+import argparse
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fuzzy_heating import calculate_heating_batch, heating_ctrl, rule_base_fingerprint
+
+# Względem katalogu modułu - niezależnie od katalogu roboczego
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.surface_cache')
+
+INPUTS = ('temp_room', 'temp_outside', 'humidity')
+
+
+class ResponseSurface:
+    """
+    Moc grzania na siatce dwóch wejść przy stałym trzecim.
+
+    Atrybuty:
+        x_label, y_label: nazwy wejść na osiach
+        x, y: wartości siatki
+        fixed: {nazwa trzeciego wejścia: wartość}
+        values: tablica (len(x), len(y)) mocy grzania (%)
+        fingerprint: skrót reguł, dla których liczono powierzchnię
+    """
+
+    def __init__(self, x_label, x, y_label, y, fixed, values, fingerprint):
+        self.x_label, self.x = x_label, np.asarray(x)
+        self.y_label, self.y = y_label, np.asarray(y)
+        self.fixed = dict(fixed)
+        self.values = np.asarray(values)
+        self.fingerprint = fingerprint
+
+    def save(self, path):
+        """Zapisuje powierzchnię do pliku .npz."""
+        (fixed_label, fixed_value), = self.fixed.items()
+        np.savez(path, x_label=self.x_label, x=self.x, y_label=self.y_label, y=self.y,
+                 fixed_label=fixed_label, fixed_value=fixed_value, values=self.values,
+                 fingerprint=self.fingerprint)
+
+    @classmethod
+    def load(cls, path):
+        """Wczytuje powierzchnię zapisaną przez save()."""
+        with np.load(path) as data:
+            return cls(str(data['x_label']), data['x'], str(data['y_label']), data['y'],
+                       {str(data['fixed_label']): float(data['fixed_value'])}, data['values'],
+                       str(data['fingerprint']))
+
+    def along(self, label, value):
+        """Zwraca (oś, moce) - przekrój powierzchni przy label = value (najbliższy węzeł)."""
+        if label == self.x_label:
+            return self.y, self.values[np.abs(self.x - value).argmin(), :]
+        return self.x, self.values[:, np.abs(self.y - value).argmin()]
+
+
+def grid(label, step):
+    """Zwraca siatkę wartości wejścia label z krokiem step (pełny zakres zmiennej)."""
+    variable = next(variable for variable in heating_ctrl.antecedents if variable.label == label)
+    low, high = float(variable.universe.min()), float(variable.universe.max())
+    return np.linspace(low, high, int(round((high - low) / step)) + 1)
+
+
+# ============================================================================
+# OBLICZENIA NA PULI PROCESÓW
+# ============================================================================
+
+_worker_system = None # system reguł przekazany do procesu roboczego
+
+
+def _init_worker(system_bytes):
+    """Inicjalizacja procesu roboczego - system reguł z procesu głównego (także zmieniony w locie)."""
+    global _worker_system
+    _worker_system = pickle.loads(system_bytes)
+
+
+def _compute_rows(task):
+    """Liczy fragment wierszy powierzchni: task = (wejścia jako słownik tablic)."""
+    return calculate_heating_batch(task['temp_room'], task['temp_outside'], task['humidity'],
+                                   system=_worker_system)
+
+
+def response_surface(x_label, y_label, x_step=0.25, y_step=0.25, workers=None, cache_dir=CACHE_DIR,
+                     system=None, **fixed):
+    """
+    Zwraca powierzchnię odpowiedzi (wczytaną z pliku albo policzoną równolegle i zapisaną).
+
+    Args:
+        x_label, y_label: wejścia na osiach (temp_room, temp_outside, humidity)
+        x_step, y_step: kroki siatki
+        workers: liczba procesów (1 - bez puli, None - liczba rdzeni)
+        cache_dir: katalog plików .npz (None - bez zapisu)
+        system: system reguł (domyślnie heating_ctrl)
+        fixed: wartość trzeciego wejścia, np. humidity=50
+    """
+    system = heating_ctrl if system is None else system
+    (fixed_label, fixed_value), = fixed.items()
+    fingerprint = rule_base_fingerprint(system)
+    x, y = grid(x_label, x_step), grid(y_label, y_step)
+
+    path = None
+    if cache_dir:
+        name = f"{x_label}_{x_step:g}_{y_label}_{y_step:g}_{fixed_label}_{fixed_value:g}_{fingerprint[:16]}.npz"
+        path = os.path.join(cache_dir, name)
+        if os.path.exists(path):
+            surface = ResponseSurface.load(path)
+            if surface.fingerprint == fingerprint:
+                return surface
+
+    # Podział wierszy na fragmenty - kilka na proces, żeby wyrównać obciążenie
+    workers = workers or os.cpu_count()
+    tasks = []
+    for rows in np.array_split(x, max(1, min(len(x), 4 * workers))):
+        inputs = {x_label: rows[:, None], y_label: y[None, :], fixed_label: fixed_value}
+        tasks.append({label: np.broadcast_to(inputs[label], (len(rows), len(y))) for label in INPUTS})
+    if workers == 1:
+        parts = [calculate_heating_batch(task['temp_room'], task['temp_outside'], task['humidity'], system=system)
+                 for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(pickle.dumps(system),)) as pool:
+            parts = list(pool.map(_compute_rows, tasks))
+
+    surface = ResponseSurface(x_label, x, y_label, y, fixed, np.concatenate(parts), fingerprint)
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        surface.save(path)
+    return surface
+
+
+def plot_surfaces(surfaces, filename='fuzzy_heating_surfaces.png'):
+    """Rysuje powierzchnie odpowiedzi jako mapy konturowe i zapisuje do pliku PNG."""
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, len(surfaces), figsize=(7 * len(surfaces), 5.5), squeeze=False)
+    for ax, surface in zip(axes[0], surfaces):
+        contour = ax.contourf(surface.y, surface.x, surface.values, levels=np.linspace(0, 100, 21), cmap='inferno')
+        (fixed_label, fixed_value), = surface.fixed.items()
+        ax.set_xlabel(surface.y_label, fontweight='bold')
+        ax.set_ylabel(surface.x_label, fontweight='bold')
+        ax.set_title(f'Moc grzania (%) przy {fixed_label} = {fixed_value:g}', fontweight='bold')
+        fig.colorbar(contour, ax=ax)
+    plt.tight_layout()
+    plt.savefig(filename, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    return filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Powierzchnie odpowiedzi sterownika (równolegle, z pamięcią .npz).")
+    parser.add_argument("--step", type=float, default=0.25, help="Krok siatki")
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Katalog plików .npz")
+    args = parser.parse_args()
+
+    specs = ((('temp_room', 'temp_outside'), {'humidity': 50}),
+             (('temp_room', 'humidity'), {'temp_outside': 0}))
+    surfaces = []
+    for (x_label, y_label), fixed in specs:
+        start = time.perf_counter()
+        surface = response_surface(x_label, y_label, args.step, args.step, args.workers, args.cache_dir, **fixed)
+        print(f"{x_label} x {y_label} {surface.values.shape}: {time.perf_counter() - start:.2f} s")
+        surfaces.append(surface)
+    print(f"Zapisano: {plot_surfaces(surfaces)}")
+
+
+if __name__ == "__main__":
+    main()
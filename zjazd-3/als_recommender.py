@@ -0,0 +1,139 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Alternatywny model rekomendacji: faktoryzacja macierzy ocen metodą naprzemiennych
+# najmniejszych kwadratów (ALS).
+# - Ocena szacowana = średnia ocen + <wektor użytkownika, wektor filmu> (wektory długości factors),
+# - w każdej iteracji na przemian liczone są wektory wszystkich użytkowników (przy stałych
+#   wektorach filmów) i wszystkich filmów; każdy wektor to rozwiązanie układu f x f,
+#   a układy budowane są iloczynem rzadkiego wzorca ocen i iloczynów zewnętrznych wektorów
+#   (fragmentami) i rozwiązywane wsadowo (np.linalg.solve), opcjonalnie na puli wątków
+#   (NumPy i SciPy zwalniają GIL),
+# - rekomendacja to jeden iloczyn skalarny długości factors na film - bez sąsiadów i bez
+#   przeglądania ocen innych użytkowników.
+#
+#  !--- Użycie ---!
+# from als_recommender import ALSModel, recommend
+# model = ALSModel(factors=32).fit(data.matrix)
+# top, bottom = recommend(data, model, "Paweł Czapiewski", n=5)
+# top, bottom = recommend(data, model, "Paweł Czapiewski", n=5, index=IVFIndex(model.movie_factors))
+#
+# python benchmark_als.py   # czas uczenia i RMSE na odłożonych ocenach vs cosine similarity
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from retrieval import top_n_series
+
+
+class ALSModel:
+    """
+    Faktoryzacja ocen (explicit feedback) z regularyzacją proporcjonalną do liczby ocen
+    użytkownika / filmu.
+
+    Atrybuty po fit():
+        mean: średnia ocen treningowych
+        user_factors: tablica (użytkownicy, factors)
+        movie_factors: tablica (filmy, factors)
+    """
+
+    def __init__(self, factors=32, regularization=0.1, iterations=10, threads=1, seed=0):
+        self.factors = factors
+        self.regularization = regularization
+        self.iterations = iterations
+        self.threads = threads or os.cpu_count()
+        self.seed = seed
+        self.mean = 0.0
+        self.user_factors = None
+        self.movie_factors = None
+
+    def _solve_chunk(self, pattern, rhs, outer, first, last, result):
+        """Wektory wierszy first..last-1: (F^T F + reg * n I) x = F^T (r - średnia), układy wsadowo."""
+        block = pattern[first:last]
+        counts = np.diff(block.indptr)
+        # Macierze F^T F wszystkich wierszy fragmentu jednym iloczynem: wzorzec ocen x (f_i f_i^T)
+        gram = np.zeros((last - first, self.factors ** 2))
+        for start, part in outer:
+            gram += block[:, start:start + len(part)] @ part
+        gram = gram.reshape(-1, self.factors, self.factors)
+        gram += (self.regularization * np.maximum(counts, 1))[:, None, None] * np.eye(self.factors)
+        result[first:last] = np.linalg.solve(gram, rhs[first:last, :, None])[:, :, 0]
+
+    def _solve_side(self, matrix, other):
+        """Nowe wektory wszystkich wierszy matrix przy stałych wektorach other."""
+        pattern = matrix.copy()
+        pattern.data[:] = 1
+        residuals = matrix.copy()
+        residuals.data -= self.mean
+        rhs = residuals @ other
+
+        # Iloczyny zewnętrzne f_i f_i^T wektorów other, fragmentami po ok. 2^22 liczb
+        step = max(1, 2 ** 22 // self.factors ** 2)
+        outer = [(start, np.einsum('ij,ik->ijk', part, part).reshape(len(part), -1))
+                 for start, part in ((start, other[start:start + step]) for start in range(0, len(other), step))]
+
+        result = np.zeros((matrix.shape[0], self.factors))
+        chunks = [(first, min(first + step, matrix.shape[0])) for first in range(0, matrix.shape[0], step)]
+        if self.threads == 1:
+            for first, last in chunks:
+                self._solve_chunk(pattern, rhs, outer, first, last, result)
+        else:
+            with ThreadPoolExecutor(self.threads) as pool:
+                list(pool.map(lambda chunk: self._solve_chunk(pattern, rhs, outer, *chunk, result), chunks))
+        return result
+
+    def fit(self, matrix):
+        """Uczy model na macierzy CSR ocen (użytkownicy x filmy); zwraca self."""
+        matrix = matrix.tocsr().astype(np.float64)
+        transposed = matrix.T.tocsr()
+        rng = np.random.default_rng(self.seed)
+        self.mean = float(matrix.data.mean()) if matrix.nnz else 0.0
+        self.movie_factors = rng.normal(0, 0.1, (matrix.shape[1], self.factors))
+        for _ in range(self.iterations):
+            self.user_factors = self._solve_side(matrix, self.movie_factors)
+            self.movie_factors = self._solve_side(transposed, self.user_factors)
+        return self
+
+    def predict(self, rows, columns):
+        """Oceny szacowane par (rows[i], columns[i]), obcięte do skali 1-10."""
+        values = self.mean + np.einsum('ij,ij->i', self.user_factors[rows], self.movie_factors[columns])
+        return np.clip(values, 1, 10)
+
+    def scores(self, rows):
+        """Oceny szacowane wszystkich filmów dla wierszy rows - tablica (len(rows), filmy)."""
+        return np.clip(self.mean + self.user_factors[rows] @ self.movie_factors.T, 1, 10)
+
+    def save(self, path):
+        np.savez(path, mean=self.mean, user_factors=self.user_factors, movie_factors=self.movie_factors,
+                 regularization=self.regularization)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            model = cls(data['user_factors'].shape[1], float(data['regularization']))
+            model.mean = float(data['mean'])
+            model.user_factors, model.movie_factors = data['user_factors'], data['movie_factors']
+        return model
+
+
+def recommend(data, model, user, n=5, n_bottom=None, index=None, probes=8):
+    """
+    Zwraca (najlepsze, najgorsze) jak sparse_recommender.recommend - filmy nieocenione
+    przez użytkownika o największej i najmniejszej ocenie szacowanej przez model.
+    index - IVFIndex(model.movie_factors): przybliżone wyszukiwanie w probes grupach zamiast
+    liczenia ocen całego katalogu.
+    """
+    row = data.user_row(user)
+    n_bottom = n if n_bottom is None else n_bottom
+    if index is not None:
+        query, rated = model.user_factors[row], data.matrix[row].indices
+        selected = [index.search(query, n, probes, rated), index.search(-query, n_bottom, probes, rated)]
+        return tuple(pd.Series(model.predict(np.full(len(ids), row), ids),
+                               index=pd.Index(data.movies[ids], name='movie')) for ids in selected)
+    scores = model.scores([row])[0]
+    candidates = np.setdiff1d(np.arange(len(scores)), data.matrix[row].indices)
+    recommendations = pd.Series(scores[candidates], index=pd.Index(data.movies[candidates], name='movie'))
+    return top_n_series(recommendations, n, n_bottom)
@@ -0,0 +1,80 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Porównanie modelu ALS (als_recommender.py) z podobieństwem cosinusowym użytkowników
+# (sparse_recommender.py) na danych syntetycznych z grupami gustów (evaluation.clustered_ratings):
+# - czas uczenia ALS (1 wątek i --threads wątków) oraz budowy indeksu k sąsiadów,
+# - RMSE ocen odłożonych (po --held-out losowe oceny każdego użytkownika): średnia ocen,
+#   średnia ważona ocen k sąsiadów, ALS,
+# - opóźnienie zapytania o top-N (p50 / p99).
+#
+#  !--- Użycie ---!
+# python benchmark_als.py
+# python benchmark_als.py --users 50000 --factors 16 --iterations 15 --threads 4
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from als_recommender import ALSModel
+from evaluation import clustered_ratings, holdout_split, percentiles, rmse, top_n_columns
+from sparse_recommender import batch_scores, predict_ratings, top_k_neighbours
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ALS vs cosine similarity: czas uczenia, RMSE, opóźnienie.")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--movies", type=int, default=2000)
+    parser.add_argument("--groups", type=int, default=10, help="Liczba grup gustów w danych syntetycznych")
+    parser.add_argument("--per-user", type=int, default=50, help="Średnia liczba ocen na użytkownika")
+    parser.add_argument("--held-out", type=int, default=2, help="Odłożone oceny na użytkownika")
+    parser.add_argument("--factors", type=int, default=10)
+    parser.add_argument("--regularization", type=float, default=0.1)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="Wątki do drugiego pomiaru uczenia")
+    parser.add_argument("--k", type=int, default=50, help="Liczba sąsiadów (cosine)")
+    parser.add_argument("--n", type=int, default=10, help="Długość listy rekomendacji")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    matrix = clustered_ratings(args.users, args.movies, args.groups, args.per_user)
+    train, test_rows, test_columns, test_ratings = holdout_split(matrix, per_user=args.held_out)
+    print(f"Dane: {args.users} x {args.movies}, {train.nnz} ocen treningowych, {len(test_rows)} odłożonych")
+
+    thread_counts = [1] if args.threads <= 1 else [1, args.threads]
+    for threads in thread_counts:
+        start = time.perf_counter()
+        model = ALSModel(args.factors, args.regularization, args.iterations, threads).fit(train)
+        print(f"ALS ({args.factors} czynników, {args.iterations} iteracji, {threads} wątków): "
+              f"{time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    neighbours = top_k_neighbours(train, k=args.k)
+    print(f"Indeks {args.k} sąsiadów (cosine): {time.perf_counter() - start:.2f} s")
+
+    print(f"RMSE średnia ocen: {rmse(np.full(len(test_ratings), train.data.mean()), test_ratings):.3f}")
+    print(f"RMSE cosine:       {rmse(predict_ratings(train, neighbours, test_rows, test_columns), test_ratings):.3f}")
+    print(f"RMSE ALS:          {rmse(model.predict(test_rows, test_columns), test_ratings):.3f}")
+
+    def cosine_top(row, rated):
+        return top_n_columns(batch_scores(train, neighbours, [row]), rated, args.n)
+
+    def als_top(row, rated):
+        scores = model.scores([row])[0]
+        scores[rated] = 0 # ocenione pomijane, pozostałe mają ocenę >= 1
+        return np.argpartition(-scores, args.n)[:args.n]
+
+    rows = np.random.default_rng(1).integers(0, args.users, args.queries).tolist()
+    for name, top in (('cosine', cosine_top), ('ALS', als_top)):
+        latencies = []
+        for row in rows:
+            start = time.perf_counter()
+            top(row, train.indices[train.indptr[row]:train.indptr[row + 1]])
+            latencies.append(time.perf_counter() - start)
+        p50, p99 = percentiles(latencies)
+        print(f"Zapytanie top-{args.n} {name}: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+if __name__ == "__main__":
+    main()
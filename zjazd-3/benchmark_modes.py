@@ -0,0 +1,68 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Porównanie trybów rekomendacji z sparse_recommender.py:
+# - 'user' - k najbardziej podobnych użytkowników (top_k_neighbours),
+# - 'item' - k najbardziej podobnych filmów liczonych offline (top_k_item_neighbours).
+# Na danych syntetycznych z grupami gustów (evaluation.clustered_ratings) odkładana jest
+# jedna wysoka ocena każdego użytkownika; mierzone są: czas budowy indeksu, opóźnienie
+# pojedynczego zapytania (p50 / p99) i hit-rate (odłożony film w top-N).
+#
+#  !--- Użycie ---!
+# python benchmark_modes.py
+# python benchmark_modes.py --users 50000 --movies 20000 --k 50 --n 10
+
+import argparse
+import time
+
+import numpy as np
+
+from evaluation import clustered_ratings, hit_rate, holdout_split, percentiles, top_n_columns
+from sparse_recommender import batch_scores, top_k_item_neighbours, top_k_neighbours
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tryb user-based vs item-based: opóźnienie i hit-rate.")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--movies", type=int, default=5000)
+    parser.add_argument("--per-user", type=int, default=30, help="Średnia liczba ocen na użytkownika")
+    parser.add_argument("--k", type=int, default=50, help="Liczba sąsiadów")
+    parser.add_argument("--n", type=int, default=10, help="Długość listy rekomendacji")
+    parser.add_argument("--queries", type=int, default=1000, help="Użytkownicy do oceny i pomiaru opóźnienia")
+    args = parser.parse_args()
+
+    matrix = clustered_ratings(args.users, args.movies, per_user=args.per_user)
+    train, test_rows, test_columns, _ = holdout_split(matrix, min_rating=7)
+    rng = np.random.default_rng(1)
+    selected = rng.choice(len(test_rows), min(args.queries, len(test_rows)), replace=False)
+    test_rows, test_columns = test_rows[selected], test_columns[selected]
+    print(f"Dane: {args.users} x {args.movies}, {train.nnz} ocen treningowych, {len(test_rows)} odłożonych")
+
+    builders = {'user': top_k_neighbours, 'item': top_k_item_neighbours}
+    for mode, build in builders.items():
+        start = time.perf_counter()
+        neighbours = build(train, k=args.k)
+        build_time = time.perf_counter() - start
+
+        recommended, latencies = {}, []
+        for row in test_rows.tolist():
+            start = time.perf_counter()
+            scores = batch_scores(train, neighbours, [row], mode)
+            rated = train.indices[train.indptr[row]:train.indptr[row + 1]]
+            recommended[row] = set(top_n_columns(scores, rated, args.n).tolist())
+            latencies.append(time.perf_counter() - start)
+        p50, p99 = percentiles(latencies)
+        print(f"{mode:>4}: indeks {build_time:6.2f} s, zapytanie p50 {p50:.2f} ms, p99 {p99:.2f} ms, "
+              f"hit-rate@{args.n} {hit_rate(recommended, test_rows, test_columns):.3f}")
+
+    # Odniesienie: n najpopularniejszych filmów, których użytkownik nie ocenił
+    popular = np.argsort(-train.getnnz(axis=0), kind='stable').tolist()
+    baseline = {}
+    for row in test_rows.tolist():
+        rated = set(train.indices[train.indptr[row]:train.indptr[row + 1]].tolist())
+        baseline[row] = set([column for column in popular[:args.n + len(rated)] if column not in rated][:args.n])
+    print(f"najpopularniejsze: hit-rate@{args.n} {hit_rate(baseline, test_rows, test_columns):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Benchmark wyboru top-k / bottom-k filmów (retrieval.py) dla dużego katalogu:
+# - wektory filmów i użytkowników jak czynniki modelu ALS (als_recommender.py), syntetyczne:
+#   --movies wektorów wokół --topics losowych kierunków,
+# - pełne sortowanie (np.argsort) vs dokładny wybór np.argpartition (top_k i bottom_k),
+# - przybliżony indeks IVFIndex dla różnych liczb przeglądanych grup (--probes):
+#   opóźnienie (p50 / p99) oraz recall@k względem wyszukiwania dokładnego.
+#
+#  !--- Użycie ---!
+# python benchmark_retrieval.py
+# python benchmark_retrieval.py --movies 1000000 --dim 64 --k 10 --probes 4 16 64
+
+import argparse
+import time
+
+import numpy as np
+
+from evaluation import percentiles
+from retrieval import IVFIndex, bottom_k, top_k
+
+
+def synthetic_vectors(count, dim, topics, rng):
+    """Wektory skupione wokół topics losowych kierunków (jak czynniki filmów z grup gustów)."""
+    centres = rng.normal(0, 1, (topics, dim))
+    return (centres[rng.integers(0, topics, count)] + rng.normal(0, 0.5, (count, dim))).astype(np.float32)
+
+
+def measure(queries, select):
+    """Opóźnienia (s) i wyniki select(query) dla każdego zapytania."""
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(select(query))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+
+def recall(results, exact):
+    return float(np.mean([len(np.intersect1d(found, expected)) / len(expected)
+                          for found, expected in zip(results, exact)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top-k / bottom-k: sortowanie, argpartition i indeks IVF.")
+    parser.add_argument("--movies", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=32)
+    parser.add_argument("--topics", type=int, default=100, help="Liczba skupisk wektorów filmów")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=None, help="Grupy indeksu IVF (domyślnie sqrt(filmy))")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    movies = synthetic_vectors(args.movies, args.dim, args.topics, rng)
+    queries = synthetic_vectors(args.queries, args.dim, args.topics, rng)
+    k = args.k
+
+    rows = []
+    latencies, exact_top = measure(queries, lambda query: np.argsort(-(movies @ query))[:k])
+    rows.append(("pełne sortowanie (top-k)", latencies, 1.0))
+    latencies, results = measure(queries, lambda query: top_k(movies @ query, k))
+    rows.append(("argpartition top-k", latencies, recall(results, exact_top)))
+
+    def both(query):
+        scores = movies @ query
+        return top_k(scores, k), bottom_k(scores, k)
+    latencies, results = measure(queries, both)
+    exact_bottom = [bottom for _, bottom in results]
+    rows.append(("argpartition top-k + bottom-k", latencies, 1.0))
+
+    start = time.perf_counter()
+    index = IVFIndex(movies, args.clusters)
+    print(f"{args.movies} filmów x {args.dim}, indeks IVF ({len(index.centroids)} grup): "
+          f"{time.perf_counter() - start:.2f} s")
+    for probes in args.probes:
+        latencies, results = measure(queries, lambda query: index.search(query, k, probes))
+        rows.append((f"IVF probes={probes} top-k", latencies, recall(results, exact_top)))
+        latencies, results = measure(queries, lambda query: index.search(-query, k, probes))
+        rows.append((f"IVF probes={probes} bottom-k", latencies, recall(results, exact_bottom)))
+
+    print(f"{'metoda':<34}{'p50 ms':>9}{'p99 ms':>9}{'recall@' + str(k):>12}")
+    for name, latencies, value in rows:
+        p50, p99 = percentiles(latencies)
+        print(f"{name:<34}{p50:>9.2f}{p99:>9.2f}{value:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
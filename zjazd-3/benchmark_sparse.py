@@ -0,0 +1,81 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Benchmark rzadkiego rekomendera (sparse_recommender.py) na danych syntetycznych:
+# - domyślnie 100 000 użytkowników x 50 000 filmów, średnio 30 ocen na użytkownika,
+#   popularność filmów o rozkładzie potęgowym (--skew; im większy, tym więcej wspólnie ocenianych hitów
+#   i tym więcej par użytkowników do porównania),
+# - mierzy czas budowy indeksu k sąsiadów, szczytowe zużycie pamięci procesu (RSS)
+#   oraz opóźnienie pojedynczej rekomendacji (p50 / p99).
+#
+#  !--- Użycie ---!
+# python benchmark_sparse.py
+# python benchmark_sparse.py --users 20000 --movies 10000 --k 30 --chunk-size 512
+
+import argparse
+import resource
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from sparse_recommender import RatingsData, recommend, top_k_neighbours
+
+
+def peak_rss_mib():
+    # Linux: ru_maxrss w kilobajtach
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def synthetic_ratings(users, movies, per_user=30, skew=0.5, seed=0):
+    """Losowa macierz ocen 1-10 (CSR float32) z potęgowym rozkładem popularności filmów (wykładnik skew)."""
+    rng = np.random.default_rng(seed)
+    counts = np.maximum(rng.poisson(per_user, users), 1)
+    popularity = 1 / np.arange(1, movies + 1) ** skew
+    popularity /= popularity.sum()
+    rows = np.repeat(np.arange(users, dtype=np.int32), counts)
+    columns = rng.choice(movies, size=len(rows), p=popularity).astype(np.int32)
+    matrix = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=(users, movies))
+    matrix.sum_duplicates()
+    matrix.data = rng.integers(1, 11, len(matrix.data)).astype(np.float32)
+    return matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rzadkiego rekomendera na danych syntetycznych.")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--movies", type=int, default=50000)
+    parser.add_argument("--per-user", type=int, default=30, help="Średnia liczba ocen na użytkownika")
+    parser.add_argument("--skew", type=float, default=0.5,
+                        help="Wykładnik popularności filmów (0 - równomiernie, większy - więcej hitów)")
+    parser.add_argument("--k", type=int, default=50, help="Liczba sąsiadów")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Wiersze liczone naraz")
+    parser.add_argument("--queries", type=int, default=1000, help="Liczba zapytań do pomiaru opóźnienia")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    matrix = synthetic_ratings(args.users, args.movies, args.per_user, args.skew)
+    data = RatingsData(matrix, np.arange(args.users), np.arange(args.movies))
+    print(f"Dane: {args.users} x {args.movies}, {matrix.nnz} ocen, "
+          f"{time.perf_counter() - start:.1f} s, RSS szczyt {peak_rss_mib():.0f} MiB")
+    print(f"Gęsta macierz ocen zajęłaby {args.users * args.movies * 8 / 2 ** 30:.1f} GiB, "
+          f"gęsta macierz podobieństwa {args.users ** 2 * 8 / 2 ** 30:.1f} GiB")
+
+    start = time.perf_counter()
+    neighbours = top_k_neighbours(matrix, k=args.k, chunk_size=args.chunk_size)
+    print(f"Indeks {args.k} sąsiadów: {time.perf_counter() - start:.1f} s, {neighbours.nnz} par, "
+          f"RSS szczyt {peak_rss_mib():.0f} MiB")
+
+    rng = np.random.default_rng(1)
+    latencies = []
+    for user in rng.integers(0, args.users, args.queries):
+        start = time.perf_counter()
+        recommend(data, neighbours, user, 5)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1e3
+    print(f"Rekomendacja: p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms "
+          f"({args.queries} zapytań)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Wspólne narzędzia do porównywania metod rekomendacji:
+# - syntetyczne oceny z ukrytymi grupami gustów (filmy z grupy użytkownika oceniane wyżej),
+#   żeby trafność rekomendacji była mierzalna,
+# - podział na oceny treningowe i odłożone (po kilka ocen każdego użytkownika),
+# - hit-rate (odłożony film w top-N) i RMSE (błąd przewidywanej oceny),
+# - percentyle opóźnień.
+#
+#  !--- Użycie ---!
+# from evaluation import clustered_ratings, holdout_split, hit_rate
+# train, test_rows, test_columns, test_ratings = holdout_split(clustered_ratings(20000, 5000))
+
+import numpy as np
+import scipy.sparse as sp
+
+from retrieval import top_k
+
+
+def clustered_ratings(users, movies, groups=20, per_user=30, affinity=0.8, skew=0.5, seed=0):
+    """
+    Losowa macierz ocen 1-10 (CSR float32): każdy użytkownik i film należą do jednej z groups grup;
+    z prawdopodobieństwem affinity użytkownik wybiera film ze swojej grupy i ocenia go wyżej.
+    Popularność filmów w grupie ma rozkład potęgowy (wykładnik skew).
+    """
+    rng = np.random.default_rng(seed)
+    user_groups = rng.integers(0, groups, users)
+    movie_groups = rng.integers(0, groups, movies)
+    members = [np.flatnonzero(movie_groups == group) for group in range(groups)]
+
+    counts = np.maximum(rng.poisson(per_user, users), 1)
+    rows = np.repeat(np.arange(users, dtype=np.int32), counts)
+    own = rng.random(len(rows)) < affinity
+    columns = rng.integers(0, movies, len(rows))
+    for group in range(groups):
+        if not len(members[group]):
+            continue
+        selected = own & (user_groups[rows] == group)
+        popularity = 1 / np.arange(1, len(members[group]) + 1) ** skew
+        columns[selected] = rng.choice(members[group], selected.sum(), p=popularity / popularity.sum())
+
+    liked = movie_groups[columns] == user_groups[rows]
+    ratings = np.clip(np.round(np.where(liked, 8.0, 4.0) + rng.normal(0, 1.5, len(rows))), 1, 10)
+    # Powtórnie wylosowany film tego samego użytkownika - zostaje pierwsza ocena
+    _, first = np.unique(rows.astype(np.int64) * movies + columns, return_index=True)
+    return sp.csr_matrix((ratings[first].astype(np.float32), (rows[first], columns[first].astype(np.int32))),
+                         shape=(users, movies))
+
+
+def holdout_split(matrix, per_user=1, min_rating=None, seed=0):
+    """
+    Odkłada per_user losowych ocen każdego użytkownika (z co najmniej per_user + 1 ocenami;
+    tylko oceny >= min_rating, jeśli podano). Zwraca (treningowa CSR, wiersze, kolumny, oceny odłożone).
+    """
+    rng = np.random.default_rng(seed)
+    matrix = matrix.tocsr()
+    held = []
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        positions = np.arange(start, end)
+        if min_rating is not None:
+            positions = positions[matrix.data[start:end] >= min_rating]
+        if end - start > per_user and len(positions) >= per_user:
+            held.append(rng.choice(positions, per_user, replace=False))
+    held = np.concatenate(held) if held else np.zeros(0, dtype=np.int64)
+
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    keep = np.ones(matrix.nnz, dtype=bool)
+    keep[held] = False
+    train = sp.csr_matrix((matrix.data[keep], (rows[keep], matrix.indices[keep])), shape=matrix.shape)
+    return train, rows[held], matrix.indices[held], matrix.data[held]
+
+
+def top_n_columns(scores, rated, n):
+    """n kolumn o największej dodatniej ocenie z wiersza CSR scores, z pominięciem ocenionych (rated)."""
+    columns, values = scores.indices, scores.data
+    keep = ~np.isin(columns, rated) & (values > 0)
+    return columns[keep][top_k(values[keep], n)]
+
+
+def hit_rate(recommended, test_rows, test_columns):
+    """Udział odłożonych ocen, których film jest w rekomendacjach (recommended[wiersz] - kolumny)."""
+    hits = [column in recommended[row] for row, column in zip(test_rows.tolist(), test_columns.tolist())]
+    return float(np.mean(hits)) if hits else 0.0
+
+
+def rmse(predicted, actual):
+    return float(np.sqrt(np.mean((np.asarray(predicted, dtype=np.float64) - actual) ** 2)))
+
+
+def percentiles(seconds):
+    """(p50, p99) w milisekundach."""
+    milliseconds = np.asarray(seconds) * 1e3
+    return float(np.percentile(milliseconds, 50)), float(np.percentile(milliseconds, 99))
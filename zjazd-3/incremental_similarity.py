@@ -0,0 +1,436 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Przyrostowy model podobieństwa użytkowników (cosine similarity).
+# Zamiast liczyć podobieństwo od nowa po każdej zmianie ocen, model przechowuje:
+# - sumę kwadratów ocen każdego użytkownika (kwadrat normy),
+# - iloczyny skalarne ocen dla każdej pary użytkowników, którzy ocenili wspólny film.
+# Dodanie, zmiana lub usunięcie oceny filmu aktualizuje tylko iloczyny pary
+# (użytkownik, inny oceniający ten film), więc koszt zależy od liczby oceniających
+# zmieniony film, a nie od liczby wszystkich użytkowników i filmów.
+# Stan modelu zapisywany jest do pliku .npz razem ze skrótem źródła ocen (source). Przy kolejnym
+# uruchomieniu, gdy skrót się nie zmienił, sync jest pomijany; w przeciwnym razie różnica liczona
+# jest na tablicach NumPy, a w Pythonie przetwarzane są tylko zmienione oceny.
+# Wczytany stan to macierze CSR - słownik ocen lub iloczynów danego użytkownika (filmu) tworzony
+# jest dopiero przy pierwszym dostępie, więc start nie przechodzi w Pythonie po wszystkich ocenach.
+#
+#  !--- Użycie ---!
+# from incremental_similarity import IncrementalSimilarity
+# model = IncrementalSimilarity.open("similarity_state.npz", open_ratings("recommendations.csv"))  # albo ramka danych
+# model.set_rating("Paweł Czapiewski", "Incepcja", 9.0)
+# top, bottom = model.recommend("Paweł Czapiewski", n=5)
+# model.save("similarity_state.npz")
+#
+# python incremental_similarity.py   # czas aktualizacji vs przeliczenie od nowa + sprawdzenie zgodności
+
+import argparse
+import hashlib
+import heapq
+import math
+import os
+import tempfile
+import time
+from collections.abc import MutableMapping
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from retrieval import top_n_series
+from sparse_recommender import RatingsData, UserNotFound, normalize_rows
+
+
+class _StoredRows(MutableMapping):
+    """
+    Słownik nazwa -> wiersz zapisanej macierzy CSR ({kolumna: wartość}) albo wartość z tablicy values.
+    Wiersz zamieniany jest na słownik przy pierwszym dostępie i od tej chwili żyje w rows (tam trafiają
+    też nowe klucze); usunięte klucze zapisanej części trzyma removed.
+    """
+
+    def __init__(self, names, matrix=None, columns=None, values=None):
+        self.names = names # posortowana tablica napisów, wiersz = pozycja
+        self.matrix = matrix
+        self.columns = columns
+        self.values = values
+        self.rows = {}
+        self.removed = set()
+
+    def _row(self, name):
+        row = int(np.searchsorted(self.names, name))
+        return row if row < len(self.names) and self.names[row] == name else None
+
+    def __getitem__(self, name):
+        if name in self.rows:
+            return self.rows[name]
+        row = None if name in self.removed else self._row(name)
+        if row is None:
+            raise KeyError(name)
+        if self.matrix is None:
+            value = float(self.values[row])
+        else:
+            start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+            value = dict(zip(self.columns[self.matrix.indices[start:end]].tolist(),
+                             np.asarray(self.matrix.data[start:end], dtype=np.float64).tolist()))
+        self.rows[name] = value
+        return value
+
+    def __setitem__(self, name, value):
+        self.rows[name] = value
+        self.removed.discard(name)
+
+    def __delitem__(self, name):
+        self[name]
+        del self.rows[name]
+        if self._row(name) is not None:
+            self.removed.add(name)
+
+    def __contains__(self, name):
+        return name in self.rows or (name not in self.removed and self._row(name) is not None)
+
+    def __iter__(self):
+        for name in self.names.tolist():
+            if name not in self.removed:
+                yield name
+        for name in list(self.rows):
+            if self._row(name) is None:
+                yield name
+
+    def __len__(self):
+        return len(self.names) - len(self.removed) + sum(self._row(name) is None for name in self.rows)
+
+    def entries(self, row_names=None, column_names=None):
+        """
+        (wiersze, kolumny, wartości) wszystkich elementów - jako nazwy albo pozycje w posortowanych tablicach
+        row_names / column_names. Nietknięte wiersze wycinane są z macierzy bez pętli w Pythonie.
+        """
+        keep = np.ones(len(self.names), dtype=bool)
+        touched = [self._row(name) for name in [*self.rows, *self.removed]]
+        keep[[row for row in touched if row is not None]] = False
+        rows = np.repeat(np.arange(len(self.names)), np.diff(self.matrix.indptr))
+        mask = keep[rows]
+        counts = [len(row) for row in self.rows.values()]
+        extra_rows = np.repeat(np.array(list(self.rows), dtype=str), counts)
+        extra_columns = np.array(list(chain.from_iterable(self.rows.values())), dtype=str)
+        extra_values = np.fromiter(chain.from_iterable(row.values() for row in self.rows.values()),
+                                   dtype=np.float64, count=sum(counts))
+
+        def encode(names, stored, codes, extra):
+            if names is None:
+                return np.concatenate([stored[codes], extra])
+            # Zapisane nazwy odwzorowywane raz na słownik, elementy przez indeksowanie pozycji
+            return np.concatenate([np.searchsorted(names, stored)[codes], np.searchsorted(names, extra)])
+
+        return (encode(row_names, self.names, rows[mask], extra_rows),
+                encode(column_names, self.columns, self.matrix.indices[mask], extra_columns),
+                np.concatenate([np.asarray(self.matrix.data[mask], dtype=np.float64), extra_values]))
+
+
+def frame_fingerprint(df):
+    """Skrót SHA-256 zawartości ramki danych (wartość source dla open())."""
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def data_fingerprint(data):
+    """Skrót SHA-256 tablic RatingsData (wartość source dla open())."""
+    digest = hashlib.sha256()
+    matrix = data.matrix
+    for array in (matrix.indptr, matrix.indices, matrix.data,
+                  np.asarray(data.users, dtype=str), np.asarray(data.movies, dtype=str)):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class IncrementalSimilarity:
+    """Podobieństwo użytkowników aktualizowane przyrostowo przy zmianach ocen."""
+
+    def __init__(self):
+        names = np.array([], dtype=str)
+        self._attach(names, names, sp.csr_matrix((0, 0)), sp.csr_matrix((0, 0)))
+        self.source = None # skrót źródła ocen, z którym model jest zgodny (None - nieznany)
+
+    def _attach(self, users, movies, ratings, dots):
+        """Ustawia struktury modelu nad macierzami CSR ocen (użytkownicy x filmy) i iloczynów (użytkownicy x użytkownicy)."""
+        self.user_ratings = _StoredRows(users, ratings, movies) # użytkownik -> {film: ocena}
+        self.movie_ratings = _StoredRows(movies, ratings.T.tocsr(), users) # film -> {użytkownik: ocena}
+        # użytkownik -> suma kwadratów ocen
+        self.norms = _StoredRows(users, values=np.asarray(ratings.multiply(ratings).sum(axis=1)).ravel())
+        self.dots = _StoredRows(users, dots, users) # użytkownik -> {inny użytkownik: iloczyn skalarny ocen}
+
+    # ----- budowa i synchronizacja -----
+
+    @classmethod
+    def from_frame(cls, df):
+        """Buduje model od zera z ramki danych z kolumnami user_id, movie, rating."""
+        return cls.from_data(RatingsData.from_frame(df))
+
+    @classmethod
+    def from_data(cls, data):
+        """Buduje model od zera z RatingsData."""
+        return cls.from_matrix(data.matrix, data.users, data.movies)
+
+    @classmethod
+    def from_matrix(cls, matrix, users, movies, chunk_size=1024):
+        """Buduje model z macierzy CSR ocen; iloczyny skalarne liczone fragmentami (X * X^T)."""
+        matrix = sp.csr_matrix(matrix, dtype=np.float64)
+        users, movies = np.asarray(users, dtype=str), np.asarray(movies, dtype=str)
+        # Użytkownicy i filmy bez ocen pomijani, nazwy posortowane (wyszukiwanie binarne w _StoredRows)
+        rated_users = np.flatnonzero(np.diff(matrix.indptr))
+        rated_movies = np.flatnonzero(np.bincount(matrix.indices, minlength=matrix.shape[1]))
+        rated_users = rated_users[np.argsort(users[rated_users], kind='stable')]
+        rated_movies = rated_movies[np.argsort(movies[rated_movies], kind='stable')]
+        matrix = matrix[rated_users][:, rated_movies]
+
+        transposed = matrix.T.tocsr()
+        products = sp.vstack([matrix[start:start + chunk_size] @ transposed
+                              for start in range(0, matrix.shape[0], chunk_size)] or [sp.csr_matrix((0, 0))]).tocoo()
+        pairs = (products.row != products.col) & (products.data != 0)
+        dots = sp.csr_matrix((products.data[pairs], (products.row[pairs], products.col[pairs])),
+                             shape=(matrix.shape[0], matrix.shape[0]))
+
+        model = cls()
+        model._attach(users[rated_users], movies[rated_movies], matrix, dots)
+        return model
+
+    def sync_data(self, data):
+        """
+        Nanosi różnice między modelem a RatingsData (dodane, zmienione, usunięte oceny); zwraca ich liczbę.
+        Porównanie odbywa się na tablicach - pętla w Pythonie obejmuje tylko zmienione oceny.
+        """
+        current_users, current_movies, current = self.user_ratings.entries()
+        matrix = data.matrix.tocsr()
+        target_users = np.asarray(data.users, dtype=str)[np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))]
+        target_movies = np.asarray(data.movies, dtype=str)[matrix.indices]
+        target = np.asarray(matrix.data, dtype=np.float64)
+
+        # Para (użytkownik, film) jako jedna liczba - kody we wspólnych, posortowanych słownikach nazw
+        users = np.union1d(current_users, target_users)
+        movies = np.union1d(current_movies, target_movies)
+        current_keys = np.searchsorted(users, current_users) * len(movies) + np.searchsorted(movies, current_movies)
+        target_keys = np.searchsorted(users, target_users) * len(movies) + np.searchsorted(movies, target_movies)
+
+        removed = ~np.isin(current_keys, target_keys)
+        updated = ~np.isin(target_keys, current_keys)
+        _, current_at, target_at = np.intersect1d(current_keys, target_keys, assume_unique=True,
+                                                  return_indices=True)
+        updated[target_at] = current[current_at] != target[target_at]
+
+        for user, movie in zip(current_users[removed].tolist(), current_movies[removed].tolist()):
+            self.remove_rating(user, movie)
+        for user, movie, rating in zip(target_users[updated].tolist(), target_movies[updated].tolist(),
+                                       target[updated].tolist()):
+            self.set_rating(user, movie, rating)
+        return int(removed.sum() + updated.sum())
+
+    def sync(self, df):
+        """Nanosi różnice między modelem a ramką danych (jak sync_data); zwraca ich liczbę."""
+        return self.sync_data(RatingsData.from_frame(df))
+
+    @classmethod
+    def open(cls, path, data, source=None):
+        """
+        Wczytuje model z pliku i synchronizuje z ocenami (RatingsData albo ramka danych), a jeśli pliku
+        nie ma - buduje i zapisuje. source to skrót źródła ocen (domyślnie data_fingerprint /
+        frame_fingerprint); gdy zgadza się z zapisanym w pliku, sync jest pomijany.
+        """
+        if isinstance(data, pd.DataFrame):
+            source = frame_fingerprint(data) if source is None else source
+            data = RatingsData.from_frame(data)
+        source = data_fingerprint(data) if source is None else source
+        if os.path.exists(path):
+            model = cls.load(path)
+            if model.source == source:
+                return model
+            model.sync_data(data)
+        else:
+            model = cls.from_data(data)
+        model.source = source
+        model.save(path)
+        return model
+
+    # ----- aktualizacje przyrostowe -----
+
+    def _set_dot(self, user, other, value):
+        if value == 0: # brak wspólnie ocenionych filmów - para znika z modelu
+            self.dots[user].pop(other, None)
+            self.dots[other].pop(user, None)
+        else:
+            self.dots[user][other] = value
+            self.dots[other][user] = value
+
+    def set_rating(self, user, movie, rating):
+        """Dodaje lub zmienia ocenę - aktualizuje iloczyny tylko z oceniającymi ten film."""
+        ratings = self.user_ratings.setdefault(user, {})
+        self.dots.setdefault(user, {})
+        old = ratings.get(movie, 0.0)
+        delta = rating - old
+        if delta == 0:
+            return
+        self.source = None
+        raters = self.movie_ratings.setdefault(movie, {})
+        user_dots = self.dots[user]
+        for other, other_rating in raters.items():
+            if other != user:
+                self._set_dot(user, other, user_dots.get(other, 0.0) + delta * other_rating)
+        raters[user] = rating
+        ratings[movie] = rating
+        self.norms[user] = self.norms.get(user, 0.0) + rating * rating - old * old
+
+    def remove_rating(self, user, movie):
+        """Usuwa ocenę - aktualizuje iloczyny tylko z oceniającymi ten film."""
+        old = self.user_ratings.get(user, {}).pop(movie, None)
+        if old is None:
+            return
+        self.source = None
+        raters = self.movie_ratings[movie]
+        del raters[user]
+        user_dots = self.dots[user]
+        for other, other_rating in raters.items():
+            self._set_dot(user, other, user_dots.get(other, 0.0) - old * other_rating)
+        self.norms[user] -= old * old
+        if not raters:
+            del self.movie_ratings[movie]
+        if not self.user_ratings[user]: # użytkownik bez ocen znika z modelu
+            del self.user_ratings[user], self.norms[user], self.dots[user]
+
+    # ----- zapytania -----
+
+    def similarity(self, user, other):
+        """Cosine similarity dwóch użytkowników."""
+        dot = self.dots.get(user, {}).get(other, 0.0)
+        return dot / math.sqrt(self.norms[user] * self.norms[other]) if dot else 0.0
+
+    def neighbours(self, user, k=50):
+        """Zwraca k par (użytkownik, podobieństwo) o największym podobieństwie - tylko spośród współoceniających."""
+        norm = self.norms[user]
+        similarities = ((other, dot / math.sqrt(norm * self.norms[other]))
+                        for other, dot in self.dots[user].items() if dot > 0)
+        return heapq.nlargest(k, similarities, key=lambda pair: pair[1])
+
+    def recommend(self, user, n=5, n_bottom=None, k=50):
+        """
+        Zwraca (najlepsze, najgorsze) jak sparse_recommender.recommend: ważona suma ocen
+        k najbardziej podobnych użytkowników dla filmów nieocenionych przez użytkownika.
+        """
+        if user not in self.user_ratings:
+            raise UserNotFound(f"User {user} not found in dataset.")
+        rated = self.user_ratings[user]
+        scores = {}
+        for other, similarity in self.neighbours(user, k):
+            for movie, rating in self.user_ratings[other].items():
+                if movie not in rated:
+                    scores[movie] = scores.get(movie, 0.0) + similarity * rating
+        recommendations = pd.Series(scores, dtype=np.float64)
+        recommendations.index.name = 'movie'
+        recommendations = recommendations[recommendations != 0]
+        return top_n_series(recommendations, n, n if n_bottom is None else n_bottom)
+
+    # ----- zapis stanu -----
+
+    def save(self, path):
+        """Zapisuje oceny, iloczyny skalarne (każda para raz) i skrót źródła do pliku .npz."""
+        rating_users, rating_movies, ratings = self.user_ratings.entries()
+        users, rating_users = np.unique(rating_users, return_inverse=True)
+        movies, rating_movies = np.unique(rating_movies, return_inverse=True)
+        dot_users, dot_others, dots = self.dots.entries(users, users)
+        once = dot_users < dot_others
+        np.savez(path, users=users, movies=movies,
+                 rating_users=rating_users.astype(np.int32), rating_movies=rating_movies.astype(np.int32),
+                 ratings=ratings, dot_users=dot_users[once].astype(np.int32),
+                 dot_others=dot_others[once].astype(np.int32), dots=dots[once],
+                 source=np.array(self.source or ''))
+
+    @classmethod
+    def load(cls, path):
+        """Wczytuje model zapisany przez save() - bez przeliczania iloczynów i bez budowy słowników."""
+        model = cls()
+        with np.load(path) as data:
+            users, movies = data['users'], data['movies']
+            ratings = sp.csr_matrix((data['ratings'], (data['rating_users'], data['rating_movies'])),
+                                    shape=(len(users), len(movies)))
+            dot_users, dot_others, dots = data['dot_users'], data['dot_others'], data['dots']
+            dots = sp.csr_matrix((np.concatenate([dots, dots]), (np.concatenate([dot_users, dot_others]),
+                                                                 np.concatenate([dot_others, dot_users]))),
+                                 shape=(len(users), len(users)))
+            model._attach(users, movies, ratings, dots)
+            model.source = str(data['source']) or None if 'source' in data.files else None
+        return model
+
+
+def main():
+    from benchmark_sparse import synthetic_ratings
+
+    parser = argparse.ArgumentParser(description="Aktualizacje przyrostowe vs przeliczenie podobieństwa od nowa.")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--movies", type=int, default=20000)
+    parser.add_argument("--per-user", type=int, default=20)
+    parser.add_argument("--updates", type=int, default=2000, help="Liczba losowych zmian ocen")
+    args = parser.parse_args()
+
+    matrix = synthetic_ratings(args.users, args.movies, args.per_user, skew=0.3)
+    users = np.array([f"u{index}" for index in range(args.users)], dtype=object)
+    movies = np.array([f"m{index}" for index in range(args.movies)], dtype=object)
+
+    start = time.perf_counter()
+    model = IncrementalSimilarity.from_matrix(matrix, users, movies)
+    full_time = time.perf_counter() - start
+    pairs = len(model.dots.entries()[2]) // 2
+    print(f"Budowa od zera: {full_time:.2f} s ({matrix.nnz} ocen, {pairs} par współoceniających)")
+
+    # Losowe zmiany: nowe oceny, zmiany istniejących i usunięcia
+    rng = np.random.default_rng(1)
+    co_raters = 0
+    start = time.perf_counter()
+    for _ in range(args.updates):
+        user = users[rng.integers(args.users)]
+        action = rng.random()
+        rated = list(model.user_ratings.get(user, {}))
+        if action < 0.2 and len(rated) > 1:
+            movie = rated[rng.integers(len(rated))]
+            co_raters += len(model.movie_ratings[movie]) - 1
+            model.remove_rating(user, movie)
+        else:
+            movie = rated[rng.integers(len(rated))] if action < 0.5 and rated else movies[rng.integers(args.movies)]
+            co_raters += len(model.movie_ratings.get(movie, ()))
+            model.set_rating(user, movie, float(rng.integers(1, 11)))
+    update_time = (time.perf_counter() - start) / args.updates
+    print(f"Aktualizacja przyrostowa: {update_time * 1e6:.0f} us na zmianę "
+          f"(średnio {co_raters / args.updates:.1f} współoceniających), "
+          f"{full_time / update_time:.0f}x szybciej niż budowa od zera")
+
+    # Zgodność z podobieństwem policzonym od nowa dla próbki użytkowników
+    frame = pd.DataFrame(dict(zip(['user_id', 'movie', 'rating'], model.user_ratings.entries())))
+    data = RatingsData.from_frame(frame)
+    normalized = normalize_rows(data.matrix.astype(np.float64))
+    error = 0.0
+    for row in rng.choice(len(data.users), size=min(50, len(data.users)), replace=False):
+        exact = (normalized[row] @ normalized.T).toarray().ravel()
+        exact[row] = 0
+        incremental = np.array([model.similarity(data.users[row], other) if other != data.users[row] else 0.0
+                                for other in data.users])
+        error = max(error, float(np.abs(exact - incremental).max()))
+    print(f"Maks. różnica podobieństwa względem przeliczenia od nowa: {error:.2e}")
+
+    # Start z zapisanego stanu: bez zmian źródła (sync pominięty) i po kilku zmianach w ocenach
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "similarity_state.npz")
+        model.source = "v1"
+        model.save(path)
+        start = time.perf_counter()
+        IncrementalSimilarity.open(path, frame, source="v1").recommend(frame['user_id'][0])
+        unchanged_time = time.perf_counter() - start
+
+        frame.loc[rng.choice(len(frame), size=10, replace=False), 'rating'] += 1
+        start = time.perf_counter()
+        changed = IncrementalSimilarity.load(path)
+        changes = changed.sync(frame)
+        sync_time = time.perf_counter() - start
+        exact = IncrementalSimilarity.from_frame(frame)
+        error = max(abs(changed.similarity(user, other) - exact.similarity(user, other))
+                    for user in frame['user_id'][:50] for other, _ in exact.neighbours(user))
+    print(f"Start bez zmian źródła: {unchanged_time * 1e3:.0f} ms; sync {changes} zmian: {sync_time * 1e3:.0f} ms "
+          f"(maks. różnica podobieństwa {error:.2e})")
+
+
+if __name__ == "__main__":
+    main()
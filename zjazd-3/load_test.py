@@ -0,0 +1,87 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Test obciążenia serwisu rekomendacji (recommendation_service.py).
+# Wysyła zapytania z wielu wątków do działającego serwisu (--url) albo do serwisu
+# uruchomionego w tym samym procesie na wolnym porcie (bez --url) i wypisuje:
+# - przepustowość i opóźnienia po stronie klienta (p50 / p99),
+# - metryki zebrane przez serwis (/metrics).
+#
+#  !--- Użycie ---!
+# python load_test.py                                       # serwis lokalny w tym procesie
+# python load_test.py --url http://127.0.0.1:8000 --requests 2000 --concurrency 8
+# python load_test.py --batch 32                            # zapytania POST /recommend_many
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import numpy as np
+
+from ratings_store import CSV_PATH
+from recommendation_service import RecommendationService, serve
+
+
+def fetch(url, payload=None):
+    """GET (lub POST z JSON, gdy podano payload) i zwraca zdekodowaną odpowiedź."""
+    data = None if payload is None else json.dumps(payload).encode('utf-8')
+    request = Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test obciążenia serwisu rekomendacji.")
+    parser.add_argument("--url", help="Adres działającego serwisu (domyślnie serwis lokalny w tym procesie)")
+    parser.add_argument("--csv", default=CSV_PATH, help="Plik z ocenami dla serwisu lokalnego")
+    parser.add_argument("--requests", type=int, default=1000, help="Liczba zapytań")
+    parser.add_argument("--concurrency", type=int, default=4, help="Liczba wątków klienta")
+    parser.add_argument("--batch", type=int, default=1, help="Użytkownicy na zapytanie (>1 - /recommend_many)")
+    parser.add_argument("--n", type=int, default=5, help="Liczba rekomendacji")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        start = time.perf_counter()
+        server = serve(RecommendationService.from_csv(args.csv), port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+        print(f"Serwis lokalny {url} gotowy w {time.perf_counter() - start:.2f} s")
+
+    users = fetch(f"{url}/users")
+    rng = np.random.default_rng(0)
+    batches = [list(rng.choice(users, args.batch)) for _ in range(args.requests)]
+
+    def query(batch):
+        start = time.perf_counter()
+        if args.batch == 1:
+            fetch(f"{url}/recommend?" + urlencode({'user': batch[0], 'n': args.n}))
+        else:
+            fetch(f"{url}/recommend_many", {'users': batch, 'n': args.n})
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        latencies = np.array(list(pool.map(query, batches))) * 1e3
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.requests} zapytań x {args.batch} użytkowników, {args.concurrency} wątków: "
+          f"{args.requests / elapsed:.0f} zapytań/s ({args.requests * args.batch / elapsed:.0f} użytkowników/s)")
+    print(f"Klient: p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+    for name, stats in fetch(f"{url}/metrics").items():
+        if 'p50_ms' in stats:
+            print(f"Serwis {name}: {stats['count']} wywołań, p50 {stats['p50_ms']:.2f} ms, "
+                  f"p99 {stats['p99_ms']:.2f} ms")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Wspólny klient informacji o filmach (wcześniej get_movie_info było osobno w recommendation_system.py i test.py):
+# - wiele tytułów pobieranych jest współbieżnie (asyncio) z ograniczoną liczbą zapytań naraz,
+#   przez jedną sesję requests z pulą połączeń i z limitem czasu na każde zapytanie,
+# - odpowiedzi zapisywane są w pamięci podręcznej SQLite z czasem ważności (TTL),
+#   więc ten sam tytuł nie jest pobierany drugi raz, także między uruchomieniami,
+# - do testów bez sieci służy lokalny serwer odtwarzający zapisane odpowiedzi JSON (serve_recorded).
+#
+#  !--- Użycie ---!
+# from movie_info import MovieInfoClient, print_movie_info
+# client = MovieInfoClient()
+# infos = client.fetch_many(["Peaky Blinders", "Lupin"])    # {tytuł: odpowiedź JSON albo wyjątek}
+#
+# python movie_info.py "Peaky Blinders" Lupin                             # prawdziwe API
+# python movie_info.py --record movie_info_stub.json "Peaky Blinders"     # zapis odpowiedzi do pliku
+# python movie_info.py --stub movie_info_stub.json --delay 0.2 "Peaky Blinders" Lupin 1670
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "https://imdb.iamidiotareyoutoo.com/search"
+
+# Pamięć podręczna odpowiedzi API - w katalogu modułu, niezależnie od katalogu roboczego
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "movie_info_cache.sqlite")
+
+
+class MetadataCache:
+    """Pamięć podręczna odpowiedzi w SQLite: tytuł -> JSON, wpisy starsze niż ttl sekund są pomijane."""
+
+    def __init__(self, path=CACHE_PATH, ttl=7 * 24 * 3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS movie_info "
+                         "(title TEXT PRIMARY KEY, data TEXT NOT NULL, fetched REAL NOT NULL)")
+        self._db.commit()
+
+    def get(self, title):
+        """Zwraca zapisaną odpowiedź albo None (brak lub przeterminowana)."""
+        with self._lock:
+            row = self._db.execute("SELECT data FROM movie_info WHERE title = ? AND fetched >= ?",
+                                   (title, time.time() - self.ttl)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, title, data):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO movie_info VALUES (?, ?, ?)",
+                             (title, json.dumps(data), time.time()))
+            self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+class MovieInfoClient:
+    """
+    Współbieżne pobieranie informacji o filmach: jedna sesja z pulą połączeń, najwyżej
+    concurrency zapytań naraz, limit czasu timeout (s) na zapytanie, wyniki w MetadataCache.
+    """
+
+    def __init__(self, base_url=BASE_URL, cache=None, timeout=10.0, concurrency=8):
+        self.base_url = base_url
+        self.cache = MetadataCache() if cache is None else cache
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.fetched = 0 # liczba zapytań wysłanych do API (bez trafień w pamięci podręcznej)
+
+    def _get(self, title):
+        response = self.session.get(self.base_url, params={'q': title}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_many_async(self, titles):
+        """Zwraca {tytuł: odpowiedź JSON albo wyjątek requests}; powtórzone tytuły pobierane są raz."""
+        results, missing = {}, []
+        for title in dict.fromkeys(titles):
+            data = self.cache.get(title)
+            if data is None:
+                missing.append(title)
+            else:
+                results[title] = data
+
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(self.concurrency)
+
+        # requests jest blokujące - każde zapytanie idzie do wątku z puli, asyncio ogranicza ich liczbę
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            async def fetch(title):
+                async with limit:
+                    try:
+                        data = await loop.run_in_executor(executor, self._get, title)
+                    except (requests.RequestException, ValueError) as e:
+                        return title, e
+                self.fetched += 1
+                self.cache.put(title, data)
+                return title, data
+
+            for title, data in await asyncio.gather(*(fetch(title) for title in missing)):
+                results[title] = data
+        return {title: results[title] for title in dict.fromkeys(titles)}
+
+    def fetch_many(self, titles):
+        """Synchroniczna wersja fetch_many_async."""
+        return asyncio.run(self.fetch_many_async(titles))
+
+    def close(self):
+        self.session.close()
+        self.cache.close()
+
+
+def print_movie_info(data):
+    """Wypisuje informacje o pierwszym znalezionym filmie (data - odpowiedź JSON albo wyjątek)."""
+    if isinstance(data, Exception):
+        print("Error fetching data:", data)
+        return
+
+    if not data.get("description"):
+        print("No results found.")
+        return
+
+    movie = data["description"][0]
+
+    print("\nMovie Information")
+    print("Title:", movie.get("#TITLE", "N/A"))
+    print("Year:", movie.get("#YEAR", "N/A"))
+    print("IMDB rank:", movie.get("#RANK", "N/A"))
+    print("Actors:", movie.get("#ACTORS", "N/A"))
+    print("AKA:", movie.get("#AKA", "N/A"))
+
+
+def get_movie_info(title, client=None):
+    """Pobiera i wypisuje informacje o jednym filmie; klient utworzony tutaj jest zamykany po zapytaniu."""
+    if client is not None:
+        print_movie_info(client.fetch_many([title])[title])
+        return
+    client = MovieInfoClient()
+    try:
+        print_movie_info(client.fetch_many([title])[title])
+    finally:
+        client.close()
+
+
+def serve_recorded(responses, delay=0.0, host="127.0.0.1", port=0):
+    """
+    Serwer zastępczy API: GET /search?q=<tytuł> zwraca zapisaną odpowiedź z responses
+    ({tytuł: JSON}) albo pustą listę wyników, po opóźnieniu delay (s). Uruchomienie: serve_forever().
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            title = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+            time.sleep(delay)
+            body = json.dumps(responses.get(title, {'ok': True, 'description': []})).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Informacje o filmach (współbieżnie, z pamięcią podręczną).")
+    parser.add_argument("titles", nargs="+", help="Tytuły filmów")
+    parser.add_argument("--stub", help="Plik JSON z zapisanymi odpowiedziami - zapytania do lokalnego serwera")
+    parser.add_argument("--delay", type=float, default=0.0, help="Opóźnienie odpowiedzi serwera zastępczego (s)")
+    parser.add_argument("--record", help="Zapisuje odpowiedzi API dla podanych tytułów do pliku JSON")
+    parser.add_argument("--cache", help="Plik SQLite pamięci podręcznej (domyślnie tymczasowy przy --stub)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server, base_url = None, BASE_URL
+    if args.stub:
+        with open(args.stub, encoding='utf-8') as file:
+            server = serve_recorded(json.load(file), args.delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}/search"
+    cache_path = args.cache or (os.path.join(tempfile.mkdtemp(), "cache.sqlite") if args.stub else CACHE_PATH)
+    client = MovieInfoClient(base_url, MetadataCache(cache_path), args.timeout, args.concurrency)
+
+    for attempt in ("pierwsze", "drugie"):
+        start = time.perf_counter()
+        infos = client.fetch_many(args.titles)
+        print(f"{attempt} pobranie: {time.perf_counter() - start:.3f} s, zapytań do API łącznie: {client.fetched}")
+    for title in args.titles:
+        print_movie_info(infos[title])
+
+    if args.record:
+        recorded = {title: data for title, data in infos.items() if not isinstance(data, Exception)}
+        with open(args.record, 'w', encoding='utf-8') as file:
+            json.dump(recorded, file, ensure_ascii=False, indent=2)
+        print(f"Zapisano {len(recorded)} odpowiedzi: {args.record}")
+
+    client.close()
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Binarny, kolumnowy magazyn ocen zamiast parsowania recommendations.csv przy każdym starcie.
+# Import CSV (jednorazowo, albo gdy plik CSV się zmieni) zapisuje do katalogu tablice NumPy:
+# - indptr.npy (int32/int64)  - granice wierszy użytkowników (zakodowani kolejnymi liczbami, jak w CSR),
+# - movie_codes.npy (int32)   - kody filmów,
+# - ratings.npy (float32)     - oceny (powtórzenia tej samej pary uśrednione),
+# - users.npy, movies.npy     - słowniki nazw (posortowane tablice napisów, kod = pozycja),
+# - meta.json                 - wersja formatu, rozmiary i rozmiar / czas modyfikacji źródłowego CSV.
+# Wczytanie to np.load(mmap_mode='r') - bez kopiowania i parsowania, więc czas nie zależy
+# od liczby ocen; macierz CSR korzysta bezpośrednio z odwzorowanych w pamięci tablic.
+#
+#  !--- Użycie ---!
+# from ratings_store import open_ratings
+# data = open_ratings("recommendations.csv", "ratings_store")   # RatingsData (import przy zmianie CSV)
+#
+# python ratings_store.py                      # import + test zgodności z CSV
+# python ratings_store.py --benchmark 2000000  # czas CSV vs magazyn dla syntetycznych ocen
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from sparse_recommender import RatingsData
+
+FORMAT_VERSION = 1
+
+# Domyślne ścieżki względem katalogu modułu - niezależnie od katalogu roboczego
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ratings_store")
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recommendations.csv")
+
+
+def _source_info(csv_path):
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_store(data, directory, source=None):
+    """Zapisuje RatingsData (nazwy użytkowników posortowane) do katalogu magazynu."""
+    os.makedirs(directory, exist_ok=True)
+    matrix = data.matrix.tocsr()
+    matrix.sort_indices()
+    index_dtype = np.int32 if matrix.nnz < 2 ** 31 else np.int64
+    np.save(os.path.join(directory, "indptr.npy"), matrix.indptr.astype(index_dtype))
+    np.save(os.path.join(directory, "movie_codes.npy"), matrix.indices.astype(index_dtype))
+    np.save(os.path.join(directory, "ratings.npy"), matrix.data.astype(np.float32))
+    np.save(os.path.join(directory, "users.npy"), np.array([str(user) for user in data.users]))
+    np.save(os.path.join(directory, "movies.npy"), np.array([str(movie) for movie in data.movies]))
+    meta = {'format': FORMAT_VERSION, 'users': matrix.shape[0], 'movies': matrix.shape[1],
+            'ratings': int(matrix.nnz), 'source': source}
+    # meta.json na końcu - magazyn bez niego traktowany jest jak niekompletny
+    with open(os.path.join(directory, "meta.json"), 'w', encoding='utf-8') as file:
+        json.dump(meta, file)
+
+
+def import_csv(csv_path, directory=STORE_DIR):
+    """Konwertuje plik CSV (user_id, movie, rating) do magazynu binarnego."""
+    frame = pd.read_csv(csv_path, dtype={'user_id': str, 'movie': str})
+    write_store(RatingsData.from_frame(frame), directory, _source_info(csv_path))
+
+
+def read_meta(directory):
+    """Zwraca meta.json magazynu albo None, gdy magazynu nie ma lub ma inny format."""
+    try:
+        with open(os.path.join(directory, "meta.json"), encoding='utf-8') as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('format') == FORMAT_VERSION else None
+
+
+def store_fingerprint(directory=STORE_DIR):
+    """Skrót magazynu z meta.json (rozmiary i źródłowy CSV) - bez czytania tablic ocen."""
+    return json.dumps(read_meta(directory), sort_keys=True)
+
+
+def load_store(directory=STORE_DIR):
+    """Wczytuje magazyn jako RatingsData - tablice odwzorowane w pamięci (bez kopii)."""
+    meta = read_meta(directory)
+    if meta is None:
+        raise FileNotFoundError(f"No ratings store in {directory}.")
+
+    def load(name):
+        return np.load(os.path.join(directory, name), mmap_mode='r')
+
+    matrix = sp.csr_matrix((load("ratings.npy"), load("movie_codes.npy"), load("indptr.npy")),
+                           shape=(meta['users'], meta['movies']), copy=False)
+    return RatingsData(matrix, load("users.npy"), load("movies.npy"), sorted_users=True)
+
+
+def open_ratings(csv_path=CSV_PATH, directory=STORE_DIR):
+    """Wczytuje magazyn, a gdy go nie ma lub CSV zmienił się od importu - najpierw importuje CSV."""
+    meta = read_meta(directory)
+    if meta is None or meta.get('source') != _source_info(csv_path):
+        import_csv(csv_path, directory)
+    return load_store(directory)
+
+
+def to_frame(data):
+    """Oceny z RatingsData jako ramka danych user_id, movie, rating."""
+    matrix = data.matrix
+    user_codes = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    return pd.DataFrame({'user_id': pd.Categorical.from_codes(user_codes, list(data.users)),
+                         'movie': pd.Categorical.from_codes(matrix.indices, list(data.movies)),
+                         'rating': np.asarray(matrix.data, dtype=np.float64)})
+
+
+def check_round_trip(csv_path, directory):
+    """Import CSV -> magazyn -> wczytanie; porównuje z macierzą zbudowaną bezpośrednio z CSV."""
+    import_csv(csv_path, directory)
+    stored = load_store(directory)
+    expected = RatingsData.from_frame(pd.read_csv(csv_path, dtype={'user_id': str, 'movie': str}))
+    assert list(stored.users) == list(expected.users), "user names differ"
+    assert list(stored.movies) == list(expected.movies), "movie names differ"
+    assert (stored.matrix != expected.matrix).nnz == 0, "ratings differ"
+    for row, user in enumerate(expected.users[:100]):
+        assert stored.user_row(user) == row, f"lookup of {user} differs"
+    restored = to_frame(stored)
+    assert (RatingsData.from_frame(restored).matrix != expected.matrix).nnz == 0, "frame differs"
+    return stored
+
+
+def synthetic_csv(path, ratings, users, movies, seed=0):
+    """Zapisuje losowe oceny z nazwami użytkowników i filmów jako napisami."""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'user_id': np.char.add("user ", rng.integers(0, users, ratings).astype(str)),
+                          'movie': np.char.add("movie ", rng.integers(0, movies, ratings).astype(str)),
+                          'rating': rng.integers(1, 11, ratings).astype(np.float64)})
+    frame.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binarny magazyn ocen: import CSV, test zgodności, pomiar czasu.")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--benchmark", type=int, default=0, help="Liczba syntetycznych ocen do pomiaru (0 - bez)")
+    args = parser.parse_args()
+
+    stored = check_round_trip(args.csv, args.store)
+    print(f"Test zgodności OK: {len(stored.users)} użytkowników, {len(stored.movies)} filmów, "
+          f"{stored.matrix.nnz} ocen -> {args.store}")
+
+    if args.benchmark:
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "ratings.csv")
+            synthetic_csv(csv_path, args.benchmark, max(args.benchmark // 30, 1), max(args.benchmark // 50, 1))
+
+            start = time.perf_counter()
+            RatingsData.from_frame(pd.read_csv(csv_path)).user_row("user 0")
+            csv_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            import_csv(csv_path, os.path.join(directory, "store"))
+            import_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            data = load_store(os.path.join(directory, "store"))
+            data.user_row("user 0")
+            load_time = time.perf_counter() - start
+
+        print(f"{args.benchmark} ocen: CSV {csv_time:.2f} s, import {import_time:.2f} s (jednorazowo), "
+              f"wczytanie magazynu {load_time * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Długo działający serwis rekomendacji.
+# Model (oceny CSR + indeks k najbardziej podobnych użytkowników albo filmów, --mode)
+# budowany jest lub wczytywany raz przy starcie, a potem obsługuje wiele zapytań:
+# - API w Pythonie: RecommendationService.recommend(user, n) i recommend_many(users, n),
+#   gdzie recommend_many liczy oceny szacowane dla wielu użytkowników jednym iloczynem
+#   macierzy rzadkich (sąsiedzi x oceny albo oceny x podobne filmy),
+# - lokalny serwer HTTP (JSON):
+#     GET  /recommend?user=<imię i nazwisko>&n=5
+#     POST /recommend_many   {"users": [...], "n": 5}
+#     GET  /users
+#     GET  /metrics          - liczba zapytań i opóźnienia p50 / p99 (ms)
+#
+#  !--- Użycie ---!
+# python recommendation_service.py --port 8000
+# python recommendation_service.py --port 8000 --model neighbours.npz   # indeks zapisany między uruchomieniami
+# python recommendation_service.py --port 8000 --store ratings_store    # oceny z magazynu binarnego
+# curl "http://127.0.0.1:8000/recommend?user=Pawe%C5%82+Czapiewski&n=5"
+# python load_test.py --url http://127.0.0.1:8000
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import scipy.sparse as sp
+
+from incremental_similarity import data_fingerprint
+from ratings_store import CSV_PATH, open_ratings, store_fingerprint
+from retrieval import bottom_k, top_k
+from sparse_recommender import UserNotFound, batch_scores, load_ratings, top_k_item_neighbours, top_k_neighbours
+
+
+class LatencyStats:
+    """Opóźnienia ostatnich zapytań (ograniczona kolejka) - percentyle p50 / p99, bezpieczne dla wątków."""
+
+    def __init__(self, window=10000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def summary(self):
+        with self._lock:
+            samples = np.array(self._samples) * 1e3
+            count = self.count
+        if not len(samples):
+            return {'count': count}
+        return {'count': count, 'p50_ms': float(np.percentile(samples, 50)),
+                'p99_ms': float(np.percentile(samples, 99)), 'max_ms': float(samples.max())}
+
+
+def neighbours_source(data, k, mode, store=None):
+    """Skrót ocen (meta.json magazynu albo tablice RatingsData) razem z k i mode - klucz zapisanego indeksu."""
+    ratings = store_fingerprint(store) if store else data_fingerprint(data)
+    return json.dumps({'ratings': ratings, 'k': k, 'mode': mode}, sort_keys=True)
+
+
+def save_neighbours(path, neighbours, source):
+    """Zapisuje indeks sąsiadów (CSR) i jego źródło do pliku .npz (dokładnie pod ścieżką path)."""
+    neighbours = neighbours.tocsr()
+    with open(path, 'wb') as file:
+        np.savez(file, data=neighbours.data, indices=neighbours.indices, indptr=neighbours.indptr,
+                 shape=np.array(neighbours.shape), source=np.array(source))
+
+
+def load_neighbours(path, source):
+    """Indeks sąsiadów z pliku albo None, gdy pliku nie ma lub powstał z innych ocen, k albo mode."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as saved:
+        if 'source' not in saved.files or str(saved['source']) != source:
+            return None
+        return sp.csr_matrix((saved['data'], saved['indices'], saved['indptr']), shape=tuple(saved['shape']))
+
+
+class RecommendationService:
+    """
+    Rekomendacje z modelu zbudowanego raz (oceny + k sąsiadów) - model tylko do odczytu,
+    więc zapytania mogą być obsługiwane z wielu wątków naraz.
+    """
+
+    def __init__(self, data, neighbours, mode='user'):
+        self.data = data
+        self.neighbours = neighbours.tocsr()
+        self.mode = mode
+        self.stats = {'recommend': LatencyStats(), 'recommend_many': LatencyStats()}
+
+    @classmethod
+    def from_csv(cls, path=CSV_PATH, k=50, model_path=None, store=None, mode='user'):
+        """
+        Wczytuje oceny (z CSV albo z magazynu binarnego store, importowanego przy zmianie CSV)
+        i indeks sąsiadów z model_path, jeśli powstał z tych samych ocen, k i mode
+        (neighbours_source) - w przeciwnym razie buduje i zapisuje indeks.
+        mode='user' - indeks podobnych użytkowników, mode='item' - indeks podobnych filmów.
+        """
+        data = open_ratings(path, store) if store else load_ratings(path)
+        if model_path:
+            source = neighbours_source(data, k, mode, store)
+            neighbours = load_neighbours(model_path, source)
+            if neighbours is not None:
+                return cls(data, neighbours, mode)
+        if mode == 'user':
+            neighbours = top_k_neighbours(data.matrix, k=k)
+        else:
+            neighbours = top_k_item_neighbours(data.matrix, k=k)
+        if model_path:
+            save_neighbours(model_path, neighbours, source)
+        return cls(data, neighbours, mode)
+
+    def _select(self, columns, scores, n, n_bottom):
+        """n filmów o największej i n_bottom o najmniejszej ocenie (argpartition zamiast sortowania)."""
+        def pick(selected):
+            return [(str(self.data.movies[columns[index]]), float(scores[index])) for index in selected]
+        return pick(top_k(scores, n)), pick(bottom_k(scores, n_bottom))
+
+    def recommend_many(self, users, n=5, n_bottom=None):
+        """
+        Rekomendacje dla wielu użytkowników naraz: jeden iloczyn macierzy rzadkich (batch_scores).
+        Zwraca listę słowników {'user', 'recommended', 'unrecommended'} z parami (film, ocena szacowana).
+        """
+        start = time.perf_counter()
+        results = self._recommend_batch(users, n, n if n_bottom is None else n_bottom)
+        self.stats['recommend_many'].record(time.perf_counter() - start)
+        return results
+
+    def _recommend_batch(self, users, n, n_bottom):
+        rows = [self.data.user_row(user) for user in users]
+        scores = batch_scores(self.data.matrix, self.neighbours, rows, self.mode)
+        results = []
+        for position, (user, row) in enumerate(zip(users, rows)):
+            columns = scores.indices[scores.indptr[position]:scores.indptr[position + 1]]
+            values = scores.data[scores.indptr[position]:scores.indptr[position + 1]]
+            rated = self.data.matrix.indices[self.data.matrix.indptr[row]:self.data.matrix.indptr[row + 1]]
+            keep = ~np.isin(columns, rated) & (values != 0) # tylko filmy nieocenione
+            recommended, unrecommended = self._select(columns[keep], values[keep], n, n_bottom)
+            results.append({'user': user, 'recommended': recommended, 'unrecommended': unrecommended})
+        return results
+
+    def recommend(self, user, n=5, n_bottom=None):
+        """Rekomendacje dla jednego użytkownika (słownik jak w recommend_many)."""
+        start = time.perf_counter()
+        result = self._recommend_batch([user], n, n if n_bottom is None else n_bottom)[0]
+        self.stats['recommend'].record(time.perf_counter() - start)
+        return result
+
+    def metrics(self):
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+
+def parse_count(value):
+    """Liczba rekomendacji z zapytania - nieujemna liczba całkowita, inaczej ValueError."""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"n must be an integer, got {value!r}.")
+    count = int(value)
+    if count < 0:
+        raise ValueError(f"n must be non-negative, got {count}.")
+    return count
+
+
+def make_handler(service):
+    """Tworzy klasę obsługi HTTP powiązaną z serwisem."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            try:
+                if url.path == '/recommend':
+                    self._send(200, service.recommend(query['user'][0], parse_count(query.get('n', ['5'])[0])))
+                elif url.path == '/users':
+                    self._send(200, [str(user) for user in service.data.users])
+                elif url.path == '/metrics':
+                    self._send(200, service.metrics())
+                else:
+                    self._send(404, {'error': 'not found'})
+            except UserNotFound as error:
+                self._send(404, {'error': str(error)})
+            except (KeyError, ValueError) as error: # brak parametru albo niepoprawne n
+                self._send(400, {'error': str(error)})
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/recommend_many':
+                self._send(404, {'error': 'not found'})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                if not isinstance(request, dict) or not isinstance(request.get('users'), list):
+                    raise ValueError('expected a JSON object with a "users" list')
+                self._send(200, service.recommend_many(request['users'], parse_count(request.get('n', 5))))
+            except UserNotFound as error:
+                self._send(404, {'error': str(error)})
+            except ValueError as error: # niepoprawny JSON (JSONDecodeError), "users" albo n
+                self._send(400, {'error': str(error)})
+
+        def log_message(self, format, *args): # bez wpisu w konsoli dla każdego zapytania
+            pass
+
+    return Handler
+
+
+def serve(service, host="127.0.0.1", port=8000):
+    """Tworzy serwer HTTP (wielowątkowy) dla serwisu - uruchomienie: server.serve_forever()."""
+    return ThreadingHTTPServer((host, port), make_handler(service))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serwis rekomendacji (HTTP + JSON).")
+    parser.add_argument("--csv", default=CSV_PATH, help="Plik z ocenami")
+    parser.add_argument("--k", type=int, default=50, help="Liczba sąsiadów")
+    parser.add_argument("--mode", choices=('user', 'item'), default='user',
+                        help="Podobni użytkownicy (user) albo podobne filmy (item)")
+    parser.add_argument("--store", help="Katalog binarnego magazynu ocen (ratings_store.py)")
+    parser.add_argument("--model", help="Plik .npz z indeksem sąsiadów (wczytywany lub tworzony)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    service = RecommendationService.from_csv(args.csv, args.k, args.model, args.store, args.mode)
+    print(f"Model gotowy w {time.perf_counter() - start:.2f} s "
+          f"({len(service.data.users)} użytkowników, {len(service.data.movies)} filmów)")
+    server = serve(service, args.host, args.port)
+    print(f"Serwis działa na http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(service.metrics(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Wybór najlepszych i najgorszych filmów bez sortowania całego katalogu:
+# - top_k / bottom_k - np.argpartition (czas liniowy), sortowane jest tylko k wybranych,
+# - top_n_series - to samo dla serii pandas (zamiast sort_values().head() / tail()),
+# - IVFIndex - przybliżony indeks wektorów filmów (np. czynniki z als_recommender.py):
+#   filmy dzielone są k-średnimi na grupy, a zapytanie przegląda tylko probes grup
+#   o największym iloczynie skalarnym środka grupy z wektorem użytkownika.
+#
+#  !--- Użycie ---!
+# from retrieval import IVFIndex, top_k
+# best = top_k(scores, 5)                                   # indeksy 5 największych, malejąco
+# index = IVFIndex(model.movie_factors)
+# best = index.search(model.user_factors[row], 5, probes=8, exclude=rated)
+# worst = index.search(-model.user_factors[row], 5, probes=8, exclude=rated)   # najmniejsze iloczyny
+#
+# python benchmark_retrieval.py   # opóźnienie i recall@k vs wyszukiwanie dokładne
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _resolve_ties(scores, k, boundary, strict, last):
+    """
+    Wybór k indeksów przy wartości granicznej boundary (z argpartition): wartości lepsze
+    od granicznej (strict) zostają, a spośród równych granicznej brane są pierwsze
+    (last=False) albo ostatnie (last=True) indeksy.
+    """
+    inside = np.flatnonzero(strict)
+    tied = np.flatnonzero(scores == boundary)
+    missing = k - len(inside)
+    return np.concatenate([inside, tied[len(tied) - missing:] if last else tied[:missing]])
+
+
+def top_k(scores, k):
+    """
+    Indeksy k największych wartości scores, malejąco. Remisy rozstrzyga kolejność indeksów
+    (jak stabilne sortowanie malejące i head(k)): wybierane i zwracane są najpierw mniejsze indeksy.
+    """
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        best = np.argpartition(-scores, k - 1)[:k]
+        boundary = scores[best].min()
+        best = _resolve_ties(scores, k, boundary, scores > boundary, last=False)
+    else:
+        best = np.arange(len(scores))
+    return best[np.lexsort((best, -scores[best]))]
+
+
+def bottom_k(scores, k):
+    """
+    Indeksy k najmniejszych wartości scores, rosnąco. Remisy na granicy wyboru jak tail(k)
+    po stabilnym sortowaniu malejącym: wybierane są większe indeksy; wśród równych
+    wartości wynik jest w kolejności indeksów.
+    """
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        worst = np.argpartition(scores, k - 1)[:k]
+        boundary = scores[worst].max()
+        worst = _resolve_ties(scores, k, boundary, scores < boundary, last=True)
+    else:
+        worst = np.arange(len(scores))
+    return worst[np.lexsort((worst, scores[worst]))]
+
+
+def top_n_series(recommendations, n, n_bottom):
+    """(n największych malejąco, n_bottom najmniejszych rosnąco) z serii pandas."""
+    values = recommendations.to_numpy()
+    return recommendations.iloc[top_k(values, n)], recommendations.iloc[bottom_k(values, n_bottom)]
+
+
+class IVFIndex:
+    """
+    Przybliżone wyszukiwanie największego iloczynu skalarnego (inverted file index).
+
+    Wektory dzielone są na clusters grup k-średnimi; każda grupa to ciągły fragment
+    tablicy wektorów posortowanej według grupy.
+    """
+
+    def __init__(self, vectors, clusters=None, iterations=10, seed=0, chunk_size=16384):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        clusters = clusters or max(1, int(np.sqrt(len(vectors))))
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), clusters, replace=False)]
+        for _ in range(iterations):
+            assignment = self._assign(vectors, centroids, chunk_size)
+            members = sp.csr_matrix((np.ones(len(vectors), dtype=np.float32),
+                                     (assignment, np.arange(len(vectors)))), shape=(clusters, len(vectors)))
+            counts = np.asarray(members.sum(axis=1)).ravel()
+            sums = members @ vectors
+            filled = counts > 0 # pusta grupa zachowuje poprzedni środek
+            centroids[filled] = sums[filled] / counts[filled, None]
+        assignment = self._assign(vectors, centroids, chunk_size)
+
+        self.order = np.argsort(assignment, kind='stable')
+        self.vectors = vectors[self.order]
+        self.centroids = centroids
+        self.offsets = np.searchsorted(assignment[self.order], np.arange(clusters + 1))
+
+    @staticmethod
+    def _assign(vectors, centroids, chunk_size):
+        """Najbliższy środek (odległość euklidesowa) każdego wektora, fragmentami."""
+        half_norms = (centroids ** 2).sum(axis=1) / 2
+        return np.concatenate([np.argmax(vectors[start:start + chunk_size] @ centroids.T - half_norms, axis=1)
+                               for start in range(0, len(vectors), chunk_size)])
+
+    def candidates(self, query, probes):
+        """Pozycje (w self.vectors) wektorów z probes grup o największym iloczynie ze środkiem."""
+        clusters = top_k(self.centroids @ query, probes)
+        return np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in clusters])
+
+    def search(self, query, k, probes=8, exclude=None):
+        """
+        Numery wektorów (jak w tablicy wejściowej) o k największych iloczynach z query,
+        szukane tylko w probes grupach; exclude - numery pomijane (np. filmy ocenione).
+        """
+        query = np.asarray(query, dtype=np.float32)
+        positions = self.candidates(query, probes)
+        ids = self.order[positions]
+        scores = self.vectors[positions] @ query
+        if exclude is not None and len(exclude):
+            keep = ~np.isin(ids, exclude)
+            ids, scores = ids[keep], scores[keep]
+        return ids[top_k(scores, k)]
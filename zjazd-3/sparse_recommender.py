@@ -0,0 +1,176 @@
+# Autorzy: Aleksander Bastek (s27454), Michał Małolepszy (s29097)
+
+#  !--- Opis ---!
+# Rzadka wersja rekomendacji z recommendation_system.py:
+# - oceny przechowywane są jako macierz scipy.sparse CSR (użytkownicy x filmy) zamiast
+#   gęstej tabeli pivot_table(...).fillna(0),
+# - zamiast pełnej macierzy podobieństwa N x N liczony jest indeks k najbardziej podobnych
+#   użytkowników (cosine similarity) - fragmentami wierszy, więc pamięć jest ograniczona
+#   rozmiarem fragmentu, a nie kwadratem liczby użytkowników,
+# - rekomendacja dla użytkownika korzysta tylko z jego k sąsiadów,
+# - tryb 'item': indeks k najbardziej podobnych filmów (top_k_item_neighbours), a oceny
+#   szacowane liczone są tylko z filmów ocenionych przez użytkownika.
+#
+#  !--- Użycie ---!
+# from sparse_recommender import load_ratings, top_k_neighbours, recommend
+# data = load_ratings("recommendations.csv")
+# neighbours = top_k_neighbours(data.matrix, k=50)
+# top, bottom = recommend(data, neighbours, "Paweł Czapiewski", n=5)
+# item_neighbours = top_k_item_neighbours(data.matrix, k=50)
+# top, bottom = recommend(data, item_neighbours, "Paweł Czapiewski", n=5, mode='item')
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from retrieval import top_n_series
+
+
+class UserNotFound(ValueError):
+    """Użytkownika nie ma w danych (w serwisie HTTP - odpowiedź 404)."""
+
+
+class RatingsData:
+    """
+    Oceny jako macierz CSR (użytkownicy x filmy) wraz z nazwami wierszy i kolumn.
+
+    sorted_users=True oznacza, że users jest posortowaną tablicą NumPy - wtedy użytkownik
+    wyszukiwany jest binarnie zamiast budowania słownika (np. tablice z ratings_store).
+    """
+
+    def __init__(self, matrix, users, movies, sorted_users=False):
+        self.matrix = matrix.tocsr()
+        self.users = users if isinstance(users, np.ndarray) else np.asarray(users, dtype=object)
+        self.movies = movies if isinstance(movies, np.ndarray) else np.asarray(movies, dtype=object)
+        self.sorted_users = sorted_users
+
+    @cached_property
+    def user_rows(self):
+        return {user: row for row, user in enumerate(self.users.tolist())}
+
+    @classmethod
+    def from_frame(cls, df):
+        """Tworzy macierz z ramki danych z kolumnami user_id, movie, rating."""
+        users = pd.Categorical(df['user_id'])
+        movies = pd.Categorical(df['movie'])
+        matrix = sp.coo_matrix((df['rating'].to_numpy(dtype=np.float32), (users.codes, movies.codes)),
+                               shape=(len(users.categories), len(movies.categories)))
+        # Powtórzona ocena tej samej pary liczona jako średnia (jak pivot_table)
+        counts = sp.coo_matrix((np.ones(len(df), dtype=np.float32), (users.codes, movies.codes)),
+                               shape=matrix.shape).tocsr()
+        matrix = matrix.tocsr()
+        matrix.data /= counts.data
+        return cls(matrix, users.categories, movies.categories)
+
+    def user_row(self, user):
+        """Zwraca numer wiersza użytkownika albo zgłasza UserNotFound."""
+        if self.sorted_users:
+            row = int(np.searchsorted(self.users, user))
+            if row < len(self.users) and self.users[row] == user:
+                return row
+            raise UserNotFound(f"User {user} not found in dataset.")
+        if user not in self.user_rows:
+            raise UserNotFound(f"User {user} not found in dataset.")
+        return self.user_rows[user]
+
+
+def load_ratings(path="recommendations.csv"):
+    return RatingsData.from_frame(pd.read_csv(path))
+
+
+def normalize_rows(matrix):
+    """Dzieli każdy wiersz przez jego normę L2 (wiersze zerowe zostają zerowe)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sp.diags((1 / norms).astype(matrix.dtype)) @ matrix
+
+
+def top_k_neighbours(matrix, k=50, chunk_size=1024):
+    """
+    Zwraca macierz CSR N x N, w której wiersz u zawiera k najbardziej podobnych
+    użytkowników (cosine similarity > 0, bez samego u).
+
+    Podobieństwa liczone są fragmentami po chunk_size wierszy jako rzadki iloczyn
+    znormalizowanych ocen - w pamięci jest tylko jeden fragment naraz.
+    """
+    normalized = normalize_rows(matrix.tocsr().astype(np.float32))
+    transposed = normalized.T.tocsr()
+    rows, indptr, indices, data = normalized.shape[0], [0], [], []
+
+    for start in range(0, rows, chunk_size):
+        similarity = (normalized[start:start + chunk_size] @ transposed).tocsr()
+        for offset in range(similarity.shape[0]):
+            row_start, row_end = similarity.indptr[offset], similarity.indptr[offset + 1]
+            columns = similarity.indices[row_start:row_end]
+            values = similarity.data[row_start:row_end]
+            keep = (columns != start + offset) & (values > 0) # bez samego siebie
+            columns, values = columns[keep], values[keep]
+            if len(values) > k:
+                best = np.argpartition(-values, k - 1)[:k] # k największych bez pełnego sortowania
+                columns, values = columns[best], values[best]
+            indices.append(columns)
+            data.append(values)
+            indptr.append(indptr[-1] + len(columns))
+
+    return sp.csr_matrix((np.concatenate(data) if data else np.zeros(0, np.float32),
+                          np.concatenate(indices) if indices else np.zeros(0, np.int32),
+                          np.array(indptr)), shape=(rows, rows))
+
+
+def top_k_item_neighbours(matrix, k=50, chunk_size=1024):
+    """
+    Zwraca macierz CSR M x M, w której wiersz filmu i zawiera k filmów najbardziej podobnych
+    (cosine similarity kolumn ocen) - indeks liczony raz, offline, tak jak top_k_neighbours.
+    """
+    return top_k_neighbours(matrix.T.tocsr(), k=k, chunk_size=chunk_size)
+
+
+def batch_scores(matrix, neighbours, rows, mode='user'):
+    """
+    Oceny szacowane dla wierszy rows jako macierz CSR (len(rows) x filmy):
+    - mode='user': ważona suma ocen sąsiadów użytkownika (neighbours - indeks użytkowników),
+    - mode='item': suma ocen użytkownika razy podobieństwo ocenionych filmów do pozostałych
+      (neighbours - indeks filmów); koszt zależy tylko od liczby ocen użytkownika.
+    """
+    if mode == 'user':
+        return (neighbours[rows] @ matrix).tocsr()
+    if mode == 'item':
+        return (matrix[rows] @ neighbours).tocsr()
+    raise ValueError(f"Unknown mode {mode}.")
+
+
+def recommendation_scores(matrix, neighbours, row, mode='user'):
+    """Oceny szacowane filmów dla jednego użytkownika (batch_scores) - gęsty wektor po filmach."""
+    return np.asarray(batch_scores(matrix, neighbours, [row], mode).todense()).ravel()
+
+
+def recommend(data, neighbours, user, n=5, n_bottom=None, mode='user'):
+    """
+    Zwraca (najlepsze, najgorsze) - dwie serie pandas z n (n_bottom) filmami nieocenionymi
+    przez użytkownika o największej i najmniejszej niezerowej ocenie szacowanej.
+    Remisy jak w pierwotnej wersji (stabilne sortowanie malejące, head / tail) - według
+    kolejności filmów (top_k, bottom_k).
+    """
+    row = data.user_row(user)
+    scores = recommendation_scores(data.matrix, neighbours, row, mode)
+    scores[data.matrix[row].indices] = 0 # filmy już ocenione nie są rekomendowane
+    candidates = np.flatnonzero(scores)
+    recommendations = pd.Series(scores[candidates], index=pd.Index(data.movies[candidates], name='movie'))
+    return top_n_series(recommendations, n, n if n_bottom is None else n_bottom)
+
+
+def predict_ratings(matrix, neighbours, rows, columns, default=None):
+    """
+    Ocena szacowana par (rows[i], columns[i]): średnia ocen filmu przez sąsiadów użytkownika
+    ważona podobieństwem; gdy żaden sąsiad nie ocenił filmu - default (domyślnie średnia ocen).
+    """
+    default = float(matrix.data.mean()) if default is None else default
+    similarity = neighbours[rows]
+    raters = matrix.T.tocsr()[columns]
+    rated = raters.copy()
+    rated.data[:] = 1
+    weighted = np.asarray(similarity.multiply(raters).sum(axis=1)).ravel()
+    weights = np.asarray(similarity.multiply(rated).sum(axis=1)).ravel()
+    return np.where(weights > 0, weighted / np.where(weights > 0, weights, 1), default)
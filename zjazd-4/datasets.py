@@ -0,0 +1,123 @@
+# Autorzy:  Aleksander Bastek, Michał Małolepszy
+
+# Opis problemu:
+# Wspólne wczytywanie zbiorów danych skryptów z tego katalogu (haberman.data, vertebral.dat):
+#   - plik źródłowy parsowany jest raz (pd.read_csv) i zapisywany jako .npz z typowanymi kolumnami
+#     w katalogu .dataset_cache,
+#   - nazwa pliku .npz zawiera skrót SHA-256 zawartości pliku źródłowego - zmiana danych
+#     powoduje ponowne parsowanie, kolejne uruchomienia czytają tylko tablice NumPy,
+#   - load_split zwraca deterministyczny podział trening/test: przetasowanie (random_state=42)
+#     i stratyfikowany train_test_split (test_size=0.2, random_state=42) - jak wcześniej w każdym skrypcie.
+
+# Użycie:
+#   from datasets import load_split
+#   X, y, X_train, X_test, y_train, y_test = load_split('vertebral')
+#
+#   python datasets.py        # czas pd.read_csv vs odczyt z pamięci podręcznej
+
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+CACHE_DIR = '.dataset_cache'
+
+# Nazwa zbioru -> plik, argumenty pd.read_csv, nazwy kolumn (ostatnia to klasa)
+DATASETS = {
+    'haberman': {
+        'path': 'haberman.data',
+        'read_csv': {'header': None},
+        'columns': ['age', 'year', 'positive_nodes', 'survival_status'],
+    },
+    'vertebral': {
+        'path': 'vertebral.dat',
+        'read_csv': {'sep': r'\s+', 'header': None},
+        'columns': [
+            'pelvic_incidence',
+            'pelvic_tilt',
+            'lumbar_lordosis_angle',
+            'sacral_slope',
+            'pelvic_radius',
+            'degree_spondylolisthesis',
+            'class_label'
+        ],
+    },
+}
+
+
+def file_hash(path):
+    """Skrót SHA-256 zawartości pliku."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_path(name):
+    """Ścieżka pliku źródłowego zbioru name (względem katalogu tego modułu)."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), DATASETS[name]['path'])
+
+
+def parse(name):
+    """DataFrame zbioru name wczytany z pliku źródłowego (bez pamięci podręcznej)."""
+    spec = DATASETS[name]
+    df = pd.read_csv(source_path(name), **spec['read_csv'])
+    df.columns = spec['columns']
+    return df
+
+
+def load_frame(name, cache_dir=CACHE_DIR):
+    """DataFrame zbioru name - z pliku .npz, jeśli istnieje dla bieżącej zawartości pliku źródłowego."""
+    spec = DATASETS[name]
+    source = source_path(name)
+    path = os.path.join(os.path.dirname(source), cache_dir, f"{name}_{file_hash(source)[:16]}.npz")
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return pd.DataFrame({column: data[column] for column in spec['columns']})
+
+    df = parse(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Kolumny tekstowe (np. klasy AB / NO) jako tablice str - bez pickle w pliku .npz
+    np.savez(path, **{column: df[column].to_numpy(dtype=None if pd.api.types.is_numeric_dtype(df[column]) else str)
+                      for column in spec['columns']})
+    return df
+
+
+def load_split(name, test_size=0.2, random_state=42, cache_dir=CACHE_DIR):
+    """
+    Przetasowany zbiór i jego stratyfikowany podział:
+    (X, y, X_train, X_test, y_train, y_test) - X jako DataFrame z nazwami kolumn, y jako Series.
+    """
+    df = load_frame(name, cache_dir)
+    shuffled_df = df.sample(frac=1.0, random_state=random_state).reset_index(drop=True)
+    target = DATASETS[name]['columns'][-1]
+    X = shuffled_df.drop(columns=[target])
+    y = shuffled_df[target]
+    X_train, X_test, y_train, y_test = train_test_split(
+        X,
+        y,
+        test_size=test_size,
+        random_state=random_state,
+        stratify=y
+    )
+    return X, y, X_train, X_test, y_train, y_test
+
+
+if __name__ == "__main__":
+    for name in DATASETS:
+        start = time.perf_counter()
+        parsed = parse(name)
+        parse_time = time.perf_counter() - start
+
+        load_frame(name)
+        start = time.perf_counter()
+        cached = load_frame(name)
+        cached_time = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(parsed, cached, check_dtype=False)
+        print(f"{name:<10} {len(parsed):>4} wierszy: pd.read_csv {parse_time * 1000:6.2f} ms, "
+              f".npz {cached_time * 1000:6.2f} ms, dane zgodne")
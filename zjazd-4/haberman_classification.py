@@ -25,35 +25,16 @@
 # oraz macierze pomyłek, które przedstawiają liczbę trafionych i nietrafionych przewidywań
 
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-file_path = 'haberman.data'
+from datasets import load_split
 
-df = pd.read_csv(file_path, header=None)
-df.columns = [
-    'age',
-    'year',
-    'positive_nodes',
-    'survival_status'
-]
-
-shuffled_df = df.sample(frac=1.0, random_state=42).reset_index(drop=True)
-
-X = shuffled_df.drop(columns=['survival_status'])
-y = shuffled_df['survival_status']
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    random_state=42,
-    stratify=y
-)
+# Dane wczytywane z pamięci podręcznej .npz (datasets.py), podział stratyfikowany jak wcześniej
+X, y, X_train, X_test, y_train, y_test = load_split('haberman')
 
 dt_classifier = DecisionTreeClassifier(random_state=42)
 dt_classifier.fit(X_train, y_train)
@@ -0,0 +1,215 @@
+# Autorzy:  Aleksander Bastek, Michał Małolepszy
+
+# Opis problemu:
+# Każde dopasowanie SVC(kernel=...) liczy wartości jądra od nowa, także gdy zmienia się tylko
+# C albo class_weight. KernelCache liczy macierz Grama raz:
+#   - iloczyny skalarne X X^T (i kwadraty norm) liczone są raz dla danych (NumPy, wektorowo),
+#   - macierz jądra dla (kernel, gamma, degree, coef0) powstaje z nich elementowo i jest zapamiętywana
+#     (w pamięci albo jako plik .npy odwzorowany w pamięci, gdy podano katalog),
+#   - gdy gamma zależy od zbioru uczącego (gamma='scale'), pełna macierz nie byłaby użyta ponownie
+#     w innym foldzie - liczone są wtedy tylko wycinki uczący x uczący i testowy x uczący,
+#   - SVC(kernel='precomputed') uczy się na wycinku macierzy - kolejne wartości C i class_weight
+#     korzystają z tego samego wycinka; wycinki trzymane są w pamięci LRU o ograniczonym rozmiarze.
+# Wzory jąder i gamma='scale' / 'auto' są takie same jak w scikit-learn.
+
+# Użycie:
+#   from kernel_cache import KernelCache
+#   cache = KernelCache(np.vstack([X_train, X_test]))
+#   classifier = cache.fit(train, y_train, kernel='rbf', C=10)      # train - numery wierszy
+#   predictions = cache.predict(classifier, test, train, kernel='rbf')
+#   classifier.predict(cache.cross(X_new, train, kernel='rbf'))    # punkty spoza X
+#
+#   python kernel_cache.py --rows 1000 2000 5000     # czas zwykłych dopasowań vs macierz Grama z pamięci
+
+import argparse
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.svm import SVC
+
+KERNEL_PARAMS = ('kernel', 'gamma', 'degree', 'coef0')
+
+
+class KernelCache:
+    """Macierze jąder dla wszystkich par wierszy X, liczone raz na (kernel, gamma, degree, coef0)."""
+
+    def __init__(self, X, directory=None, max_block_bytes=512 * 2 ** 20):
+        self.X = np.asarray(X, dtype=np.float64)
+        self.directory = directory
+        self.data_key = hashlib.sha256(np.ascontiguousarray(self.X).tobytes()).hexdigest()[:16]
+        self.matrices = {}
+        self.blocks = OrderedDict() # wycinki od najdawniej użytego
+        self.block_bytes = 0
+        self.max_block_bytes = max_block_bytes
+        self._dots = None
+        self.computed = 0 # liczba policzonych macierzy i wycinków (bez trafień w pamięci)
+
+    @property
+    def dots(self):
+        """X X^T - wspólna podstawa wszystkich jąder."""
+        if self._dots is None:
+            self._dots = self.X @ self.X.T
+        return self._dots
+
+    def resolve_gamma(self, gamma, rows=None):
+        """Wartość liczbowa gamma; 'scale' i 'auto' jak w SVC, liczone na wierszach rows (zbiór uczący)."""
+        X = self.X if rows is None else self.X[rows]
+        if gamma == 'scale':
+            variance = X.var()
+            return 1.0 / (X.shape[1] * variance) if variance != 0 else 1.0
+        if gamma == 'auto':
+            return 1.0 / X.shape[1]
+        return float(gamma)
+
+    def _key(self, kernel='rbf', gamma='scale', degree=3, coef0=0.0, rows=None):
+        """(kernel, gamma, degree, coef0) z gamma jako liczbą i None dla parametrów, których jądro nie używa."""
+        gamma = None if kernel == 'linear' else self.resolve_gamma(gamma, rows)
+        degree = degree if kernel == 'poly' else None
+        coef0 = coef0 if kernel in ('poly', 'sigmoid') else None
+        return kernel, gamma, degree, coef0
+
+    @staticmethod
+    def fold_dependent(kernel='rbf', gamma='scale', **_):
+        """Czy gamma zależy od wierszy uczących - wtedy każdy fold ma inną macierz jądra."""
+        return kernel != 'linear' and gamma == 'scale'
+
+    @staticmethod
+    def _kernel(key, dots, row_norms, column_norms):
+        """Wartości jądra key z iloczynów skalarnych (i kwadratów norm wierszy / kolumn dla rbf)."""
+        kernel, gamma, degree, coef0 = key
+        if kernel == 'linear':
+            return np.array(dots)
+        if kernel == 'poly':
+            return (gamma * dots + coef0) ** degree
+        if kernel == 'rbf':
+            matrix = row_norms[:, None] + column_norms[None, :] - 2 * dots
+            np.maximum(matrix, 0, out=matrix)
+            np.exp(-gamma * matrix, out=matrix)
+            return matrix
+        if kernel == 'sigmoid':
+            return np.tanh(gamma * dots + coef0)
+        raise ValueError(f"Unsupported kernel {kernel}.")
+
+    def gram(self, kernel='rbf', gamma='scale', degree=3, coef0=0.0, rows=None):
+        """Macierz jądra n x n (gamma 'scale' / 'auto' liczone na wierszach rows)."""
+        key = self._key(kernel, gamma, degree, coef0, rows)
+        if key in self.matrices:
+            return self.matrices[key]
+
+        path = None
+        if self.directory:
+            name = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[:16]
+            path = os.path.join(self.directory, f"{self.data_key}_{name}.npy")
+            if os.path.exists(path):
+                self.matrices[key] = np.load(path, mmap_mode='r')
+                return self.matrices[key]
+
+        norms = np.diag(self.dots)
+        matrix = self._kernel(key, self.dots, norms, norms)
+        self.computed += 1
+
+        if path:
+            os.makedirs(self.directory, exist_ok=True)
+            np.save(path, matrix)
+            matrix = np.load(path, mmap_mode='r')
+        self.matrices[key] = matrix
+        return matrix
+
+    @staticmethod
+    def split_params(params):
+        """Dzieli parametry SVC na parametry jądra i pozostałe (C, class_weight, ...)."""
+        kernel_params = {name: value for name, value in params.items() if name in KERNEL_PARAMS}
+        svc_params = {name: value for name, value in params.items() if name not in KERNEL_PARAMS}
+        return kernel_params, svc_params
+
+    def block(self, rows, columns, **kernel_params):
+        """
+        Wycinek macierzy jądra (rows x columns) jako ciągła tablica - zapamiętywany, żeby kolejne
+        dopasowania z innym C / class_weight nie kopiowały go od nowa; gamma liczona na columns.
+        Przy gamma zależnej od foldu wycinek liczony jest bezpośrednio, bez macierzy n x n.
+        """
+        rows, columns = np.asarray(rows), np.asarray(columns)
+        key = (self._key(rows=columns, **kernel_params),
+               hashlib.sha256(rows.tobytes() + b'|' + columns.tobytes()).hexdigest())
+        if key in self.blocks:
+            self.blocks.move_to_end(key)
+            return self.blocks[key]
+
+        if self.fold_dependent(**kernel_params):
+            X_rows, X_columns = self.X[rows], self.X[columns]
+            block = self._kernel(key[0], X_rows @ X_columns.T, np.einsum('ij,ij->i', X_rows, X_rows),
+                                 np.einsum('ij,ij->i', X_columns, X_columns))
+            self.computed += 1
+        else:
+            block = np.ascontiguousarray(self.gram(rows=columns, **kernel_params)[np.ix_(rows, columns)])
+
+        # Ograniczona pamięć wycinków - usuwane najdawniej użyte (ostatnio dodany zostaje zawsze)
+        self.blocks[key] = block
+        self.block_bytes += block.nbytes
+        while self.block_bytes > self.max_block_bytes and len(self.blocks) > 1:
+            self.block_bytes -= self.blocks.popitem(last=False)[1].nbytes
+        return block
+
+    def fit(self, train, y, **params):
+        """SVC(kernel='precomputed') na wierszach train; params jak dla SVC (kernel, gamma, C, ...)."""
+        kernel_params, svc_params = self.split_params(params)
+        classifier = SVC(kernel='precomputed', **svc_params)
+        classifier.fit(self.block(train, train, **kernel_params), y)
+        return classifier
+
+    def predict(self, classifier, rows, train, **kernel_params):
+        """Przewidywania dla wierszy rows modelu uczonego przez fit() na wierszach train."""
+        return classifier.predict(self.block(rows, train, **self.split_params(kernel_params)[0]))
+
+    def cross(self, X_new, columns, **kernel_params):
+        """Macierz jądra nowych punktów X_new (spoza X) i wierszy columns - np. dla pojedynczej próbki."""
+        kernel_params = self.split_params(kernel_params)[0]
+        X_new, X_columns = np.asarray(X_new, dtype=np.float64), self.X[np.asarray(columns)]
+        return self._kernel(self._key(rows=columns, **kernel_params), X_new @ X_columns.T,
+                            np.einsum('ij,ij->i', X_new, X_new), np.einsum('ij,ij->i', X_columns, X_columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Zwykłe SVC vs SVC z macierzą Grama z KernelCache.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 2000, 5000],
+                        help="Liczby wierszy danych syntetycznych (np. 50000)")
+    parser.add_argument("--kernel", default='rbf', choices=['linear', 'poly', 'rbf', 'sigmoid'])
+    parser.add_argument("--features", type=int, default=6, help="Liczba cech (vertebral.dat ma 6)")
+    parser.add_argument("--noise", type=float, default=0.1,
+                        help="Udział losowo zamienionych etykiet (więcej wektorów nośnych)")
+    parser.add_argument("--memory-gib", type=float, default=2.0,
+                        help="Limit pamięci macierzy jądra (float64: pełna macierz, gdy gamma nie zależy od "
+                             "zbioru uczącego, oraz wycinki uczący i testowy)")
+    args = parser.parse_args()
+
+    sweep = [{'C': C, 'class_weight': class_weight}
+             for C in (0.1, 1, 10, 20) for class_weight in (None, 'balanced', {0: 10, 1: 1})]
+    print(f"Jądro {args.kernel}, {len(sweep)} dopasowań na rozmiar (C x class_weight), podział 80/20")
+    for rows in args.rows:
+        # Wycinki uczący x uczący i testowy x uczący (0.8 n x n), plus X X^T i pełna macierz dla stałej gamma
+        needed = (0.8 + (0 if KernelCache.fold_dependent(args.kernel) else 2)) * rows ** 2 * 8 / 2 ** 30
+        if needed > args.memory_gib:
+            print(f"{rows:>7} wierszy: pominięto - macierze jądra wymagają ok. {needed:.1f} GiB "
+                  f"(limit --memory-gib {args.memory_gib:g})")
+            continue
+        X, y = make_classification(rows, args.features, n_informative=4, weights=[0.7], flip_y=args.noise, random_state=42)
+        train, test = np.arange(int(rows * 0.8)), np.arange(int(rows * 0.8), rows)
+
+        start = time.perf_counter()
+        plain = [SVC(kernel=args.kernel, **params).fit(X[train], y[train]).predict(X[test]) for params in sweep]
+        plain_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache = KernelCache(X)
+        cached = [cache.predict(cache.fit(train, y[train], kernel=args.kernel, **params), test, train,
+                                kernel=args.kernel) for params in sweep]
+        cached_time = time.perf_counter() - start
+
+        agreement = np.mean([np.mean(a == b) for a, b in zip(plain, cached)])
+        print(f"{rows:>7} wierszy: SVC {plain_time:7.2f} s, precomputed {cached_time:7.2f} s "
+              f"(macierzy: {cache.computed}), przyspieszenie x{plain_time / cached_time:.1f}, "
+              f"zgodność przewidywań {agreement:.4f}")
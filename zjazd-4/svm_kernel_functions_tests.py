@@ -3,48 +3,47 @@
 # Opis problemu:
 # Sprawdzamy różne jądra SVM wybierając te, które daje najwyższą dokładność
 # Jednocześnie testujemy parametry jądra "C" i "class_weight" oraz ich wpływ na wyniki
+# Parametry strojone są wyszukiwaniem z walidacją krzyżową (svm_search.py - równolegle, z pamięcią podręczną):
+# domyślnie successive halving, pełna siatka (grid_search) po podaniu --grid
 # svm_kernel_analysis_pl.md zawiera opis analizy
 
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.svm import SVC
+# Użycie:
+#   python svm_kernel_functions_tests.py          # successive halving (kilka sekund)
+#   python svm_kernel_functions_tests.py --grid   # cała siatka 120 zestawów x 5 foldów
+
+import argparse
+
+import numpy as np
 from sklearn.metrics import accuracy_score, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-file_path = 'vertebral.dat'
-
-df = pd.read_csv(file_path, sep=r'\s+', header=None)
-df.columns = [
-    'pelvic_incidence',
-    'pelvic_tilt',
-    'lumbar_lordosis_angle',
-    'sacral_slope',
-    'pelvic_radius',
-    'degree_spondylolisthesis',
-    'class_label'
-]
-
-shuffled_df = df.sample(frac=1.0, random_state=42).reset_index(drop=True)
-
-X = shuffled_df.drop(columns=['class_label'])
-y = shuffled_df['class_label']
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    random_state=42,
-    stratify=y
-)
+from datasets import load_split
+from kernel_cache import KernelCache
+from svm_search import grid_search, successive_halving
+
+parser = argparse.ArgumentParser(description="Porównanie jąder SVM i strojenie parametrów walidacją krzyżową.")
+parser.add_argument("--grid", action="store_true",
+                    help="Ocena całej siatki parametrów zamiast successive halving")
+args = parser.parse_args()
+
+# Dane wczytywane z pamięci podręcznej .npz (datasets.py), podział stratyfikowany jak wcześniej
+X, y, X_train, X_test, y_train, y_test = load_split('vertebral')
 
 
-def train_and_evaluate(classifier, X_train, X_test, y_train, y_test):
-    classifier.fit(X_train, y_train)
-    predictions = classifier.predict(X_test)
+# Macierze jądra liczone raz (kernel_cache.py) i wspólne dla wszystkich dopasowań SVC(kernel='precomputed'):
+# wiersze train_rows to zbiór uczący, test_rows - testowy
+kernels = KernelCache(np.vstack([X_train, X_test]))
+train_rows = np.arange(len(X_train))
+test_rows = np.arange(len(X_train), len(X_train) + len(X_test))
+
+
+def train_and_evaluate(params):
+    classifier = kernels.fit(train_rows, y_train, random_state=42, **params)
+    predictions = kernels.predict(classifier, test_rows, train_rows, **params)
     accuracy = accuracy_score(y_test, predictions)
     conf_matrix = confusion_matrix(y_test, predictions)
-    return accuracy, conf_matrix
+    return classifier, accuracy, conf_matrix
 
 svm_kernels = ['linear', 'poly', 'rbf', 'sigmoid']
 
@@ -55,10 +54,7 @@ best_classifier = None
 kernel_results = {}
 
 for kernel in svm_kernels:
-    svm_classifier = SVC(kernel=kernel, random_state=42)
-    accuracy, conf_matrix = train_and_evaluate(
-        svm_classifier, X_train, X_test, y_train, y_test
-    )
+    svm_classifier, accuracy, conf_matrix = train_and_evaluate({'kernel': kernel})
 
     kernel_results[kernel] = {
         'accuracy': accuracy,
@@ -79,19 +75,18 @@ print("\nBest kernel based on accuracy on the test set:")
 print(f"Best kernel: {best_kernel}")
 print(f"Best kernel accuracy: {best_accuracy:.2f}")
 
-tuned_params = {
-    "kernel": best_kernel,
-    "C": 20,
-    "class_weight": {"AB": 10, "NO": 1},
-    "random_state": 42,
-}
+# Parametry strojone wyszukiwaniem z walidacją krzyżową na zbiorze treningowym (svm_search.py)
+# zamiast ręcznie dobranych C=20 i class_weight={"AB": 10, "NO": 1}
+search = grid_search if args.grid else successive_halving
+search_results = search(X_train, y_train)
+best_params, best_cv_accuracy, best_cv_std = search_results[0]
 
-svm_best_tuned = SVC(**tuned_params)
-tuned_accuracy, tuned_conf_matrix = train_and_evaluate(
-    svm_best_tuned, X_train, X_test, y_train, y_test
-)
+print("\nBest parameters from cross-validated search:")
+print(f"{best_params} - CV accuracy: {best_cv_accuracy:.2f} ± {best_cv_std:.2f}")
+
+svm_best_tuned, tuned_accuracy, tuned_conf_matrix = train_and_evaluate(best_params)
 
-print(f"\nBest kernel (tuned): {best_kernel}")
+print(f"\nBest kernel (tuned): {best_params['kernel']}")
 print(f"Tuned SVM accuracy: {tuned_accuracy:.2f}")
 print("Tuned SVM confusion matrix:")
 print(tuned_conf_matrix)
@@ -122,7 +117,7 @@ sns.heatmap(
     xticklabels=class_labels,
     yticklabels=class_labels
 )
-ax2.set_title(f'Best Kernel SVM ({best_kernel}) - Tuned Params')
+ax2.set_title(f'Tuned SVM ({best_params["kernel"]}) - Cross-validated Params')
 ax2.set_ylabel('True Label')
 ax2.set_xlabel('Predicted Label')
 
@@ -0,0 +1,208 @@
+# Autorzy:  Aleksander Bastek, Michał Małolepszy
+
+# Opis problemu:
+# Wyszukiwanie najlepszego jądra SVM i jego parametrów (kernel, C, gamma, degree, class_weight)
+# zamiast ręcznego wyboru po jednym podziale trening/test:
+#   - każdy zestaw parametrów oceniany jest walidacją krzyżową (StratifiedKFold),
+#   - dopasowania poszczególnych foldów liczone są równolegle na wszystkich rdzeniach (joblib),
+#   - precomputed=True (domyślnie w grid_search i successive_halving) - wycinki macierzy Grama liczone
+#     raz na jądro i fold (kernel_cache.py), a różne C i class_weight uczą się na nich przez
+#     SVC(kernel='precomputed'),
+#   - wynik każdego foldu zapisywany jest w pliku pamięci podręcznej (.svm_cache), z kluczem
+#     złożonym ze skrótu danych, parametrów i foldu - ponowne uruchomienie pomija policzone foldy,
+#   - grid_search ocenia całą siatkę, successive_halving najpierw ocenia wszystkich kandydatów
+#     na małej próbce danych i w kolejnych rundach zostawia najlepszą 1/eta z coraz większą próbką.
+
+# Użycie:
+#   from svm_search import grid_search, successive_halving
+#   results = grid_search(X, y)            # lista (parametry, średnia, odchylenie), najlepsze pierwsze
+#
+#   python svm_search.py                    # porównanie czasu: pętla szeregowa / równolegle / z pamięcią
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+from sklearn.svm import SVC
+
+from datasets import load_frame
+from kernel_cache import KernelCache
+
+# Względem katalogu modułu (jak .dataset_cache w datasets.py) - niezależnie od katalogu roboczego
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.svm_cache')
+
+CLASS_WEIGHTS = [None, 'balanced', {"AB": 10, "NO": 1}]
+
+# Domyślna siatka (jak param_grid w scikit-learn) - gamma i degree tylko dla jąder, które ich używają;
+# poly tylko z gamma='scale', bo przy stałej gamma na nieskalowanych cechach uczenie trwa dziesiątki sekund
+PARAM_GRID = [
+    {'kernel': ['linear'], 'C': [0.1, 1, 10, 20], 'class_weight': CLASS_WEIGHTS},
+    {'kernel': ['poly'], 'C': [0.1, 1, 10, 20], 'gamma': ['scale'], 'degree': [2, 3, 4],
+     'class_weight': CLASS_WEIGHTS},
+    {'kernel': ['rbf', 'sigmoid'], 'C': [0.1, 1, 10, 20], 'gamma': ['scale', 0.001, 0.01],
+     'class_weight': CLASS_WEIGHTS},
+]
+
+
+def expand_grid(grid=PARAM_GRID):
+    """Lista słowników parametrów SVC z siatki (lista słowników {parametr: wartości})."""
+    return list(ParameterGrid(grid))
+
+
+def data_hash(X, y):
+    """Skrót SHA-256 danych (wartości cech i etykiet)."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(np.asarray(X, dtype=np.float64)).tobytes())
+    digest.update('\n'.join(map(str, np.asarray(y))).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class FoldCache:
+    """Wyniki foldów w pliku JSON {klucz: dokładność}, osobny plik dla każdego zbioru danych."""
+
+    def __init__(self, data_key, directory=CACHE_DIR):
+        self.path = os.path.join(directory, f"{data_key[:16]}.json") if directory else None
+        self.scores = {}
+        if self.path and os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as file:
+                self.scores = json.load(file)
+
+    @staticmethod
+    def key(params, fold, folds, samples):
+        return f"{json.dumps(params, sort_keys=True)}|fold={fold}/{folds}|samples={samples}"
+
+    def save(self):
+        if self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as file:
+                json.dump(self.scores, file)
+
+
+def _fit_fold(X, y, train, test, params):
+    """Dokładność SVC(**params) na jednym foldzie (wywoływane w procesach roboczych)."""
+    classifier = SVC(random_state=42, **params)
+    classifier.fit(X[train], y[train])
+    return float(np.mean(classifier.predict(X[test]) == y[test]))
+
+
+def _fit_fold_precomputed(train_kernel, test_kernel, y_train, y_test, params):
+    """Jak _fit_fold, ale na wycinkach macierzy Grama z KernelCache (SVC(kernel='precomputed'))."""
+    classifier = SVC(kernel='precomputed', random_state=42, **KernelCache.split_params(params)[1])
+    classifier.fit(train_kernel, y_train)
+    return float(np.mean(classifier.predict(test_kernel) == y_test))
+
+
+def evaluate(X, y, candidates, folds=5, n_jobs=-1, cache=None, samples=None, precomputed=False):
+    """
+    Ocena kandydatów walidacją krzyżową na (opcjonalnie) stratyfikowanej próbce samples wierszy.
+    precomputed=True - wycinki macierzy Grama liczone raz na jądro i fold (KernelCache), wspólne dla
+    wszystkich wartości C i class_weight.
+    Zwraca listę (parametry, średnia, odchylenie) w kolejności candidates.
+    """
+    X, y = np.asarray(X, dtype=np.float64), np.asarray(y)
+    cache = FoldCache(data_hash(X, y), None) if cache is None else cache
+    samples = len(y) if samples is None or samples >= len(y) else samples
+    if samples < len(y):
+        subset, _ = train_test_split(np.arange(len(y)), train_size=samples, random_state=42, stratify=y)
+        X, y = X[np.sort(subset)], y[np.sort(subset)]
+    splits = list(StratifiedKFold(folds, shuffle=True, random_state=42).split(X, y))
+
+    keys = [[cache.key(params, fold, folds, samples) for fold in range(folds)] for params in candidates]
+    missing = [(index, fold) for index in range(len(candidates)) for fold in range(folds)
+               if keys[index][fold] not in cache.scores]
+    if precomputed:
+        kernels = KernelCache(X)
+        # Zadania z tym samym jądrem i foldem po kolei - wycinki macierzy jądra używane od razu
+        # przez wszystkie C / class_weight, zanim wypadną z ograniczonej pamięci KernelCache
+        missing.sort(key=lambda task: (json.dumps(KernelCache.split_params(candidates[task[0]])[0],
+                                                  sort_keys=True), task[1], task[0]))
+
+        def task(index, fold):
+            train, test = splits[fold]
+            kernel_params = KernelCache.split_params(candidates[index])[0]
+            return delayed(_fit_fold_precomputed)(kernels.block(train, train, **kernel_params),
+                                                  kernels.block(test, train, **kernel_params),
+                                                  y[train], y[test], candidates[index])
+    else:
+        def task(index, fold):
+            return delayed(_fit_fold)(X, y, *splits[fold], candidates[index])
+    scores = Parallel(n_jobs=n_jobs)(task(index, fold) for index, fold in missing)
+    for (index, fold), score in zip(missing, scores):
+        cache.scores[keys[index][fold]] = score
+    cache.save()
+
+    results = []
+    for params, params_keys in zip(candidates, keys):
+        fold_scores = [cache.scores[key] for key in params_keys]
+        results.append((params, float(np.mean(fold_scores)), float(np.std(fold_scores))))
+    return results
+
+
+def grid_search(X, y, candidates=None, folds=5, n_jobs=-1, cache_dir=CACHE_DIR, precomputed=True):
+    """
+    Ocena całej siatki; zwraca wyniki posortowane od najlepszej średniej dokładności.
+    Domyślnie na wycinkach macierzy Grama (precomputed=True) - wyniki jak dla zwykłego SVC.
+    """
+    candidates = expand_grid() if candidates is None else candidates
+    cache = FoldCache(data_hash(X, y), cache_dir)
+    results = evaluate(X, y, candidates, folds, n_jobs, cache, precomputed=precomputed)
+    return sorted(results, key=lambda result: -result[1])
+
+
+def successive_halving(X, y, candidates=None, folds=5, n_jobs=-1, cache_dir=CACHE_DIR, eta=3, min_samples=60,
+                       precomputed=True):
+    """
+    Successive halving: runda r ocenia pozostałych kandydatów na próbce min_samples * eta^r
+    wierszy i zostawia najlepszą 1/eta; ostatnia runda używa wszystkich danych.
+    Zwraca wyniki ostatniej rundy posortowane od najlepszej średniej (domyślnie precomputed=True, jak grid_search).
+    """
+    candidates = expand_grid() if candidates is None else candidates
+    cache = FoldCache(data_hash(X, y), cache_dir)
+    samples = min_samples
+    while True:
+        results = sorted(evaluate(X, y, candidates, folds, n_jobs, cache, samples, precomputed),
+                         key=lambda result: -result[1])
+        if samples >= len(y) or len(candidates) == 1:
+            return results
+        candidates = [params for params, _, _ in results[:max(1, len(results) // eta)]]
+        samples = min(samples * eta, len(y))
+
+
+if __name__ == "__main__":
+    df = load_frame('vertebral')
+    X, y = df.iloc[:, :6].to_numpy(dtype=np.float64), df.iloc[:, 6].to_numpy()
+    candidates = expand_grid()
+    print(f"Siatka: {len(candidates)} zestawów parametrów x 5 foldów, rdzenie: {os.cpu_count()}")
+
+    # Pętla szeregowa jak w svm_kernel_functions_tests.py - bez puli i bez pamięci podręcznej
+    start = time.perf_counter()
+    evaluate(X, y, candidates, n_jobs=1)
+    serial = time.perf_counter() - start
+    print(f"Szeregowo:                         {serial:7.2f} s")
+
+    cache_dir = os.path.join(CACHE_DIR, 'benchmark')
+    cache_path = FoldCache(data_hash(X, y), cache_dir).path
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+    for label in ("Równolegle (pusta pamięć)", "Równolegle (pamięć podręczna)"):
+        start = time.perf_counter()
+        results = grid_search(X, y, candidates, cache_dir=cache_dir, precomputed=False)
+        elapsed = time.perf_counter() - start
+        print(f"{label + ':':<35}{elapsed:7.2f} s, przyspieszenie x{serial / elapsed:.1f}")
+
+    start = time.perf_counter()
+    grid_search(X, y, candidates, cache_dir=None, precomputed=True)
+    elapsed = time.perf_counter() - start
+    print(f"{'Równolegle + macierz Grama:':<35}{elapsed:7.2f} s, przyspieszenie x{serial / elapsed:.1f}")
+
+    start = time.perf_counter()
+    halving = successive_halving(X, y, candidates, cache_dir=None)
+    elapsed = time.perf_counter() - start
+    print(f"{'Successive halving:':<35}{elapsed:7.2f} s, przyspieszenie x{serial / elapsed:.1f}")
+
+    for name, (params, mean, std) in (("siatka", results[0]), ("successive halving", halving[0])):
+        print(f"Najlepsze ({name}): {params} - dokładność {mean:.3f} ± {std:.3f}")
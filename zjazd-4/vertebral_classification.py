@@ -27,48 +27,30 @@
 # Analiza wyników przedstawia dokładność z jaką każda z metod przewidywała klasę wyjściową
 # oraz macierze pomyłek, które przedstawiają liczbę trafionych i nietrafionych przewidywań
 
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-file_path = 'vertebral.dat'
+from datasets import load_split
+from kernel_cache import KernelCache
 
-df = pd.read_csv(file_path, sep=r'\s+', header=None)
-df.columns = [
-    'pelvic_incidence',
-    'pelvic_tilt',
-    'lumbar_lordosis_angle',
-    'sacral_slope',
-    'pelvic_radius',
-    'degree_spondylolisthesis',
-    'class_label'
-]
-
-shuffled_df = df.sample(frac=1.0, random_state=42).reset_index(drop=True)
-
-X = shuffled_df.drop(columns=['class_label'])
-y = shuffled_df['class_label']
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    random_state=42,
-    stratify=y
-)
+# Dane wczytywane z pamięci podręcznej .npz (datasets.py), podział stratyfikowany jak wcześniej
+X, y, X_train, X_test, y_train, y_test = load_split('vertebral')
 
 dt_classifier = DecisionTreeClassifier(random_state=42)
 dt_classifier.fit(X_train, y_train)
 
-svm_classifier = SVC(random_state=42)
-svm_classifier.fit(X_train, y_train)
+# SVM na macierzy jądra z KernelCache (kernel_cache.py) - domyślne jądro rbf, gamma='scale' jak w SVC
+kernels = KernelCache(np.vstack([X_train, X_test]))
+train_rows = np.arange(len(X_train))
+test_rows = np.arange(len(X_train), len(X_train) + len(X_test))
+svm_classifier = kernels.fit(train_rows, y_train, random_state=42)
 
 dt_pred = dt_classifier.predict(X_test)
-svm_pred = svm_classifier.predict(X_test)
+svm_pred = kernels.predict(svm_classifier, test_rows, train_rows)
 
 dt_accuracy = accuracy_score(y_test, dt_pred)
 svm_accuracy = accuracy_score(y_test, svm_pred)
@@ -126,7 +108,7 @@ try:
     )
 
     dt_user_pred = dt_classifier.predict(user_sample)[0]
-    svm_user_pred = svm_classifier.predict(user_sample)[0]
+    svm_user_pred = svm_classifier.predict(kernels.cross(user_sample, train_rows))[0]
 
     print("\nPredictions for the entered vertebral sample:")
     print(f"  Decision Tree predicted class_label: {dt_user_pred}")